@@ -19,6 +19,15 @@ from app.models.review import Review
 from app.models.vote import Vote
 from app.models.rsvp import RSVP
 from app.models.utm import UTM
+from app.models.utm_hit import UTMHit
+from app.models.job_run import JobRun
+from app.models.slack_profile import SlackProfile
+from app.models.onboarding_progress import OnboardingProgress
+from app.models.onboarding_slide_timing import OnboardingSlideTiming
+from app.models.job_watermark import JobWatermark
+from app.models.gallery_entry import GalleryEntry
+from app.models.vote_tally import VoteTally
+from app.models.idempotency_key import IdempotencyKey
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,57 @@
+"""add precomputed gallery_entries feed
+
+Revision ID: add_gallery_entries
+Revises: add_search_indexes
+Create Date: 2026-01-26
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_gallery_entries'
+down_revision: Union[str, Sequence[str], None] = 'add_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not table_exists('gallery_entries'):
+        op.create_table('gallery_entries',
+            sa.Column('project_id', sa.String(36), sa.ForeignKey('projects.project_id', ondelete='CASCADE'), nullable=False),
+            sa.Column('user_id', sa.String(36), nullable=False),
+            sa.Column('handle', sa.String(50), nullable=True),
+            sa.Column('project_name', sa.String(200), nullable=False),
+            sa.Column('description', sa.String(300), nullable=False),
+            sa.Column('project_type', sa.String(50), nullable=True),
+            sa.Column('code_url', sa.String(500), nullable=True),
+            sa.Column('live_url', sa.String(500), nullable=True),
+            sa.Column('attachment_urls', sa.JSON(), nullable=True),
+            sa.Column('submission_week', sa.String(50), nullable=False),
+            sa.Column('hackatime_hours', sa.Float(), nullable=False),
+            sa.Column('vote_count', sa.Integer(), nullable=False),
+            sa.Column('visibility_level', sa.Integer(), nullable=False),
+            sa.Column('rank', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint('project_id'),
+        )
+        op.create_index('ix_gallery_entries_rank', 'gallery_entries', ['rank'])
+        op.create_index('ix_gallery_entries_submission_week_rank', 'gallery_entries', ['submission_week', 'rank'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if table_exists('gallery_entries'):
+        op.drop_index('ix_gallery_entries_submission_week_rank', table_name='gallery_entries')
+        op.drop_index('ix_gallery_entries_rank', table_name='gallery_entries')
+        op.drop_table('gallery_entries')
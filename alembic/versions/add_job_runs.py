@@ -0,0 +1,48 @@
+"""add job_runs table
+
+Revision ID: add_job_runs
+Revises: 8c4686009abf
+Create Date: 2026-01-12
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_job_runs'
+down_revision: Union[str, Sequence[str], None] = '8c4686009abf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not table_exists('job_runs'):
+        op.create_table('job_runs',
+            sa.Column('id', sa.String(36), primary_key=True),
+            sa.Column('job_name', sa.String(100), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False),
+            sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('duration_ms', sa.Integer(), nullable=True),
+            sa.Column('items_processed', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('items_failed', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('error', sa.Text(), nullable=True),
+        )
+        op.create_index('ix_job_runs_job_name_started_at', 'job_runs', ['job_name', 'started_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if table_exists('job_runs'):
+        op.drop_index('ix_job_runs_job_name_started_at', table_name='job_runs')
+        op.drop_table('job_runs')
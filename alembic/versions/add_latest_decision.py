@@ -0,0 +1,97 @@
+"""make reviews the source of truth for project review state
+
+Adds projects.latest_decision, the lowercased decision of the project's
+newest review. Admin status changes made before this migration never
+created a review row, so one is backfilled from reviewed_by,
+review_notes and reviewed_at wherever that change is newer than the
+project's newest review and disagrees with it, or the project has no
+reviews. This keeps a later admin decision ahead of an older review.
+Then latest_decision is filled in, and review_status is synced to it
+wherever the decision is a review status. Also adds a partial index on
+approved reviews.
+
+Revision ID: add_latest_decision
+Revises: add_review_queue
+Create Date: 2026-02-06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_latest_decision'
+down_revision: Union[str, Sequence[str], None] = 'add_review_queue'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(col['name'] == column_name for col in inspector.get_columns(table_name))
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(idx['name'] == index_name for idx in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not column_exists('projects', 'latest_decision'):
+        op.add_column('projects', sa.Column('latest_decision', sa.String(50), nullable=True))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            INSERT INTO reviews (review_id, reviewer_user_id, project_id, review_comments, review_decision, review_timestamp)
+            SELECT gen_random_uuid()::text, p.reviewed_by, p.project_id,
+                   coalesce(nullif(p.review_notes, ''), 'Marked ' || p.review_status),
+                   p.review_status, coalesce(p.reviewed_at, p.updated_at)
+            FROM projects p
+            LEFT JOIN LATERAL (
+                SELECT r.review_decision, r.review_timestamp FROM reviews r
+                WHERE r.project_id = p.project_id
+                ORDER BY r.review_timestamp DESC, r.review_id DESC
+                LIMIT 1
+            ) latest ON true
+            WHERE p.review_status <> 'pending' AND p.reviewed_by IS NOT NULL
+              AND (
+                  latest.review_timestamp IS NULL
+                  OR (p.reviewed_at > latest.review_timestamp
+                      AND lower(latest.review_decision) <> p.review_status)
+              )
+        """)
+
+    op.execute("""
+        UPDATE projects SET latest_decision = (
+            SELECT lower(r.review_decision) FROM reviews r
+            WHERE r.project_id = projects.project_id
+            ORDER BY r.review_timestamp DESC, r.review_id DESC
+            LIMIT 1
+        )
+    """)
+    op.execute("""
+        UPDATE projects SET review_status = latest_decision
+        WHERE latest_decision IN ('pending', 'approved', 'rejected', 'flagged')
+          AND review_status <> latest_decision
+    """)
+
+    if not index_exists('reviews', 'ix_reviews_project_id_approved'):
+        op.create_index(
+            'ix_reviews_project_id_approved',
+            'reviews',
+            ['project_id'],
+            postgresql_where=sa.text("review_decision = 'approved'"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if index_exists('reviews', 'ix_reviews_project_id_approved'):
+        op.drop_index('ix_reviews_project_id_approved', table_name='reviews')
+    if column_exists('projects', 'latest_decision'):
+        op.drop_column('projects', 'latest_decision')
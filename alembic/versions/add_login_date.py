@@ -0,0 +1,74 @@
+"""add user_login_events.login_date with one login per user per day
+
+Adds a login_date column (the UTC day of logged_in_at) and a unique
+(user_id, login_date) index. With that index, record_login can dedupe with
+a single INSERT ... ON CONFLICT DO NOTHING. Any existing same-day
+duplicates are removed first; the earliest login of each day is kept.
+
+On Postgres, partition_event_tables already adds login_date and partitions
+user_login_events on it, so this revision has nothing left to do there.
+
+Revision ID: add_login_date
+Revises: partition_event_tables
+Create Date: 2026-01-22
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_login_date'
+down_revision: Union[str, Sequence[str], None] = 'partition_event_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(col['name'] == column_name for col in inspector.get_columns(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not table_exists('user_login_events') or column_exists('user_login_events', 'login_date'):
+        return
+
+    op.add_column('user_login_events', sa.Column('login_date', sa.Date(), nullable=True))
+    op.execute("UPDATE user_login_events SET login_date = date(logged_in_at)")
+    op.execute("""
+        DELETE FROM user_login_events
+        WHERE id NOT IN (
+            SELECT min(id) FROM (
+                SELECT id, user_id, login_date, logged_in_at,
+                       min(logged_in_at) OVER (PARTITION BY user_id, login_date) AS first_at
+                FROM user_login_events
+            ) WHERE logged_in_at = first_at
+            GROUP BY user_id, login_date
+        )
+    """)
+    with op.batch_alter_table('user_login_events') as batch_op:
+        batch_op.alter_column('login_date', existing_type=sa.Date(), nullable=False)
+    op.create_index('uq_user_login_events_user_id_login_date', 'user_login_events', ['user_id', 'login_date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # On Postgres the column belongs to partition_event_tables and is removed by its downgrade
+    if op.get_bind().dialect.name == 'postgresql':
+        return
+    if not table_exists('user_login_events') or not column_exists('user_login_events', 'login_date'):
+        return
+
+    op.drop_index('uq_user_login_events_user_id_login_date', table_name='user_login_events')
+    with op.batch_alter_table('user_login_events') as batch_op:
+        batch_op.drop_column('login_date')
@@ -0,0 +1,82 @@
+"""add onboarding funnel rollup tables
+
+Revision ID: add_onboarding_rollups
+Revises: add_utm_hits
+Create Date: 2026-01-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_onboarding_rollups'
+down_revision: Union[str, Sequence[str], None] = 'add_utm_hits'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(ix['name'] == index_name for ix in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not table_exists('onboarding_progress'):
+        op.create_table('onboarding_progress',
+            sa.Column('user_id', sa.String(36), primary_key=True),
+            sa.Column('first_event_at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('max_slide', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('total_slides', sa.Integer(), nullable=True),
+            sa.Column('last_slide_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('skipped', sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index('ix_onboarding_progress_first_event_at', 'onboarding_progress', ['first_event_at'])
+        op.create_index('ix_onboarding_progress_max_slide', 'onboarding_progress', ['max_slide'])
+        op.create_index('ix_onboarding_progress_completed_at', 'onboarding_progress', ['completed_at'])
+
+    if not table_exists('onboarding_slide_timings'):
+        op.create_table('onboarding_slide_timings',
+            sa.Column('slide', sa.Integer(), primary_key=True),
+            sa.Column('bucket', sa.Integer(), primary_key=True),
+            sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        )
+
+    if not table_exists('job_watermarks'):
+        op.create_table('job_watermarks',
+            sa.Column('job_name', sa.String(100), primary_key=True),
+            sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('last_id', sa.String(36), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+
+    # The rollup job reads onboarding_events in (created_at, id) order from its watermark
+    if not index_exists('onboarding_events', 'ix_onboarding_events_created_at_id'):
+        op.create_index('ix_onboarding_events_created_at_id', 'onboarding_events', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if index_exists('onboarding_events', 'ix_onboarding_events_created_at_id'):
+        op.drop_index('ix_onboarding_events_created_at_id', table_name='onboarding_events')
+    if table_exists('job_watermarks'):
+        op.drop_table('job_watermarks')
+    if table_exists('onboarding_slide_timings'):
+        op.drop_table('onboarding_slide_timings')
+    if table_exists('onboarding_progress'):
+        op.drop_index('ix_onboarding_progress_completed_at', table_name='onboarding_progress')
+        op.drop_index('ix_onboarding_progress_max_slide', table_name='onboarding_progress')
+        op.drop_index('ix_onboarding_progress_first_event_at', table_name='onboarding_progress')
+        op.drop_table('onboarding_progress')
@@ -0,0 +1,72 @@
+"""add denormalized vote_count and vote_score to projects
+
+Backfills both columns from the votes table and adds a covering index for
+the weekly leaderboard (GET /votes/leaderboard). From here on the columns
+are kept in step by app/crud/votes.py.
+
+Revision ID: add_project_vote_tallies
+Revises: add_gallery_entries
+Create Date: 2026-01-28
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_project_vote_tallies'
+down_revision: Union[str, Sequence[str], None] = 'add_gallery_entries'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match app.crud.votes.VOTE_POINTS_RANKS
+VOTE_POINTS_RANKS = 3
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(col['name'] == column_name for col in inspector.get_columns(table_name))
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(idx['name'] == index_name for idx in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ('vote_count', 'vote_score'):
+        if not column_exists('projects', column):
+            op.add_column('projects', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(f"""
+        UPDATE projects SET
+            vote_count = (SELECT count(*) FROM votes WHERE votes.project_id = projects.project_id),
+            vote_score = (
+                SELECT coalesce(sum(CASE WHEN vote_ranking <= {VOTE_POINTS_RANKS}
+                                         THEN {VOTE_POINTS_RANKS} + 1 - vote_ranking ELSE 0 END), 0)
+                FROM votes WHERE votes.project_id = projects.project_id
+            )
+    """)
+
+    if not index_exists('projects', 'ix_projects_leaderboard'):
+        op.create_index(
+            'ix_projects_leaderboard',
+            'projects',
+            ['submission_week', sa.text('vote_score DESC'), sa.text('vote_count DESC'), 'project_id'],
+            postgresql_include=['project_name', 'user_id'],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if index_exists('projects', 'ix_projects_leaderboard'):
+        op.drop_index('ix_projects_leaderboard', table_name='projects')
+    for column in ('vote_score', 'vote_count'):
+        if column_exists('projects', column):
+            op.drop_column('projects', column)
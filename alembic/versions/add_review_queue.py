@@ -0,0 +1,75 @@
+"""add review queue leases and partial index
+
+Adds review_lease_owner and review_lease_expires_at to projects, and a
+partial index on pending shipped projects for the review queue
+(POST /reviews/queue/lease). The review_status, review_notes,
+reviewed_by and reviewed_at columns were only ever created by
+create_all, so they are added here too if missing.
+
+Revision ID: add_review_queue
+Revises: add_vote_uniqueness
+Create Date: 2026-02-04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_review_queue'
+down_revision: Union[str, Sequence[str], None] = 'add_vote_uniqueness'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REVIEW_COLUMNS = [
+    sa.Column('review_status', sa.String(20), server_default='pending', nullable=False),
+    sa.Column('review_notes', sa.Text(), nullable=True),
+    sa.Column('reviewed_by', sa.String(36), sa.ForeignKey('users.user_id'), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+]
+
+LEASE_COLUMNS = [
+    sa.Column('review_lease_owner', sa.String(36), nullable=True),
+    sa.Column('review_lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+]
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(col['name'] == column_name for col in inspector.get_columns(table_name))
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(idx['name'] == index_name for idx in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in REVIEW_COLUMNS + LEASE_COLUMNS:
+        if not column_exists('projects', column.name):
+            op.add_column('projects', column)
+
+    if not index_exists('projects', 'ix_projects_review_status'):
+        op.create_index('ix_projects_review_status', 'projects', ['review_status'])
+    if not index_exists('projects', 'ix_projects_review_queue'):
+        op.create_index(
+            'ix_projects_review_queue',
+            'projects',
+            ['created_at', 'project_id'],
+            postgresql_where=sa.text("review_status = 'pending' AND shipped"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if index_exists('projects', 'ix_projects_review_queue'):
+        op.drop_index('ix_projects_review_queue', table_name='projects')
+    for column in LEASE_COLUMNS:
+        if column_exists('projects', column.name):
+            op.drop_column('projects', column.name)
@@ -0,0 +1,70 @@
+"""add full-text and trigram indexes for admin search
+
+Adds projects.search_vector, a generated tsvector over project_name and
+project_description, with a GIN index. Also adds pg_trgm GIN indexes for
+substring search on project names and on user handles, emails and ids.
+Used by app/services/search.py.
+
+Postgres only; other dialects are left untouched.
+
+Revision ID: add_search_indexes
+Revises: add_login_date
+Create Date: 2026-01-24
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+revision: str = 'add_search_indexes'
+down_revision: Union[str, Sequence[str], None] = 'add_login_date'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = [
+    ('ix_projects_project_name_trgm', 'projects', 'project_name'),
+    ('ix_users_handle_trgm', 'users', 'handle'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_users_user_id_trgm', 'users', 'user_id'),
+]
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(col['name'] == column_name for col in inspector.get_columns(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    if not column_exists('projects', 'search_vector'):
+        op.execute("""
+            ALTER TABLE projects ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(project_name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(project_description, '')), 'B')
+            ) STORED
+        """)
+    op.execute('CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING gin (search_vector)')
+
+    for name, table, column in TRIGRAM_INDEXES:
+        op.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, _, _ in TRIGRAM_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('DROP INDEX IF EXISTS ix_projects_search_vector')
+    if column_exists('projects', 'search_vector'):
+        op.execute('ALTER TABLE projects DROP COLUMN search_vector')
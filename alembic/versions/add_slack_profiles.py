@@ -0,0 +1,43 @@
+"""add slack_profiles cache table
+
+Revision ID: add_slack_profiles
+Revises: add_job_runs
+Create Date: 2026-01-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_slack_profiles'
+down_revision: Union[str, Sequence[str], None] = 'add_job_runs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not table_exists('slack_profiles'):
+        op.create_table('slack_profiles',
+            sa.Column('slack_id', sa.String(64), primary_key=True),
+            sa.Column('username', sa.String(255), nullable=True),
+            sa.Column('display_name', sa.String(255), nullable=True),
+            sa.Column('real_name', sa.String(255), nullable=True),
+            sa.Column('avatar_url', sa.String(500), nullable=True),
+            sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if table_exists('slack_profiles'):
+        op.drop_table('slack_profiles')
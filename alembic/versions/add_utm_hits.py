@@ -0,0 +1,58 @@
+"""add hourly utm_hits rollup and users.created_at index
+
+Revision ID: add_utm_hits
+Revises: add_slack_profiles
+Create Date: 2026-01-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_utm_hits'
+down_revision: Union[str, Sequence[str], None] = 'add_slack_profiles'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(ix['name'] == index_name for ix in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not table_exists('utm_hits'):
+        op.create_table('utm_hits',
+            sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('utm_campaign', sa.String(64), nullable=False, server_default=''),
+            sa.Column('utm_source', sa.String(64), nullable=False, server_default=''),
+            sa.Column('utm_medium', sa.String(64), nullable=False, server_default=''),
+            sa.Column('referral_code', sa.String(8), nullable=False, server_default=''),
+            sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('bucket_start', 'utm_campaign', 'utm_source', 'utm_medium', 'referral_code'),
+        )
+        op.create_index('ix_utm_hits_referral_code_bucket_start', 'utm_hits', ['referral_code', 'bucket_start'])
+
+    # Funnel queries filter signups by created_at range
+    if not index_exists('users', 'ix_users_created_at'):
+        op.create_index('ix_users_created_at', 'users', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if index_exists('users', 'ix_users_created_at'):
+        op.drop_index('ix_users_created_at', table_name='users')
+    if table_exists('utm_hits'):
+        op.drop_index('ix_utm_hits_referral_code_bucket_start', table_name='utm_hits')
+        op.drop_table('utm_hits')
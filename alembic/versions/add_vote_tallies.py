@@ -0,0 +1,48 @@
+"""add vote_tallies snapshot table
+
+Revision ID: add_vote_tallies
+Revises: add_project_vote_tallies
+Create Date: 2026-01-30
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_vote_tallies'
+down_revision: Union[str, Sequence[str], None] = 'add_project_vote_tallies'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not table_exists('vote_tallies'):
+        op.create_table('vote_tallies',
+            sa.Column('submission_week', sa.String(50), nullable=False),
+            sa.Column('project_id', sa.String(36), sa.ForeignKey('projects.project_id', ondelete='CASCADE'), nullable=False),
+            sa.Column('vote_count', sa.Integer(), nullable=False),
+            sa.Column('borda_score', sa.BigInteger(), nullable=False),
+            sa.Column('borda_rank', sa.Integer(), nullable=False),
+            sa.Column('schulze_rank', sa.Integer(), nullable=True),
+            sa.Column('rank', sa.Integer(), nullable=False),
+            sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint('submission_week', 'project_id'),
+        )
+        op.create_index('ix_vote_tallies_submission_week_rank', 'vote_tallies', ['submission_week', 'rank'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if table_exists('vote_tallies'):
+        op.drop_index('ix_vote_tallies_submission_week_rank', table_name='vote_tallies')
+        op.drop_table('vote_tallies')
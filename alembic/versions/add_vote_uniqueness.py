@@ -0,0 +1,86 @@
+"""one vote per user per project; add idempotency_keys
+
+Existing duplicate (user_id, project_id) votes are collapsed to the most
+recent one. Project vote tallies are then recomputed, and
+uq_votes_user_id_project_id is added. POST /votes/ballot upserts against
+that constraint.
+
+Revision ID: add_vote_uniqueness
+Revises: add_vote_tallies
+Create Date: 2026-02-02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = 'add_vote_uniqueness'
+down_revision: Union[str, Sequence[str], None] = 'add_vote_tallies'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match app.crud.votes.VOTE_POINTS_RANKS
+VOTE_POINTS_RANKS = 3
+
+
+def table_exists(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def constraint_exists(table_name: str, constraint_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return any(uc['name'] == constraint_name for uc in inspector.get_unique_constraints(table_name))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not constraint_exists('votes', 'uq_votes_user_id_project_id'):
+        op.execute("""
+            DELETE FROM votes WHERE vote_id IN (
+                SELECT vote_id FROM (
+                    SELECT vote_id, row_number() OVER (
+                        PARTITION BY user_id, project_id ORDER BY timestamp DESC, vote_id DESC
+                    ) AS n
+                    FROM votes
+                ) ranked WHERE n > 1
+            )
+        """)
+        op.execute(f"""
+            UPDATE projects SET
+                vote_count = (SELECT count(*) FROM votes WHERE votes.project_id = projects.project_id),
+                vote_score = (
+                    SELECT coalesce(sum(CASE WHEN vote_ranking <= {VOTE_POINTS_RANKS}
+                                             THEN {VOTE_POINTS_RANKS} + 1 - vote_ranking ELSE 0 END), 0)
+                    FROM votes WHERE votes.project_id = projects.project_id
+                )
+        """)
+        with op.batch_alter_table('votes') as batch_op:
+            batch_op.create_unique_constraint('uq_votes_user_id_project_id', ['user_id', 'project_id'])
+
+    if not table_exists('idempotency_keys'):
+        op.create_table('idempotency_keys',
+            sa.Column('scope', sa.String(50), nullable=False),
+            sa.Column('key', sa.String(100), nullable=False),
+            sa.Column('request_hash', sa.String(64), nullable=False),
+            sa.Column('response', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.PrimaryKeyConstraint('scope', 'key'),
+        )
+        op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if table_exists('idempotency_keys'):
+        op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys')
+        op.drop_table('idempotency_keys')
+    if constraint_exists('votes', 'uq_votes_user_id_project_id'):
+        with op.batch_alter_table('votes') as batch_op:
+            batch_op.drop_constraint('uq_votes_user_id_project_id', type_='unique')
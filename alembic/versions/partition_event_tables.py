@@ -0,0 +1,172 @@
+"""partition event tables by month
+
+Rebuilds user_login_events, onboarding_events and audit_logs as native
+Postgres RANGE-partitioned tables with one partition per month. Postgres
+requires the partition key in every unique constraint, so each primary
+key becomes (id, <time column>).
+
+user_login_events is partitioned on a new login_date column (the UTC day
+of logged_in_at) rather than logged_in_at, so that the unique
+(user_id, login_date) index record_login relies on can include the
+partition key. Same-day duplicate logins are removed first; the earliest
+login of each day is kept.
+
+Partitions are created from the oldest existing row's month through
+PARTITION_MONTHS_AHEAD months from now, plus a DEFAULT partition so
+inserts past that range still succeed. After that,
+jobs/partition_maintenance.py keeps creating future months and archives
+old ones.
+
+Postgres only; other dialects are left untouched.
+
+Revision ID: partition_event_tables
+Revises: add_onboarding_rollups
+Create Date: 2026-01-21
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'partition_event_tables'
+down_revision: Union[str, Sequence[str], None] = 'add_onboarding_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITION_MONTHS_AHEAD = 3
+
+# table -> (partition column, indexes to rebuild on the parent as (name, columns));
+# uq_ indexes are created UNIQUE
+PARTITIONED_TABLES = {
+    'user_login_events': ('login_date', [
+        ('uq_user_login_events_user_id_login_date', ['user_id', 'login_date']),
+    ]),
+    'onboarding_events': ('created_at', [
+        ('ix_onboarding_events_user_id', ['user_id', 'created_at']),
+        ('ix_onboarding_events_created_at_id', ['created_at', 'id']),
+    ]),
+    'audit_logs': ('created_at', [
+        ('ix_audit_logs_user_id', ['user_id']),
+        ('ix_audit_logs_object_type', ['object_type']),
+        ('ix_audit_logs_object_id', ['object_id', 'created_at']),
+        ('ix_audit_logs_action', ['action']),
+    ]),
+}
+
+
+def add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def is_partitioned(bind, table: str) -> bool:
+    return bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :t AND c.relnamespace = 'public'::regnamespace"
+    ), {"t": table}).scalar() is not None
+
+
+def table_exists(bind, table: str) -> bool:
+    return table in sa.inspect(bind).get_table_names()
+
+
+def column_exists(bind, table: str, column: str) -> bool:
+    return any(col['name'] == column for col in sa.inspect(bind).get_columns(table))
+
+
+def add_login_date(bind) -> None:
+    """Add user_login_events.login_date and keep only the first login per user per UTC day."""
+    if column_exists(bind, 'user_login_events', 'login_date'):
+        return
+    op.add_column('user_login_events', sa.Column('login_date', sa.Date(), nullable=True))
+    op.execute("UPDATE user_login_events SET login_date = (logged_in_at AT TIME ZONE 'UTC')::date")
+    op.execute("""
+        DELETE FROM user_login_events e
+        USING (
+            SELECT id, row_number() OVER (PARTITION BY user_id, login_date ORDER BY logged_in_at, id) AS n
+            FROM user_login_events
+        ) ranked
+        WHERE e.id = ranked.id AND ranked.n > 1
+    """)
+    op.alter_column('user_login_events', 'login_date', existing_type=sa.Date(), nullable=False)
+
+
+def rebuild_table(bind, table: str, partition_sql: str, primary_key: str, indexes: list, partitions=None) -> None:
+    """
+    Recreate table with the same columns under a new layout, copying all rows.
+    The old table is dropped before keys and indexes are recreated so names don't collide.
+    """
+    old = f"{table}_old"
+    # CREATE TABLE ... LIKE doesn't copy foreign keys, so note them first
+    foreign_keys = sa.inspect(bind).get_foreign_keys(table)
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) {partition_sql}')
+    if partitions:
+        partitions(old)
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'DROP TABLE {old} CASCADE')
+
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})')
+    for fk in foreign_keys:
+        cols = ", ".join(fk["constrained_columns"])
+        ref_cols = ", ".join(fk["referred_columns"])
+        op.execute(f'ALTER TABLE {table} ADD FOREIGN KEY ({cols}) REFERENCES {fk["referred_table"]} ({ref_cols})')
+    for name, columns in indexes:
+        kind = 'UNIQUE INDEX' if name.startswith('uq_') else 'INDEX'
+        op.execute(f'CREATE {kind} {name} ON {table} ({", ".join(columns)})')
+
+
+def partition_table(bind, table: str, column: str, indexes: list) -> None:
+    def create_partitions(old: str) -> None:
+        oldest = bind.execute(sa.text(f'SELECT min({column}) FROM {old}')).scalar()
+        if isinstance(oldest, datetime):
+            oldest = oldest.astimezone(timezone.utc)
+        today = date.today()
+        month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+        last = add_months(date(today.year, today.month, 1), PARTITION_MONTHS_AHEAD)
+        while month <= last:
+            upper = add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{upper.isoformat()} 00:00+00')"
+            )
+            month = upper
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    rebuild_table(bind, table, f'PARTITION BY RANGE ({column})', f'id, {column}', indexes, create_partitions)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    for table, (column, indexes) in PARTITIONED_TABLES.items():
+        if table_exists(bind, table) and not is_partitioned(bind, table):
+            if table == 'user_login_events':
+                add_login_date(bind)
+            partition_table(bind, table, column, indexes)
+
+    op.execute('CREATE SCHEMA IF NOT EXISTS archive')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # Archived partitions in the archive schema are left alone
+    for table, (column, indexes) in PARTITIONED_TABLES.items():
+        if table_exists(bind, table) and is_partitioned(bind, table):
+            rebuild_table(bind, table, '', 'id', indexes)
+
+    if table_exists(bind, 'user_login_events') and column_exists(bind, 'user_login_events', 'login_date'):
+        op.drop_column('user_login_events', 'login_date')
+        op.create_index('ix_user_login_events_user_id', 'user_login_events', ['user_id', 'logged_in_at'])
@@ -16,6 +16,14 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header names etag (weak or strong) or is *."""
+    if not if_none_match:
+        return False
+    candidates = {t.strip().removeprefix("W/").strip('"') for t in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
 def verify_auth(Authorization: str = Header(...)) -> None:
     settings = get_settings()
     if Authorization != settings.MASTER_KEY:
@@ -1,18 +1,28 @@
 from typing import Optional
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, Query, HTTPException, Header
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from sqlalchemy import func, or_, select
 from pydantic import BaseModel
 from app.api.deps import get_db, verify_auth, verify_admin
 from app.models.project import Project
 from app.models.user import User
 from app.models.onboarding_event import OnboardingEvent
 from app.models.audit_log import AuditLog
-from app.models.hackatime_project import HackatimeProject
 from app.models.user_login_event import UserLoginEvent
 from app.models.vote import Vote
 from app.models.review import Review
+from app.models.job_run import JobRun
+from app.models.onboarding_progress import OnboardingProgress
+from app.models.vote_tally import VoteTally
+from app.services.onboarding_funnel import get_onboarding_funnel
+from app.services.search import search_projects, search_users
+from app.services.vote_tally import tally_week
+from app.crud.reviews import REVIEW_STATUSES, record_review
+from jobs.registry import JOBS
+from app.services.render_pool import render_pool
+from app.services.event_queue import EVENT_QUEUES
+from app.services.utm_tracking import utm_counter, utm_hit_counter
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(verify_auth), Depends(verify_admin)])
 
@@ -37,18 +47,13 @@ def get_dashboard_stats(db: Session = Depends(get_db)) -> dict:
     unshipped_projects = db.query(func.count(Project.project_id)).filter(
         Project.shipped == False
     ).scalar() or 0
-    pending_review = db.query(func.count(Project.project_id)).filter(
-        Project.review_status == "pending"
-    ).scalar() or 0
-    approved_projects = db.query(func.count(Project.project_id)).filter(
-        Project.review_status == "approved"
-    ).scalar() or 0
-    rejected_projects = db.query(func.count(Project.project_id)).filter(
-        Project.review_status == "rejected"
-    ).scalar() or 0
-    flagged_projects = db.query(func.count(Project.project_id)).filter(
-        Project.review_status == "flagged"
-    ).scalar() or 0
+    review_counts = dict(
+        db.query(Project.review_status, func.count(Project.project_id)).group_by(Project.review_status).all()
+    )
+    pending_review = review_counts.get("pending", 0)
+    approved_projects = review_counts.get("approved", 0)
+    rejected_projects = review_counts.get("rejected", 0)
+    flagged_projects = review_counts.get("flagged", 0)
 
     total_users = db.query(func.count(User.user_id)).scalar() or 0
     users_with_projects = db.query(func.count(func.distinct(Project.user_id))).scalar() or 0
@@ -70,19 +75,16 @@ def get_dashboard_stats(db: Session = Depends(get_db)) -> dict:
         Project.hackatime_hours > 80
     ).scalar() or 0
 
-    onboarding_starts_total = db.query(func.count(func.distinct(OnboardingEvent.user_id))).filter(
-        OnboardingEvent.event == "start"
+    # From the onboarding_progress rollup (one row per user) rather than scanning events
+    onboarding_starts_total = db.query(func.count(OnboardingProgress.user_id)).scalar() or 0
+    onboarding_completions_total = db.query(func.count(OnboardingProgress.user_id)).filter(
+        OnboardingProgress.completed_at.isnot(None)
     ).scalar() or 0
-    onboarding_completions_total = db.query(func.count(func.distinct(OnboardingEvent.user_id))).filter(
-        OnboardingEvent.event == "complete"
+    onboarding_starts_7d = db.query(func.count(OnboardingProgress.user_id)).filter(
+        OnboardingProgress.first_event_at >= week_ago
     ).scalar() or 0
-    onboarding_starts_7d = db.query(func.count(func.distinct(OnboardingEvent.user_id))).filter(
-        OnboardingEvent.event == "start",
-        OnboardingEvent.created_at >= week_ago
-    ).scalar() or 0
-    onboarding_completions_7d = db.query(func.count(func.distinct(OnboardingEvent.user_id))).filter(
-        OnboardingEvent.event == "complete",
-        OnboardingEvent.created_at >= week_ago
+    onboarding_completions_7d = db.query(func.count(OnboardingProgress.user_id)).filter(
+        OnboardingProgress.completed_at >= week_ago
     ).scalar() or 0
 
     # User journey funnel - count users at each milestone
@@ -158,16 +160,25 @@ def list_projects(
     limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db)
 ) -> list[dict]:
-    query = db.query(Project).join(User, Project.user_id == User.user_id)
+    # Plain row tuples: no identity map, no per-row lazy load of Project.user
+    query = db.query(
+        Project.project_id,
+        Project.project_name,
+        Project.project_description,
+        Project.project_type,
+        Project.submission_week,
+        Project.shipped,
+        Project.hackatime_hours,
+        Project.review_status,
+        Project.review_notes,
+        Project.reviewed_by,
+        Project.reviewed_at,
+        Project.created_at,
+        User.user_id,
+        User.handle,
+        User.email,
+    ).join(User, Project.user_id == User.user_id)
 
-    if q:
-        search = f"%{q}%"
-        query = query.filter(
-            or_(
-                Project.project_name.ilike(search),
-                User.handle.ilike(search)
-            )
-        )
     if week:
         query = query.filter(Project.submission_week == week)
     if shipped is not None:
@@ -179,29 +190,34 @@ def list_projects(
     if max_hours is not None:
         query = query.filter(Project.hackatime_hours <= max_hours)
 
-    projects = query.order_by(Project.created_at.desc()).offset(skip).limit(limit).all()
+    if q:
+        query = search_projects(query, q)
+    else:
+        query = query.order_by(Project.created_at.desc())
+
+    rows = query.offset(skip).limit(limit).all()
 
     return [
         {
-            "project_id": p.project_id,
-            "project_name": p.project_name,
-            "project_description": p.project_description,
-            "project_type": p.project_type,
-            "submission_week": p.submission_week,
-            "shipped": p.shipped,
-            "hackatime_hours": p.hackatime_hours,
-            "review_status": p.review_status,
-            "review_notes": p.review_notes,
-            "reviewed_by": p.reviewed_by,
-            "reviewed_at": p.reviewed_at.isoformat() if p.reviewed_at else None,
-            "created_at": p.created_at.isoformat() if p.created_at else None,
+            "project_id": r.project_id,
+            "project_name": r.project_name,
+            "project_description": r.project_description,
+            "project_type": r.project_type,
+            "submission_week": r.submission_week,
+            "shipped": r.shipped,
+            "hackatime_hours": r.hackatime_hours,
+            "review_status": r.review_status,
+            "review_notes": r.review_notes,
+            "reviewed_by": r.reviewed_by,
+            "reviewed_at": r.reviewed_at.isoformat() if r.reviewed_at else None,
+            "created_at": r.created_at.isoformat() if r.created_at else None,
             "user": {
-                "user_id": p.user.user_id,
-                "handle": p.user.handle,
-                "email": p.user.email
+                "user_id": r.user_id,
+                "handle": r.handle,
+                "email": r.email
             }
         }
-        for p in projects
+        for r in rows
     ]
 
 
@@ -212,28 +228,33 @@ def list_users(
     limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db)
 ) -> list[dict]:
-    query = db.query(User)
+    project_count = (
+        select(func.count(Project.project_id))
+        .where(Project.user_id == User.user_id)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    query = db.query(
+        User.user_id,
+        User.handle,
+        User.email,
+        User.created_at,
+        User.storyline_completed_at,
+        User.slack_linked_at,
+        User.idv_completed_at,
+        User.hackatime_completed_at,
+        User.onboarding_completed_at,
+        project_count.label("project_count"),
+    )
 
     if q:
-        search = f"%{q}%"
-        query = query.filter(
-            or_(
-                User.handle.ilike(search),
-                User.user_id.ilike(search),
-                User.email.ilike(search)
-            )
-        )
+        query = search_users(query, q)
+    else:
+        query = query.order_by(User.created_at.desc())
 
-    users = query.order_by(User.created_at.desc()).offset(skip).limit(limit).all()
+    rows = query.offset(skip).limit(limit).all()
 
-    project_counts = dict(
-        db.query(Project.user_id, func.count(Project.project_id))
-        .filter(Project.user_id.in_([u.user_id for u in users]))
-        .group_by(Project.user_id)
-        .all()
-    )
-
-    def get_journey_step(user: User) -> dict:
+    def get_journey_step(user) -> dict:
         steps = [
             ("registered", True),
             ("storyline", user.storyline_completed_at is not None),
@@ -267,10 +288,10 @@ def list_users(
             "email": u.email,
             "created_at": u.created_at.isoformat() if u.created_at else None,
             "onboarding_completed_at": u.onboarding_completed_at.isoformat() if u.onboarding_completed_at else None,
-            "project_count": project_counts.get(u.user_id, 0),
+            "project_count": u.project_count,
             "journey": get_journey_step(u)
         }
-        for u in users
+        for u in rows
     ]
 
 
@@ -281,20 +302,18 @@ def update_project_review(
     x_user_id: str = Header(...),
     db: Session = Depends(get_db)
 ) -> dict:
-    if body.status not in ["approved", "rejected", "flagged", "pending"]:
+    if body.status not in REVIEW_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status. Must be one of: approved, rejected, flagged, pending")
 
     project = db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
+    # Every status change is a Review row; the project's review fields follow from it
     old_status = project.review_status
-    project.review_status = body.status
-    project.review_notes = body.notes
-    project.reviewed_by = x_user_id
-    project.reviewed_at = datetime.now(timezone.utc)
-
-    audit_log = AuditLog(
+    review = record_review(db, project_id, x_user_id, body.status, body.notes or f"Marked {body.status}")
+    # Written in the same transaction so the audit trail can't miss a status change
+    db.add(AuditLog(
         user_id=x_user_id,
         object_type="project",
         object_id=project_id,
@@ -303,9 +322,8 @@ def update_project_review(
             "old_status": old_status,
             "new_status": body.status,
             "notes": body.notes
-        }
-    )
-    db.add(audit_log)
+        },
+    ))
     db.commit()
 
     return {
@@ -313,7 +331,7 @@ def update_project_review(
         "project_id": project_id,
         "review_status": body.status,
         "reviewed_by": x_user_id,
-        "reviewed_at": project.reviewed_at.isoformat()
+        "reviewed_at": review.review_timestamp.isoformat()
     }
 
 
@@ -323,7 +341,17 @@ def get_projects_with_anomalies(
     limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db)
 ) -> list[dict]:
-    projects = db.query(Project).join(User, Project.user_id == User.user_id).filter(
+    rows = db.query(
+        Project.project_id,
+        Project.project_name,
+        Project.submission_week,
+        Project.shipped,
+        Project.hackatime_hours,
+        Project.review_status,
+        Project.created_at,
+        User.user_id,
+        User.handle,
+    ).join(User, Project.user_id == User.user_id).filter(
         or_(
             Project.hackatime_hours == 0,
             Project.hackatime_hours > 80,
@@ -342,20 +370,20 @@ def get_projects_with_anomalies(
 
     return [
         {
-            "project_id": p.project_id,
-            "project_name": p.project_name,
-            "submission_week": p.submission_week,
-            "shipped": p.shipped,
-            "hackatime_hours": p.hackatime_hours,
-            "review_status": p.review_status,
-            "anomaly_type": get_anomaly_type(p.hackatime_hours),
-            "created_at": p.created_at.isoformat() if p.created_at else None,
+            "project_id": r.project_id,
+            "project_name": r.project_name,
+            "submission_week": r.submission_week,
+            "shipped": r.shipped,
+            "hackatime_hours": r.hackatime_hours,
+            "review_status": r.review_status,
+            "anomaly_type": get_anomaly_type(r.hackatime_hours),
+            "created_at": r.created_at.isoformat() if r.created_at else None,
             "user": {
-                "user_id": p.user.user_id,
-                "handle": p.user.handle
+                "user_id": r.user_id,
+                "handle": r.handle
             }
         }
-        for p in projects
+        for r in rows
     ]
 
 
@@ -364,65 +392,63 @@ def get_user_detail(
     user_id: str,
     db: Session = Depends(get_db)
 ) -> dict:
-    user = db.get(User, user_id)
-    if not user:
+    # The user, its profile, and every count in one statement; roles,
+    # projects and hackatime projects come in one selectin query each
+    other = aliased(User)
+    referrer_user = aliased(User)
+    row = db.query(
+        User,
+        select(func.count(Vote.vote_id)).where(Vote.user_id == User.user_id).scalar_subquery(),
+        select(func.count(Review.review_id)).join(Project, Review.project_id == Project.project_id).where(
+            Project.user_id == User.user_id
+        ).scalar_subquery(),
+        select(func.count()).select_from(UserLoginEvent).where(UserLoginEvent.user_id == User.user_id).scalar_subquery(),
+        select(func.count(other.user_id)).where(other.referred_by_user_id == User.user_id).scalar_subquery(),
+        referrer_user.user_id,
+        referrer_user.handle,
+    ).outerjoin(
+        referrer_user, referrer_user.user_id == User.referred_by_user_id
+    ).options(
+        joinedload(User.profile),
+        selectinload(User.roles),
+        selectinload(User.projects),
+        selectinload(User.hackatime_projects),
+    ).filter(User.user_id == user_id).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
+    user, votes_cast, reviews_received, login_count, referred_users_count, referrer_id, referrer_handle = row
 
-    # Get user's projects with details
-    projects = db.query(Project).filter(Project.user_id == user_id).order_by(Project.created_at.desc()).all()
-    
-    # Calculate total hackatime hours across all projects
+    projects = sorted(user.projects, key=lambda p: p.created_at, reverse=True)
     total_hours = sum(p.hackatime_hours or 0 for p in projects)
     shipped_count = sum(1 for p in projects if p.shipped)
-    
-    # Get hackatime projects
-    hackatime_projects = db.query(HackatimeProject).filter(
-        HackatimeProject.user_id == user_id
-    ).order_by(HackatimeProject.seconds.desc()).all()
+    votes_received = sum(p.vote_count for p in projects)
+
+    hackatime_projects = sorted(user.hackatime_projects, key=lambda hp: hp.seconds, reverse=True)
     total_hackatime_seconds = sum(hp.seconds for hp in hackatime_projects)
-    
-    # Get login events (last 10)
-    login_events = db.query(UserLoginEvent).filter(
-        UserLoginEvent.user_id == user_id
+
+    roles = [ur.role_id for ur in user.roles]
+
+    referrer = {"user_id": referrer_id, "handle": referrer_handle} if referrer_id else None
+
+    # Recent activity, newest first, limited in SQL. Each query is bounded
+    # by the signup time so Postgres can skip partitions from before the user joined
+    login_events = db.query(UserLoginEvent.id, UserLoginEvent.logged_in_at).filter(
+        UserLoginEvent.user_id == user_id,
+        UserLoginEvent.login_date >= user.created_at.astimezone(timezone.utc).date(),
     ).order_by(UserLoginEvent.logged_in_at.desc()).limit(10).all()
-    
-    # Get votes cast by this user
-    votes_cast = db.query(func.count(Vote.vote_id)).filter(Vote.user_id == user_id).scalar() or 0
-    
-    # Get votes received on user's projects
-    votes_received = db.query(func.count(Vote.vote_id)).filter(
-        Vote.project_id.in_([p.project_id for p in projects])
-    ).scalar() or 0 if projects else 0
-    
-    # Get reviews received on user's projects
-    reviews_received = db.query(Review).filter(
-        Review.project_id.in_([p.project_id for p in projects])
-    ).all() if projects else []
-    
-    # Get onboarding events
-    onboarding_events = db.query(OnboardingEvent).filter(
-        OnboardingEvent.user_id == user_id
-    ).order_by(OnboardingEvent.created_at.desc()).all()
-    
-    # Get audit logs for this user
-    audit_logs = db.query(AuditLog).filter(
+
+    onboarding_events = db.query(
+        OnboardingEvent.id, OnboardingEvent.event, OnboardingEvent.slide, OnboardingEvent.created_at
+    ).filter(
+        OnboardingEvent.user_id == user_id,
+        OnboardingEvent.created_at >= user.created_at,
+    ).order_by(OnboardingEvent.created_at.desc()).limit(10).all()
+
+    audit_logs = db.query(AuditLog.id, AuditLog.action, AuditLog.details, AuditLog.created_at).filter(
         AuditLog.object_id == user_id,
-        AuditLog.object_type == "user"
+        AuditLog.object_type == "user",
+        AuditLog.created_at >= user.created_at,
     ).order_by(AuditLog.created_at.desc()).limit(20).all()
-    
-    # Get user roles
-    roles = [ur.role.role_id for ur in user.roles] if user.roles else []
-    
-    # Get referral info
-    referred_users_count = db.query(func.count(User.user_id)).filter(
-        User.referred_by_user_id == user_id
-    ).scalar() or 0
-    
-    referrer = None
-    if user.referred_by_user_id:
-        ref_user = db.get(User, user.referred_by_user_id)
-        if ref_user:
-            referrer = {"user_id": ref_user.user_id, "handle": ref_user.handle}
 
     # Build journey status
     journey = {
@@ -465,8 +491,8 @@ def get_user_detail(
             "total_hackatime_seconds": total_hackatime_seconds,
             "votes_cast": votes_cast,
             "votes_received": votes_received,
-            "reviews_received": len(reviews_received),
-            "login_count": len(login_events),
+            "reviews_received": reviews_received,
+            "login_count": login_count,
             "referred_users": referred_users_count,
         },
         "referrer": referrer,
@@ -510,7 +536,7 @@ def get_user_detail(
                 "slide": oe.slide,
                 "created_at": oe.created_at.isoformat() if oe.created_at else None,
             }
-            for oe in onboarding_events[:10]
+            for oe in onboarding_events
         ],
         "audit_logs": [
             {
@@ -522,3 +548,129 @@ def get_user_detail(
             for al in audit_logs
         ],
     }
+
+
+def _job_run_to_dict(run: JobRun) -> dict:
+    return {
+        "id": run.id,
+        "job_name": run.job_name,
+        "status": run.status,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "duration_ms": run.duration_ms,
+        "items_processed": run.items_processed,
+        "items_failed": run.items_failed,
+        "error": run.error,
+    }
+
+
+@router.get("/jobs")
+def list_jobs(db: Session = Depends(get_db)) -> list[dict]:
+    day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+
+    latest_started = (
+        db.query(JobRun.job_name, func.max(JobRun.started_at).label("started_at"))
+        .group_by(JobRun.job_name)
+        .subquery()
+    )
+    last_runs = {
+        run.job_name: run
+        for run in db.query(JobRun).join(
+            latest_started,
+            (JobRun.job_name == latest_started.c.job_name)
+            & (JobRun.started_at == latest_started.c.started_at)
+        ).all()
+    }
+    failures_24h = dict(
+        db.query(JobRun.job_name, func.count(JobRun.id))
+        .filter(JobRun.status == "failed", JobRun.started_at >= day_ago)
+        .group_by(JobRun.job_name)
+        .all()
+    )
+
+    return [
+        {
+            "name": job.name,
+            "enabled": job.enabled,
+            "interval_seconds": job.interval_seconds,
+            "failures_last_24h": failures_24h.get(job.name, 0),
+            "last_run": _job_run_to_dict(last_runs[job.name]) if job.name in last_runs else None,
+        }
+        for job in JOBS
+    ]
+
+
+@router.get("/jobs/{job_name}/runs")
+def list_job_runs(
+    job_name: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+) -> list[dict]:
+    runs = db.query(JobRun).filter(
+        JobRun.job_name == job_name
+    ).order_by(JobRun.started_at.desc()).offset(skip).limit(limit).all()
+    return [_job_run_to_dict(run) for run in runs]
+
+
+@router.get("/render-pool")
+def get_render_pool_stats() -> dict:
+    """In-flight renders and how many were turned away with 503"""
+    return render_pool.stats()
+
+
+@router.get("/queues")
+def get_queue_stats() -> dict:
+    """Depth and enqueued/flushed/dropped counters for the write-behind queues and buffers"""
+    return {
+        "queues": {q.name: q.stats() for q in EVENT_QUEUES},
+        "counters": {c.name: c.stats() for c in (utm_counter, utm_hit_counter)},
+    }
+
+
+@router.get("/onboarding/funnel")
+def get_onboarding_funnel_stats(
+    cohort_weeks: int = Query(12, ge=1, le=104),
+    db: Session = Depends(get_db)
+) -> dict:
+    """Per-slide reach, drop-off and median time, plus signup-week cohorts (from rollups, refreshed by the onboarding_rollup job)"""
+    return get_onboarding_funnel(db, cohort_weeks)
+
+
+@router.get("/votes/tally")
+def get_vote_tally(
+    week: str = Query(..., description="submission_week to tally"),
+    live: bool = Query(False, description="Tally now instead of reading the vote_tally job's snapshot"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+) -> dict:
+    """Borda and Schulze standings for a submission week, in final rank order"""
+    if live:
+        rows = tally_week(db, week)[skip:skip + limit]
+        computed_at = datetime.now(timezone.utc)
+    else:
+        tallies = db.query(VoteTally).filter(
+            VoteTally.submission_week == week
+        ).order_by(VoteTally.rank).offset(skip).limit(limit).all()
+        rows = [
+            {
+                "project_id": t.project_id,
+                "vote_count": t.vote_count,
+                "borda_score": t.borda_score,
+                "borda_rank": t.borda_rank,
+                "schulze_rank": t.schulze_rank,
+                "rank": t.rank,
+            }
+            for t in tallies
+        ]
+        computed_at = tallies[0].computed_at if tallies else None
+
+    project_names = dict(db.query(Project.project_id, Project.project_name).filter(
+        Project.project_id.in_([row["project_id"] for row in rows])
+    ).all()) if rows else {}
+    return {
+        "week": week,
+        "computed_at": computed_at.isoformat() if computed_at else None,
+        "projects": [{**row, "project_name": project_names.get(row["project_id"])} for row in rows],
+    }
@@ -1,35 +1,95 @@
-from datetime import datetime
-from fastapi import APIRouter, Depends, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, verify_auth
+from app.crud import analytics as crud
 from app.schemas.analytics import OnboardingEventCreate, OnboardingEventRead
-from app.models.onboarding_event import OnboardingEvent
+from app.services.event_queue import EVENT_QUEUE_RETRY_AFTER_SECONDS, onboarding_event_queue
 
 router = APIRouter(prefix="/analytics", tags=["analytics"], dependencies=[Depends(verify_auth)])
 
+MAX_EVENTS_PER_BATCH = 1000
+# Generous for MAX_EVENTS_PER_BATCH events (each is a few hundred bytes at most)
+MAX_BATCH_BYTES = 1024 * 1024
+_event_list_adapter = TypeAdapter(list[OnboardingEventCreate])
 
-@router.post("/onboarding", response_model=OnboardingEventRead, status_code=status.HTTP_201_CREATED)
-def track_onboarding(event_in: OnboardingEventCreate, db: Session = Depends(get_db)) -> OnboardingEventRead:
-    completed_at = None
-    if event_in.completedAt:
-        try:
-            completed_at = datetime.fromisoformat(event_in.completedAt.replace('Z', '+00:00'))
-        except ValueError:
-            pass
-
-    timestamp = datetime.fromisoformat(event_in.timestamp.replace('Z', '+00:00'))
-
-    db_event = OnboardingEvent(
-        user_id=event_in.userId,
-        event=event_in.event,
-        slide=event_in.slide,
-        total_slides=event_in.totalSlides,
-        completed_at=completed_at,
-        timestamp=timestamp
-    )
-    
-    db.add(db_event)
+
+@router.post("/onboarding", response_model=OnboardingEventRead, status_code=status.HTTP_202_ACCEPTED)
+def track_onboarding(event_in: OnboardingEventCreate) -> dict:
+    """Queue one event; the row is written by the background flusher. 503 if it was dropped."""
+    try:
+        row = crud.onboarding_event_row(event_in)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid timestamp")
+
+    if not onboarding_event_queue.put(row):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event could not be recorded, please retry shortly",
+            headers={"Retry-After": str(EVENT_QUEUE_RETRY_AFTER_SECONDS)},
+        )
+    return row
+
+
+def _store_events(db: Session, events: list[OnboardingEventCreate]) -> int:
+    count = crud.insert_onboarding_events(db, events)
     db.commit()
-    db.refresh(db_event)
-    
-    return db_event
+    return count
+
+
+@router.post("/onboarding/batch", status_code=status.HTTP_202_ACCEPTED)
+async def track_onboarding_batch(request: Request, db: Session = Depends(get_db)) -> dict:
+    """
+    Record many onboarding events at once.
+
+    Body is a JSON array of events, or NDJSON (one event per line) when sent
+    as application/x-ndjson. Oversized bodies and batches are rejected with
+    413 before any event is validated. The batch is validated in one pass and
+    inserted with a single multi-row INSERT; nothing is read back.
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"At most {MAX_EVENTS_PER_BATCH} events and {MAX_BATCH_BYTES} bytes per batch"
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BATCH_BYTES:
+        raise too_large
+
+    # Content-Length may be missing (chunked), so cap what is actually read too
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BATCH_BYTES:
+            raise too_large
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type:
+        lines = [line for line in bytes(body).splitlines() if line.strip()]
+        if len(lines) > MAX_EVENTS_PER_BATCH:
+            raise too_large
+        body = b"[" + b",".join(lines) + b"]"
+
+    # Count the events before validating any of them
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([
+            {"type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": e.msg}}
+        ])
+    if isinstance(payload, list) and len(payload) > MAX_EVENTS_PER_BATCH:
+        raise too_large
+
+    try:
+        events = _event_list_adapter.validate_python(payload)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**err, "loc": ("body", *err["loc"])}
+            for err in e.errors(include_url=False, include_context=False, include_input=False)
+        ])
+
+    # Reading the body needs async; the DB write stays off the event loop
+    count = await run_in_threadpool(_store_events, db, events)
+    return {"accepted": count}
@@ -1,15 +1,19 @@
+import hashlib
 from typing import List
-from fastapi import APIRouter, Depends, Query, status, HTTPException, Header
+from fastapi import APIRouter, Depends, Query, status, HTTPException, Header, Response
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, verify_auth
+from app.api.deps import get_db, verify_auth, etag_matches
+from app.api.serializers import PROJECT, PROJECT_LIST, json_response
 from app.schemas.project import ProjectCreate, ProjectRead, ProjectUpdate, UpdateHackatimeProjectsRequest
 from app.schemas.hackatime import HackatimeProject
-from app.schemas.visibility import VisibilityStatus
+from app.schemas.visibility import VisibilityLevel, VisibilityStatus
 from app.schemas.submission import SubmitProjectResponse, SubmissionValidationError
 from app.crud import projects as crud
 from app.crud import users as users_crud
 from app.services.visibility import calculate_visibility
 from app.services.submission import submit_project
+from app.services.gallery import GALLERY_MIN_LEVEL, GallerySort, get_gallery_page, get_gallery_version
+from app.schemas.gallery import GalleryItem, GalleryPage
 
 router = APIRouter(prefix="/projects", tags=["projects"], dependencies=[Depends(verify_auth)])
 
@@ -29,12 +33,39 @@ def get_unlinked_hackatime_projects(
     return crud.get_unlinked_hackatime_projects(db, x_user_id)
 
 
+# The gallery only changes when the gallery_refresh job rebuilds it, so a short shared TTL is safe
+GALLERY_CACHE_CONTROL = "public, max-age=30, s-maxage=60, stale-while-revalidate=300"
+
+
+@router.get("/gallery", response_model=GalleryPage)
+def get_gallery(
+    response: Response,
+    week: str | None = Query(None),
+    min_level: int = Query(GALLERY_MIN_LEVEL, ge=GALLERY_MIN_LEVEL, le=VisibilityLevel.BILLBOARD),
+    sort: GallerySort = Query("featured"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db)
+) -> GalleryPage | Response:
+    """Public project gallery from the precomputed feed, with ETag revalidation"""
+    version = get_gallery_version(db)
+    etag = hashlib.sha256(f"{version}|{week}|{min_level}|{sort}|{skip}|{limit}".encode()).hexdigest()[:32]
+    headers = {"ETag": f'"{etag}"', "Cache-Control": GALLERY_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    entries = get_gallery_page(db, week=week, min_level=min_level, sort=sort, skip=skip, limit=limit)
+    return GalleryPage(version=version, items=[GalleryItem.model_validate(e) for e in entries])
+
+
 @router.get("/{project_id}", response_model=ProjectRead)
-def get_project(project_id: str, db: Session = Depends(get_db)) -> ProjectRead:
+def get_project(project_id: str, db: Session = Depends(get_db)) -> Response:
     project = crud.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return json_response(PROJECT, project)
 
 
 @router.get("", response_model=List[ProjectRead])
@@ -43,10 +74,10 @@ def list_projects(
     limit: int = Query(100, ge=1, le=500),
     user_id: str | None = Query(None),
     db: Session = Depends(get_db)
-) -> List[ProjectRead]:
+) -> Response:
     if user_id:
-        return list(crud.list_projects_by_user(db, user_id, skip=skip, limit=limit))
-    return list(crud.list_projects(db, skip=skip, limit=limit))
+        return json_response(PROJECT_LIST, crud.list_projects_by_user(db, user_id, skip=skip, limit=limit))
+    return json_response(PROJECT_LIST, crud.list_projects(db, skip=skip, limit=limit))
 
 
 @router.patch("/{project_id}", response_model=ProjectRead)
@@ -60,8 +91,7 @@ def update_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    requesting_user = users_crud.get_user(db, x_user_id)
-    if not requesting_user:
+    if not users_crud.user_exists(db, x_user_id):
         raise HTTPException(status_code=404, detail="Requesting user not found")
 
     is_admin = users_crud.has_role(db, x_user_id, "admin")
@@ -84,8 +114,7 @@ def delete_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    requesting_user = users_crud.get_user(db, x_user_id)
-    if not requesting_user:
+    if not users_crud.user_exists(db, x_user_id):
         raise HTTPException(status_code=404, detail="Requesting user not found")
 
     is_admin = users_crud.has_role(db, x_user_id, "admin")
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.api.deps import get_db, verify_auth, etag_matches
+from app.core.utm import UTMCampaign
+from app.crud import users as crud
+from app.services.render_cache import (
+    QR_DEFAULT_SIZE, QR_MAX_SIZE, QR_MIN_SIZE,
+    aget_referral_poster, aget_referral_qr, render_key,
+)
+from app.services.render_pool import RenderPoolSaturated
+
+router = APIRouter(prefix="/referrals", tags=["referrals"], dependencies=[Depends(verify_auth)])
+
+# Renders are content-addressed, so clients can hold on to them; the ETag changes if inputs do
+RENDER_CACHE_CONTROL = "private, max-age=86400"
+
+
+def _png_response(data: bytes | None, etag: str) -> Response:
+    headers = {"ETag": f'"{etag}"', "Cache-Control": RENDER_CACHE_CONTROL}
+    if data is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type="image/png", headers=headers)
+
+
+def _saturated(e: RenderPoolSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Image renderer is busy, please retry shortly",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def _require_code(db: Session, referral_code: str) -> None:
+    if not crud.referral_code_exists(db, referral_code):
+        raise HTTPException(status_code=404, detail="Referral code not found")
+
+
+@router.get("/{referral_code}/qr")
+async def get_qr_code(
+    referral_code: str,
+    campaign: UTMCampaign | None = None,
+    size: int = Query(QR_DEFAULT_SIZE, ge=QR_MIN_SIZE, le=QR_MAX_SIZE),
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db)
+) -> Response:
+    """Referral QR code PNG, served from the render cache"""
+    etag = render_key("qr", referral_code, campaign, size)
+    if etag_matches(if_none_match, etag):
+        return _png_response(None, etag)
+
+    await run_in_threadpool(_require_code, db, referral_code)
+    try:
+        data, etag = await aget_referral_qr(referral_code, campaign, size)
+    except RenderPoolSaturated as e:
+        raise _saturated(e)
+    return _png_response(data, etag)
+
+
+@router.get("/{referral_code}/poster")
+async def get_poster(
+    referral_code: str,
+    campaign: UTMCampaign = UTMCampaign.POSTER,
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db)
+) -> Response:
+    """Printable referral poster PNG, served from the render cache"""
+    etag = render_key("poster", referral_code, campaign)
+    if etag_matches(if_none_match, etag):
+        return _png_response(None, etag)
+
+    await run_in_threadpool(_require_code, db, referral_code)
+    try:
+        data, etag = await aget_referral_poster(referral_code, campaign)
+    except RenderPoolSaturated as e:
+        raise _saturated(e)
+    return _png_response(data, etag)
@@ -2,7 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, Query, status, HTTPException, Header
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, verify_auth, verify_admin, verify_reviewer
-from app.schemas.review import ReviewCreate, ReviewRead, ReviewUpdate
+from app.schemas.review import ReviewCreate, ReviewRead, ReviewUpdate, ReviewQueueLease, ReviewQueueItem, ReviewQueueComplete
 from app.crud import reviews as crud
 from app.crud import users as users_crud
 
@@ -14,6 +14,44 @@ def create_review(review_in: ReviewCreate, db: Session = Depends(get_db)) -> Rev
     return crud.create_review(db, review_in)
 
 
+@router.post("/queue/lease", response_model=List[ReviewQueueItem], dependencies=[Depends(verify_reviewer)])
+def lease_review_queue(
+    lease_in: ReviewQueueLease,
+    x_user_id: str = Header(...),
+    db: Session = Depends(get_db)
+) -> List[ReviewQueueItem]:
+    """
+    Lease the next pending shipped projects to the requesting reviewer.
+
+    Each project is held for REVIEW_LEASE_MINUTES. Concurrent reviewers
+    never receive the same project. Leasing again renews the projects the
+    reviewer already holds.
+    """
+    return list(crud.lease_review_queue(db, x_user_id, lease_in.limit))
+
+
+@router.post("/queue/{project_id}/complete", response_model=ReviewRead, dependencies=[Depends(verify_reviewer)])
+def complete_queued_review(
+    project_id: str,
+    review_in: ReviewQueueComplete,
+    x_user_id: str = Header(...),
+    db: Session = Depends(get_db)
+) -> ReviewRead:
+    """Review a leased project. Returns 409 if the reviewer's lease is missing or expired."""
+    return crud.complete_review(db, project_id, x_user_id, review_in)
+
+
+@router.post("/queue/{project_id}/release", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(verify_reviewer)])
+def release_queued_review(
+    project_id: str,
+    x_user_id: str = Header(...),
+    db: Session = Depends(get_db)
+) -> None:
+    """Return a leased project to the queue unreviewed."""
+    crud.release_review_lease(db, project_id, x_user_id)
+    return None
+
+
 @router.get("/{review_id}", response_model=ReviewRead)
 def get_review(review_id: str, db: Session = Depends(get_db)) -> ReviewRead:
     review = crud.get_review(db, review_id)
@@ -55,8 +93,7 @@ def update_review(
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    requesting_user = users_crud.get_user(db, x_user_id)
-    if not requesting_user:
+    if not users_crud.user_exists(db, x_user_id):
         raise HTTPException(status_code=404, detail="Requesting user not found")
     
     # Ownership check: only the reviewer who created it OR an admin can update
@@ -87,8 +124,7 @@ def delete_review(
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    requesting_user = users_crud.get_user(db, x_user_id)
-    if not requesting_user:
+    if not users_crud.user_exists(db, x_user_id):
         raise HTTPException(status_code=404, detail="Requesting user not found")
     
     # Ownership check: only the reviewer who created it OR an admin can delete
@@ -1,19 +1,22 @@
 from typing import List
 from datetime import date, timedelta
-from fastapi import APIRouter, Depends, Query, status, HTTPException, Header
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, status, HTTPException, Header, Response
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func
 from app.api.deps import get_db, verify_auth, verify_admin
+from app.api.serializers import PROJECT_LIST, USER_PUBLIC_LIST, json_response
 from app.schemas.user import (
     UserCreate, UserUpdate, UserPublicRead, UserSelfRead,
     UserProfileUpdate, UserAddressCreate, UserAddressUpdate,
-    UserExistsResponse, LoginRecordedResponse, LinkIDVRequest
+    UserExistsResponse, LoginRecordedResponse, LinkIDVRequest, MilestonesComplete,
+    UserLookupRequest, UserLookupResponse
 )
 from app.schemas.project import ProjectRead
 from app.crud import users as crud
 from app.models.user import User
 from app.models.user_login_event import UserLoginEvent
 from app.utils.slack import get_slack_username
+from app.services.render_cache import prerender_referral_assets
 
 router = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(verify_auth)])
 
@@ -56,27 +59,36 @@ def _to_self_read(user: User) -> dict:
 
 
 @router.post("", response_model=UserSelfRead, status_code=status.HTTP_201_CREATED)
-def create_user(user_in: UserCreate, db: Session = Depends(get_db)) -> dict:
+def create_user(user_in: UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)) -> dict:
     user = crud.create_user(db, user_in)
+    # Render the referral QR and poster after responding so the first view is a cache hit
+    background_tasks.add_task(prerender_referral_assets, user.referral_code)
     return _to_self_read(user)
 
 
 @router.get("/by-email/{email}")
 def get_user_id_by_email(email: str, db: Session = Depends(get_db)) -> dict:
     """Returns only user_id - no PII"""
-    user = crud.get_user_by_email(db, email)
-    if not user:
+    user_id = crud.get_user_id_by_email(db, email)
+    if not user_id:
         raise HTTPException(status_code=404, detail="User not found")
-    return {"user_id": user.user_id}
+    return {"user_id": user_id}
 
 
 @router.get("/by-identity-vault-id/{identity_vault_id}")
 def get_user_by_identity_vault_id(identity_vault_id: str, db: Session = Depends(get_db)) -> dict:
     """Returns only user_id - no PII"""
-    user = crud.get_user_by_identity_vault_id(db, identity_vault_id)
-    if not user:
+    user_id = crud.get_user_id_by_identity_vault_id(db, identity_vault_id)
+    if not user_id:
         raise HTTPException(status_code=404, detail="User not found")
-    return {"user_id": user.user_id}
+    return {"user_id": user_id}
+
+
+@router.post("/lookup", response_model=UserLookupResponse)
+def lookup_users(data: UserLookupRequest, db: Session = Depends(get_db)) -> UserLookupResponse:
+    """Resolve up to 1000 emails and 1000 IDV ids to user_ids in one query - no PII"""
+    emails, identity_vault_ids = crud.lookup_user_ids(db, data.emails, data.identity_vault_ids)
+    return UserLookupResponse(emails=emails, identity_vault_ids=identity_vault_ids)
 
 
 @router.get("/stats/logins", dependencies=[Depends(verify_admin)])
@@ -85,21 +97,25 @@ def get_login_stats(db: Session = Depends(get_db)) -> dict:
     start_date = date(2025, 10, 28)
     today = date.today()
 
+    # One grouped scan over the partition key; there's at most one row per user per day
+    counts = dict(
+        db.query(UserLoginEvent.login_date, func.count())
+        .filter(UserLoginEvent.login_date >= start_date)
+        .group_by(UserLoginEvent.login_date)
+        .all()
+    )
+
     stats = {}
     current_date = start_date
 
     while current_date <= today:
-        date_str = current_date.isoformat()
-        count = db.query(UserLoginEvent).filter(
-            func.date(UserLoginEvent.logged_in_at) == current_date
-        ).distinct(UserLoginEvent.user_id).count()
-        stats[date_str] = count
+        stats[current_date.isoformat()] = counts.get(current_date, 0)
         current_date += timedelta(days=1)
 
     return stats
 
 
-@router.get("/{user_id}", response_model=UserSelfRead)
+@router.get("/{user_id}", response_model=UserSelfRead | UserPublicRead)
 def get_user(
     user_id: str,
     x_user_id: str = Header(...),
@@ -126,10 +142,10 @@ def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db)
-) -> List[dict]:
+) -> Response:
     """Admin only - returns public info only"""
     users = crud.list_users(db, skip=skip, limit=limit)
-    return [_to_public_read(u) for u in users]
+    return json_response(USER_PUBLIC_LIST, [_to_public_read(u) for u in users])
 
 
 @router.patch("/{user_id}", response_model=UserSelfRead)
@@ -190,23 +206,22 @@ def list_user_projects(
     user_id: str,
     x_user_id: str = Header(...),
     db: Session = Depends(get_db)
-) -> List[ProjectRead]:
+) -> Response:
     """Get user's projects - only self or admin"""
     if x_user_id != user_id:
         is_admin = crud.has_role(db, x_user_id, "admin")
         if not is_admin:
             raise HTTPException(status_code=403, detail="Can only view your own projects")
     
-    user = crud.get_user(db, user_id)
+    user = crud.get_user(db, user_id, loaders=(selectinload(User.projects),))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user.projects
+    return json_response(PROJECT_LIST, user.projects)
 
 
 @router.get("/{user_id}/exists", response_model=UserExistsResponse)
 def check_user_exists(user_id: str, db: Session = Depends(get_db)) -> UserExistsResponse:
-    user = crud.get_user(db, user_id)
-    return UserExistsResponse(exists=user is not None)
+    return UserExistsResponse(exists=crud.user_exists(db, user_id))
 
 
 @router.post("/{user_id}/loggedin", response_model=LoginRecordedResponse)
@@ -334,6 +349,21 @@ def complete_idv(
     return _to_self_read(user)
 
 
+@router.post("/{user_id}/milestones", response_model=UserSelfRead)
+def complete_milestones(
+    user_id: str,
+    data: MilestonesComplete,
+    x_user_id: str = Header(...),
+    db: Session = Depends(get_db)
+) -> dict:
+    """Mark several onboarding milestones complete at once - only self can mark"""
+    if x_user_id != user_id:
+        raise HTTPException(status_code=403, detail="Can only complete your own tasks")
+
+    user = crud.complete_milestones(db, user_id, data.milestones)
+    return _to_self_read(user)
+
+
 @router.post("/{user_id}/link-idv", response_model=UserSelfRead)
 def link_idv(
     user_id: str,
@@ -379,8 +409,7 @@ def get_user_hours(
         if not is_admin:
             raise HTTPException(status_code=403, detail="Can only view your own hours")
     
-    user = crud.get_user(db, user_id)
-    if not user:
+    if not crud.user_exists(db, user_id):
         raise HTTPException(status_code=404, detail="User not found")
     
     from app.models.project import Project
@@ -408,12 +437,12 @@ def sync_handle_from_slack(
     if not user.slack_id:
         raise HTTPException(status_code=400, detail="No Slack ID linked. Please join Slack first.")
     
-    slack_username = get_slack_username(user.slack_id)
+    # The user is explicitly asking to refresh, so only trust a recent cache entry
+    slack_username = get_slack_username(user.slack_id, db=db, max_age_seconds=300)
     if not slack_username:
         raise HTTPException(status_code=502, detail="Failed to fetch Slack username. Please try again later.")
     
     user.handle = slack_username
     db.commit()
-    db.refresh(user)
     
-    return _to_self_read(user)
+    return _to_self_read(crud.get_user(db, user_id))
@@ -1,24 +1,38 @@
-from fastapi import APIRouter, Depends, status
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, verify_auth
-from app.schemas.utm import UTMCreate, UTMRead
-from app.models.utm import UTM
+from app.api.deps import get_db, verify_auth, verify_admin
+from app.crud import utms as crud
+from app.schemas.utm import UTMCreate, UTMRead, UTMHitCreate, UTMFunnelRow
+from app.services.utm_tracking import record_utm_hit, record_utm_landing
 
 router = APIRouter(prefix="/utms", tags=["utms"], dependencies=[Depends(verify_auth)])
 
 
 @router.post("", response_model=UTMRead, status_code=status.HTTP_200_OK)
-def increment_utm(utm_in: UTMCreate, db: Session = Depends(get_db)) -> UTMRead:
-    existing = db.get(UTM, utm_in.utm_source)
-    
-    if existing:
-        existing.count += 1
-        db.commit()
-        db.refresh(existing)
-        return existing
-    
-    new_utm = UTM(utm_source=utm_in.utm_source, count=1)
-    db.add(new_utm)
-    db.commit()
-    db.refresh(new_utm)
-    return new_utm
+def increment_utm(utm_in: UTMCreate, db: Session = Depends(get_db)) -> dict:
+    """Count a hit. Writes are buffered, so count may run slightly ahead of the table."""
+    count = record_utm_hit(db, utm_in.utm_source)
+    return {"utm_source": utm_in.utm_source, "count": count}
+
+
+@router.post("/hits", status_code=status.HTTP_202_ACCEPTED)
+def record_hit(hit_in: UTMHitCreate) -> dict:
+    """Count a landing hit with full UTM tags into the hourly rollup (buffered)"""
+    record_utm_landing(**hit_in.model_dump())
+    return {"accepted": True}
+
+
+@router.get("/funnel", response_model=list[UTMFunnelRow], dependencies=[Depends(verify_admin)])
+def get_funnel(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    attribution_window_days: int = Query(30, ge=1, le=365),
+    db: Session = Depends(get_db)
+) -> list[dict]:
+    """Admin only - hits, signups and onboarded users per campaign. Defaults to the last 7 days."""
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return crud.get_campaign_funnel(db, start, end, attribution_window_days)
@@ -1,10 +1,13 @@
 from typing import List
-from fastapi import APIRouter, Depends, Query, status, HTTPException, Header
+from fastapi import APIRouter, Depends, Query, status, HTTPException, Header, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, verify_auth
-from app.schemas.vote import VoteCreate, VoteRead, VoteUpdate
+from app.api.serializers import VOTE, VOTE_LIST, json_response
+from app.schemas.vote import BallotSubmit, LeaderboardEntry, VoteCreate, VoteRead, VoteUpdate
 from app.crud import votes as crud
 from app.crud import users as users_crud
+from app.services.idempotency import claim_key, save_response
 
 router = APIRouter(prefix="/votes", tags=["votes"], dependencies=[Depends(verify_auth)])
 
@@ -14,12 +17,59 @@ def create_vote(vote_in: VoteCreate, db: Session = Depends(get_db)) -> VoteRead:
     return crud.create_vote(db, vote_in)
 
 
+@router.post("/ballot", response_model=List[VoteRead])
+def submit_ballot(
+    ballot_in: BallotSubmit,
+    idempotency_key: str | None = Header(None, max_length=100),
+    db: Session = Depends(get_db)
+) -> List[VoteRead]:
+    """
+    Submit a voter's rankings in one atomic upsert.
+
+    Projects the voter already ranked are re-ranked, so resubmitting a
+    ballot never creates duplicate votes. With an Idempotency-Key header, a
+    retry of the same ballot replays the first response instead of running
+    again (marked with Idempotent-Replayed: true).
+    """
+    if idempotency_key:
+        previous = claim_key(db, "votes.ballot", idempotency_key, ballot_in.model_dump())
+        if previous is not None:
+            return JSONResponse(previous.response, headers={"Idempotent-Replayed": "true"})
+
+    votes = crud.submit_ballot(db, ballot_in)
+    response = [VoteRead.model_validate(v).model_dump(mode="json") for v in votes]
+    if idempotency_key:
+        save_response(db, "votes.ballot", idempotency_key, response)
+    db.commit()
+    return response
+
+
+@router.get("/leaderboard", response_model=List[LeaderboardEntry])
+def get_leaderboard(
+    week: str = Query(..., description="submission_week to rank"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+) -> List[LeaderboardEntry]:
+    """
+    Projects for a submission week ordered by vote_score, then vote_count.
+
+    Reads the denormalized tallies on projects, so a page costs the same
+    no matter how many votes have been cast.
+    """
+    rows = crud.get_leaderboard(db, week, skip=skip, limit=limit)
+    return [
+        LeaderboardEntry(rank=skip + i + 1, **row._asdict())
+        for i, row in enumerate(rows)
+    ]
+
+
 @router.get("/{vote_id}", response_model=VoteRead)
-def get_vote(vote_id: str, db: Session = Depends(get_db)) -> VoteRead:
+def get_vote(vote_id: str, db: Session = Depends(get_db)) -> Response:
     vote = crud.get_vote(db, vote_id)
     if not vote:
         raise HTTPException(status_code=404, detail="Vote not found")
-    return vote
+    return json_response(VOTE, vote)
 
 
 @router.get("", response_model=List[VoteRead])
@@ -29,12 +79,12 @@ def list_votes(
     project_id: str | None = Query(None),
     user_id: str | None = Query(None),
     db: Session = Depends(get_db)
-) -> List[VoteRead]:
+) -> Response:
     if project_id:
-        return list(crud.list_votes_by_project(db, project_id, skip=skip, limit=limit))
+        return json_response(VOTE_LIST, crud.list_votes_by_project(db, project_id, skip=skip, limit=limit))
     if user_id:
-        return list(crud.list_votes_by_user(db, user_id, skip=skip, limit=limit))
-    return list(crud.list_votes(db, skip=skip, limit=limit))
+        return json_response(VOTE_LIST, crud.list_votes_by_user(db, user_id, skip=skip, limit=limit))
+    return json_response(VOTE_LIST, crud.list_votes(db, skip=skip, limit=limit))
 
 
 @router.patch("/{vote_id}", response_model=VoteRead)
@@ -55,8 +105,7 @@ def update_vote(
     if not vote:
         raise HTTPException(status_code=404, detail="Vote not found")
     
-    requesting_user = users_crud.get_user(db, x_user_id)
-    if not requesting_user:
+    if not users_crud.user_exists(db, x_user_id):
         raise HTTPException(status_code=404, detail="Requesting user not found")
     
     # Ownership check: only the user who cast the vote OR an admin can update
@@ -87,8 +136,7 @@ def delete_vote(
     if not vote:
         raise HTTPException(status_code=404, detail="Vote not found")
     
-    requesting_user = users_crud.get_user(db, x_user_id)
-    if not requesting_user:
+    if not users_crud.user_exists(db, x_user_id):
         raise HTTPException(status_code=404, detail="Requesting user not found")
     
     # Ownership check: only the user who cast the vote OR an admin can delete
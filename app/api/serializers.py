@@ -0,0 +1,33 @@
+"""
+Prebuilt JSON serializers for the hottest read endpoints.
+
+The app's default response class is ORJSONResponse. A route that returns
+ORM objects through response_model still takes FastAPI's generic path:
+validate into the model, dump it to JSON-mode Python objects, then
+encode those. The TypeAdapters here are built once at import. json_response
+validates straight from ORM attributes and encodes in pydantic-core, in one
+pass, so routes using it return a ready Response. Keep response_model on
+those routes for the OpenAPI schema.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.schemas.project import ProjectRead
+from app.schemas.user import UserPublicRead
+from app.schemas.vote import VoteRead
+
+
+PROJECT = TypeAdapter(ProjectRead)
+PROJECT_LIST = TypeAdapter(list[ProjectRead])
+USER_PUBLIC_LIST = TypeAdapter(list[UserPublicRead])
+VOTE = TypeAdapter(VoteRead)
+VOTE_LIST = TypeAdapter(list[VoteRead])
+
+
+def json_response(adapter: TypeAdapter, content: Any, status_code: int = 200) -> Response:
+    """Serialize content (ORM objects or dicts) with adapter into a JSON response."""
+    value = adapter.validate_python(content, from_attributes=True)
+    return Response(adapter.dump_json(value), status_code=status_code, media_type="application/json")
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.onboarding_event import OnboardingEvent
+from app.schemas.analytics import OnboardingEventCreate
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def onboarding_event_row(event_in: OnboardingEventCreate) -> dict:
+    """Column values for one event, ready for a bulk insert."""
+    completed_at = None
+    if event_in.completedAt:
+        try:
+            completed_at = _parse_timestamp(event_in.completedAt)
+        except ValueError:
+            pass
+
+    return {
+        "id": str(uuid4()),
+        "user_id": event_in.userId,
+        "event": event_in.event,
+        "slide": event_in.slide,
+        "total_slides": event_in.totalSlides,
+        "completed_at": completed_at,
+        "timestamp": _parse_timestamp(event_in.timestamp),
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def insert_onboarding_events(db: Session, events: list[OnboardingEventCreate]) -> int:
+    """
+    Insert many events as one multi-row INSERT (no RETURNING, no refresh).
+    Rejects the whole batch if any timestamp is unparseable. Not committed.
+    """
+    rows = []
+    bad = []
+    for i, event_in in enumerate(events):
+        try:
+            rows.append(onboarding_event_row(event_in))
+        except ValueError:
+            bad.append(i)
+
+    if bad:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid timestamp in event(s) at index {bad[:20]}"
+        )
+
+    if rows:
+        db.execute(insert(OnboardingEvent), rows)
+    return len(rows)
@@ -144,6 +144,34 @@ def update_hackatime_projects(
     return project
 
 
+def recalculate_hackatime_hours(db: Session, user_id: str) -> int:
+    """
+    Recalculate hackatime_hours for all of a user's projects from their
+    current linked Hackatime project totals. Returns the number of projects updated.
+    Does not commit.
+    """
+    seconds_by_name = dict(
+        db.query(HackatimeProject.name, HackatimeProject.seconds)
+        .filter(HackatimeProject.user_id == user_id)
+        .all()
+    )
+    projects = db.query(Project).filter(
+        Project.user_id == user_id,
+        Project.hackatime_projects.isnot(None)
+    ).all()
+
+    updated = 0
+    for project in projects:
+        if not project.hackatime_projects:
+            continue
+        total_seconds = sum(seconds_by_name.get(name, 0) for name in project.hackatime_projects)
+        hours = round(total_seconds / 3600.0, 2)
+        if project.hackatime_hours != hours:
+            project.hackatime_hours = hours
+            updated += 1
+    return updated
+
+
 def get_unlinked_hackatime_projects(db: Session, user_id: str) -> list[HackatimeProject]:
     """
     Get hackatime projects NOT yet linked to any of the user's projects.
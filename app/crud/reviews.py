@@ -1,15 +1,73 @@
+import os
+from datetime import datetime, timedelta, timezone
 from typing import Sequence
+from sqlalchemy import case, func, or_, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
+from app.models.audit_log import AuditLog
+from app.models.project import Project
 from app.models.review import Review
-from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.schemas.review import ReviewCreate, ReviewQueueComplete, ReviewUpdate
+
+
+REVIEW_LEASE_MINUTES = int(os.getenv("REVIEW_LEASE_MINUTES", "30"))
+
+REVIEW_STATUSES = ("pending", "approved", "rejected", "flagged")
+
+
+def sync_review_state(db: Session, project_id: str) -> None:
+    """Recompute the project's review state from its Review rows (not committed).
+
+    latest_decision becomes the newest review's decision, lowercased.
+    review_status follows it when the decision is one of REVIEW_STATUSES,
+    and goes back to pending when no reviews are left. The project row is
+    locked first, so concurrent reviews of one project apply in order.
+    """
+    db.query(Project.project_id).filter(Project.project_id == project_id).with_for_update().first()
+    latest = select(func.lower(Review.review_decision)).where(
+        Review.project_id == project_id
+    ).order_by(Review.review_timestamp.desc(), Review.review_id.desc()).limit(1).scalar_subquery()
+    db.execute(
+        update(Project).where(Project.project_id == project_id).values(
+            latest_decision=latest,
+            review_status=case(
+                (latest.is_(None), "pending"),
+                (latest.in_(REVIEW_STATUSES), latest),
+                else_=Project.review_status,
+            ),
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def record_review(db: Session, project_id: str, reviewer_user_id: str, decision: str, comments: str) -> Review:
+    """Add a Review and update the project's review fields to match (not committed)."""
+    review = Review(
+        reviewer_user_id=reviewer_user_id,
+        project_id=project_id,
+        review_comments=comments,
+        review_decision=decision,
+    )
+    db.add(review)
+    db.flush()
+    db.query(Project).filter(Project.project_id == project_id).update(
+        {
+            Project.review_notes: comments,
+            Project.reviewed_by: reviewer_user_id,
+            Project.reviewed_at: func.now(),
+        },
+        synchronize_session=False,
+    )
+    sync_review_state(db, project_id)
+    return review
 
 
 def create_review(db: Session, data: ReviewCreate) -> Review:
     review = Review(**data.model_dump())
     db.add(review)
     try:
+        db.flush()
+        sync_review_state(db, review.project_id)
         db.commit()
         db.refresh(review)
     except IntegrityError:
@@ -46,6 +104,8 @@ def update_review(db: Session, review_id: str, data: ReviewUpdate) -> Review:
         setattr(review, k, v)
     
     try:
+        db.flush()
+        sync_review_state(db, review.project_id)
         db.commit()
         db.refresh(review)
     except IntegrityError:
@@ -62,4 +122,92 @@ def delete_review(db: Session, review_id: str) -> None:
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     db.delete(review)
+    db.flush()
+    sync_review_state(db, review.project_id)
+    db.commit()
+
+
+def lease_review_queue(db: Session, reviewer_user_id: str, limit: int) -> Sequence[Project]:
+    """Lease up to limit pending shipped projects to a reviewer, oldest first.
+
+    Candidates come from ix_projects_review_queue. A project is available
+    when it has no live lease, or when this reviewer already holds it, in
+    which case the lease is renewed. FOR UPDATE SKIP LOCKED lets
+    concurrent reviewers pass over rows another lease call is claiming, so
+    no two reviewers get the same project.
+    """
+    now = datetime.now(timezone.utc)
+    candidates = select(Project.project_id).where(
+        Project.review_status == "pending",
+        Project.shipped,
+        or_(
+            Project.review_lease_expires_at.is_(None),
+            Project.review_lease_expires_at < now,
+            Project.review_lease_owner == reviewer_user_id,
+        ),
+    ).order_by(Project.created_at, Project.project_id).limit(limit).with_for_update(skip_locked=True)
+
+    leased = db.scalars(
+        update(Project).where(Project.project_id.in_(candidates.scalar_subquery())).values(
+            review_lease_owner=reviewer_user_id,
+            review_lease_expires_at=now + timedelta(minutes=REVIEW_LEASE_MINUTES),
+            # A lease isn't an edit; keep updated_at (and the gallery signature) as is
+            updated_at=Project.updated_at,
+        ).returning(Project),
+        execution_options={"populate_existing": True},
+    ).all()
     db.commit()
+    return sorted(leased, key=lambda p: (p.created_at, p.project_id))
+
+
+def _get_leased_project(db: Session, project_id: str, reviewer_user_id: str) -> Project:
+    project = db.get(Project, project_id, with_for_update=True, populate_existing=True)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if (
+        project.review_lease_owner != reviewer_user_id
+        or project.review_lease_expires_at is None
+        or project.review_lease_expires_at < datetime.now(timezone.utc)
+    ):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="You don't hold a lease on this project; lease it from the queue first"
+        )
+    return project
+
+
+def release_review_lease(db: Session, project_id: str, reviewer_user_id: str) -> None:
+    """Hand a leased project back to the queue without reviewing it."""
+    project = _get_leased_project(db, project_id, reviewer_user_id)
+    project.review_lease_owner = None
+    project.review_lease_expires_at = None
+    db.commit()
+
+
+def complete_review(db: Session, project_id: str, reviewer_user_id: str, data: ReviewQueueComplete) -> Review:
+    """Write the review, the project's review status and the audit log in one transaction, and end the lease."""
+    project = _get_leased_project(db, project_id, reviewer_user_id)
+    now = datetime.now(timezone.utc)
+    old_status = project.review_status
+
+    review = record_review(db, project_id, reviewer_user_id, data.review_decision, data.review_comments)
+    project.review_lease_owner = None
+    project.review_lease_expires_at = None
+
+    db.add(AuditLog(
+        user_id=reviewer_user_id,
+        object_type="project",
+        object_id=project_id,
+        action="review_completed",
+        details={
+            "old_status": old_status,
+            "new_status": data.review_decision,
+            "notes": data.review_comments,
+        },
+        created_at=now,
+    ))
+
+    db.commit()
+    db.refresh(review)
+    return review
@@ -1,5 +1,5 @@
 from typing import Sequence
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.models.user import User
@@ -8,10 +8,31 @@ from app.models.user_address import UserAddress
 from app.models.user_role import UserRole
 from app.models.user_login_event import UserLoginEvent
 from app.schemas.user import UserCreate, UserUpdate, UserProfileUpdate, UserAddressCreate, UserAddressUpdate
+# Loader strategies for the user serializers in app/api/routers/users.py.
+# Collections use selectinload so a page of users doesn't multiply rows,
+# and addresses only need their ids for has_address.
+SELF_READ_LOADERS = (
+    joinedload(User.profile),
+    selectinload(User.roles),
+    selectinload(User.addresses).load_only(UserAddress.id),
+)
+PUBLIC_READ_LOADERS = (
+    joinedload(User.profile),
+    selectinload(User.roles),
+)
+
+
 def create_user(db: Session, data: UserCreate) -> User:
     from uuid import uuid4
     
-    user_data = data.model_dump(exclude={"profile", "address"})
+    user_data = data.model_dump(exclude={"profile", "address", "referred_by_code"})
+
+    if data.referred_by_code:
+        # Unknown codes are ignored rather than failing the signup
+        referrer_id = db.query(User.user_id).filter(
+            User.referral_code == data.referred_by_code.upper()
+        ).scalar()
+        user_data["referred_by_user_id"] = referrer_id
 
     # Generate user_id upfront so we can use it for related records
     user_id = str(uuid4())
@@ -27,7 +48,6 @@ def create_user(db: Session, data: UserCreate) -> User:
 
     try:
         db.commit()
-        db.refresh(user)
     except IntegrityError as e:
         db.rollback()
         print(f"IntegrityError creating user: {e}")
@@ -35,50 +55,74 @@ def create_user(db: Session, data: UserCreate) -> User:
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Email or Slack ID already exists: {str(e.orig)}"
         )
-    return user
+    return get_user(db, user_id)
 
 
-def get_user(db: Session, user_id: str) -> User | None:
-    return db.query(User).options(
-        joinedload(User.profile),
-        joinedload(User.addresses),
-        joinedload(User.roles).joinedload(UserRole.role)
-    ).filter(User.user_id == user_id).first()
+def get_user(db: Session, user_id: str, loaders: tuple = SELF_READ_LOADERS) -> User | None:
+    return db.query(User).options(*loaders).filter(User.user_id == user_id).first()
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
-    return db.query(User).options(
-        joinedload(User.profile),
-        joinedload(User.addresses),
-        joinedload(User.roles).joinedload(UserRole.role)
-    ).filter(User.email == email.lower()).first()
+    return db.query(User).options(*SELF_READ_LOADERS).filter(User.email == email.lower()).first()
 
 
 def get_user_by_handle(db: Session, handle: str) -> User | None:
-    return db.query(User).options(
-        joinedload(User.profile),
-        joinedload(User.addresses),
-        joinedload(User.roles).joinedload(UserRole.role)
-    ).filter(User.handle == handle).first()
+    return db.query(User).options(*SELF_READ_LOADERS).filter(User.handle == handle).first()
 
 
 def get_user_by_identity_vault_id(db: Session, identity_vault_id: str) -> User | None:
-    return db.query(User).options(
-        joinedload(User.profile),
-        joinedload(User.addresses),
-        joinedload(User.roles).joinedload(UserRole.role)
-    ).filter(User.identity_vault_id == identity_vault_id).first()
+    return db.query(User).options(*SELF_READ_LOADERS).filter(User.identity_vault_id == identity_vault_id).first()
+
+
+def user_exists(db: Session, user_id: str) -> bool:
+    return db.query(User.user_id).filter(User.user_id == user_id).first() is not None
+
+
+def get_user_id_by_email(db: Session, email: str) -> str | None:
+    return db.query(User.user_id).filter(User.email == email.lower()).scalar()
+
+
+def get_user_id_by_identity_vault_id(db: Session, identity_vault_id: str) -> str | None:
+    return db.query(User.user_id).filter(User.identity_vault_id == identity_vault_id).scalar()
+
+
+def lookup_user_ids(db: Session, emails: list[str], identity_vault_ids: list[str]) -> tuple[dict, dict]:
+    """Resolve emails and IDV ids to user_ids in one query. Unknown keys map to None."""
+    from sqlalchemy import or_
+
+    emails = {e: e.lower() for e in emails}
+    conditions = []
+    if emails:
+        conditions.append(User.email.in_(set(emails.values())))
+    if identity_vault_ids:
+        conditions.append(User.identity_vault_id.in_(set(identity_vault_ids)))
+
+    by_email: dict[str, str] = {}
+    by_idv: dict[str, str] = {}
+    if conditions:
+        for user_id, email, identity_vault_id in db.query(
+            User.user_id, User.email, User.identity_vault_id
+        ).filter(or_(*conditions)).all():
+            by_email[email] = user_id
+            if identity_vault_id:
+                by_idv[identity_vault_id] = user_id
+
+    return (
+        {original: by_email.get(lowered) for original, lowered in emails.items()},
+        {idv: by_idv.get(idv) for idv in identity_vault_ids},
+    )
+
+
+def referral_code_exists(db: Session, referral_code: str) -> bool:
+    return db.query(User.user_id).filter(User.referral_code == referral_code).first() is not None
 
 
 def list_users(db: Session, skip: int = 0, limit: int = 100) -> Sequence[User]:
-    return db.query(User).options(
-        joinedload(User.profile),
-        joinedload(User.roles).joinedload(UserRole.role)
-    ).offset(skip).limit(limit).all()
+    return db.query(User).options(*PUBLIC_READ_LOADERS).offset(skip).limit(limit).all()
 
 
 def update_user(db: Session, user_id: str, data: UserUpdate) -> User:
-    user = get_user(db, user_id)
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -87,14 +131,13 @@ def update_user(db: Session, user_id: str, data: UserUpdate) -> User:
 
     try:
         db.commit()
-        db.refresh(user)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=409,
             detail="Email or Slack ID already exists"
         )
-    return user
+    return get_user(db, user_id)
 
 
 def update_user_profile(db: Session, user_id: str, data: UserProfileUpdate) -> UserProfile:
@@ -198,35 +241,41 @@ def has_role(db: Session, user_id: str, role_id: str) -> bool:
 
 def record_login(db: Session, user_id: str) -> tuple[UserLoginEvent, bool]:
     """Record a login event for a user, deduplicated to one per day (UTC).
-    
+
+    The unique (user_id, login_date) index does the dedup, so a first login
+    of the day is a single INSERT and concurrent pings can't double count.
+
     Returns:
         Tuple of (login_event, is_new) where is_new is False if already logged in today.
     """
-    from datetime import datetime, timezone, timedelta
-    from sqlalchemy import func as sql_func
-    
-    user = db.get(User, user_id)
-    if not user:
+    from datetime import datetime, timezone
+    from uuid import uuid4
+    from app.db import dialect_insert
+
+    now = datetime.now(timezone.utc)
+    values = {"id": str(uuid4()), "user_id": user_id, "logged_in_at": now, "login_date": now.date()}
+
+    insert = dialect_insert(db)
+    stmt = insert(UserLoginEvent).values(**values).on_conflict_do_nothing(
+        index_elements=[UserLoginEvent.user_id, UserLoginEvent.login_date]
+    ).returning(UserLoginEvent.id)
+
+    try:
+        inserted = db.execute(stmt).scalar()
+        db.commit()
+    except IntegrityError:
+        # Only the users FK can fail here
+        db.rollback()
         raise HTTPException(status_code=404, detail="User not found")
 
-    today_utc = datetime.now(timezone.utc).date()
-    today_start = datetime.combine(today_utc, datetime.min.time()).replace(tzinfo=timezone.utc)
-    today_end = today_start + timedelta(days=1)
-    
+    if inserted:
+        return UserLoginEvent(**values), True
+
     existing = db.query(UserLoginEvent).filter(
         UserLoginEvent.user_id == user_id,
-        UserLoginEvent.logged_in_at >= today_start,
-        UserLoginEvent.logged_in_at < today_end
+        UserLoginEvent.login_date == values["login_date"],
     ).first()
-    
-    if existing:
-        return existing, False
-    
-    login_event = UserLoginEvent(user_id=user_id)
-    db.add(login_event)
-    db.commit()
-    db.refresh(login_event)
-    return login_event, True
+    return existing, False
 
 
 def get_login_events(db: Session, user_id: str, limit: int = 100) -> Sequence[UserLoginEvent]:
@@ -235,60 +284,52 @@ def get_login_events(db: Session, user_id: str, limit: int = 100) -> Sequence[Us
     ).order_by(UserLoginEvent.logged_in_at.desc()).limit(limit).all()
 
 
-def complete_storyline(db: Session, user_id: str) -> User:
-    from datetime import datetime, timezone
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if not user.storyline_completed_at:
-        user.storyline_completed_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(user)
+MILESTONE_COLUMNS = {
+    "storyline": User.storyline_completed_at,
+    "hackatime": User.hackatime_completed_at,
+    "slack": User.slack_linked_at,
+    "idv": User.idv_completed_at,
+    "onboarding": User.onboarding_completed_at,
+}
 
-    return user
 
+def complete_milestones(db: Session, user_id: str, milestones: list[str]) -> User:
+    """Stamp each milestone's completion time in one UPDATE, keeping any earlier stamp.
 
-def complete_hackatime(db: Session, user_id: str) -> User:
-    from datetime import datetime, timezone
-    user = db.get(User, user_id)
-    if not user:
+    Returns the user with profile, addresses and roles loaded for the self read.
+    """
+    from sqlalchemy import update, func as sql_func
+
+    columns = {MILESTONE_COLUMNS[m].key: sql_func.coalesce(MILESTONE_COLUMNS[m], sql_func.now()) for m in milestones}
+    updated = db.execute(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(**columns)
+        .returning(User.user_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if not updated:
+        db.rollback()
         raise HTTPException(status_code=404, detail="User not found")
+    db.commit()
 
-    if not user.hackatime_completed_at:
-        user.hackatime_completed_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(user)
+    return get_user(db, user_id)
 
-    return user
 
+def complete_storyline(db: Session, user_id: str) -> User:
+    return complete_milestones(db, user_id, ["storyline"])
 
-def complete_slack_link(db: Session, user_id: str) -> User:
-    from datetime import datetime, timezone
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    if not user.slack_linked_at:
-        user.slack_linked_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(user)
+def complete_hackatime(db: Session, user_id: str) -> User:
+    return complete_milestones(db, user_id, ["hackatime"])
 
-    return user
 
+def complete_slack_link(db: Session, user_id: str) -> User:
+    return complete_milestones(db, user_id, ["slack"])
 
-def complete_idv(db: Session, user_id: str) -> User:
-    from datetime import datetime, timezone
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    if not user.idv_completed_at:
-        user.idv_completed_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(user)
-
-    return user
+def complete_idv(db: Session, user_id: str) -> User:
+    return complete_milestones(db, user_id, ["idv"])
 
 
 def link_idv(
@@ -326,7 +367,6 @@ def link_idv(
     
     try:
         db.commit()
-        db.refresh(user)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -334,18 +374,8 @@ def link_idv(
             detail="This identity is already linked to another account"
         )
     
-    return user
+    return get_user(db, user_id)
 
 
 def complete_onboarding(db: Session, user_id: str) -> User:
-    from datetime import datetime, timezone
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if not user.onboarding_completed_at:
-        user.onboarding_completed_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(user)
-
-    return user
+    return complete_milestones(db, user_id, ["onboarding"])
@@ -1,16 +1,132 @@
+from datetime import datetime
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from app.models.utm import Utm
-from app.schemas.utm import UtmCreate
+from app.core.utm import UTM_CONFIGS
+from app.db import dialect_insert
+from app.models.utm import UTM
+from app.models.utm_hit import UTMHit
 
+# (bucket_start, utm_campaign, utm_source, utm_medium, referral_code)
+UTMHitKey = tuple[datetime, str, str, str, str]
 
-def increment_utm(db: Session, data: UtmCreate) -> Utm:
-    utm = db.get(Utm, data.utm_source)
-    if utm:
-        utm.count += 1
-    else:
-        utm = Utm(utm_source=data.utm_source, count=1)
-        db.add(utm)
 
-    db.commit()
-    db.refresh(utm)
-    return utm
+def get_utm_count(db: Session, utm_source: str) -> int:
+    utm = db.get(UTM, utm_source)
+    return utm.count if utm else 0
+
+
+def add_utm_counts(db: Session, deltas: dict[str, int]) -> dict[str, int]:
+    """
+    Add buffered hit counts in one statement and return the new totals.
+
+    Rows are written in key order so concurrent flushes from several
+    workers take row locks in the same order and can't deadlock. Not
+    committed.
+    """
+    if not deltas:
+        return {}
+
+    insert = dialect_insert(db)
+    stmt = insert(UTM).values([
+        {"utm_source": source, "count": delta}
+        for source, delta in sorted(deltas.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UTM.utm_source],
+        set_={"count": UTM.count + stmt.excluded.count},
+    ).returning(UTM.utm_source, UTM.count)
+
+    return {source: count for source, count in db.execute(stmt).all()}
+
+
+def add_utm_hit_counts(db: Session, deltas: dict[UTMHitKey, int]) -> None:
+    """Add buffered hourly hit counts in one statement. Not committed."""
+    if not deltas:
+        return
+
+    insert = dialect_insert(db)
+    stmt = insert(UTMHit).values([
+        {
+            "bucket_start": bucket_start,
+            "utm_campaign": campaign,
+            "utm_source": source,
+            "utm_medium": medium,
+            "referral_code": referral_code,
+            "hits": delta,
+        }
+        for (bucket_start, campaign, source, medium, referral_code), delta in sorted(deltas.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            UTMHit.bucket_start, UTMHit.utm_campaign, UTMHit.utm_source,
+            UTMHit.utm_medium, UTMHit.referral_code,
+        ],
+        set_={"hits": UTMHit.hits + stmt.excluded.hits},
+    )
+    db.execute(stmt)
+
+
+# Hits per (campaign, source, medium) in the window, plus signups in the window
+# credited to the referrer's most recent tagged hit before signup (last touch).
+# Signups via a referral link with no tagged hit land in the '' row.
+# Postgres only (LATERAL).
+_FUNNEL_SQL = text("""
+WITH hits AS (
+    SELECT utm_campaign, utm_source, utm_medium, SUM(hits) AS hits
+    FROM utm_hits
+    WHERE bucket_start >= :start AND bucket_start < :end
+    GROUP BY utm_campaign, utm_source, utm_medium
+),
+signups AS (
+    SELECT
+        COALESCE(touch.utm_campaign, '') AS utm_campaign,
+        COALESCE(touch.utm_source, '') AS utm_source,
+        COALESCE(touch.utm_medium, '') AS utm_medium,
+        COUNT(*) AS signups,
+        COUNT(u.onboarding_completed_at) AS onboarded
+    FROM users u
+    JOIN users referrer ON referrer.user_id = u.referred_by_user_id
+    LEFT JOIN LATERAL (
+        SELECT h.utm_campaign, h.utm_source, h.utm_medium
+        FROM utm_hits h
+        WHERE h.referral_code = referrer.referral_code
+          AND h.bucket_start <= u.created_at
+          AND h.bucket_start > u.created_at - make_interval(days => :window_days)
+        ORDER BY h.bucket_start DESC
+        LIMIT 1
+    ) touch ON TRUE
+    WHERE u.created_at >= :start AND u.created_at < :end
+    GROUP BY 1, 2, 3
+)
+SELECT
+    COALESCE(h.utm_campaign, s.utm_campaign) AS utm_campaign,
+    COALESCE(h.utm_source, s.utm_source) AS utm_source,
+    COALESCE(h.utm_medium, s.utm_medium) AS utm_medium,
+    COALESCE(h.hits, 0) AS hits,
+    COALESCE(s.signups, 0) AS signups,
+    COALESCE(s.onboarded, 0) AS onboarded
+FROM hits h
+FULL OUTER JOIN signups s
+    ON s.utm_campaign = h.utm_campaign AND s.utm_source = h.utm_source AND s.utm_medium = h.utm_medium
+ORDER BY signups DESC, hits DESC
+""")
+
+
+def get_campaign_funnel(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    attribution_window_days: int = 30,
+) -> list[dict]:
+    """Hits -> signups -> onboarded per campaign for [start, end), in one query."""
+    # Map raw UTM triples back to the UTMCampaign that generates them
+    known = {(c.campaign, c.source, c.medium): key.value for key, c in UTM_CONFIGS.items()}
+
+    rows = db.execute(
+        _FUNNEL_SQL,
+        {"start": start, "end": end, "window_days": attribution_window_days},
+    ).mappings().all()
+    return [
+        {**row, "campaign_key": known.get((row["utm_campaign"], row["utm_source"], row["utm_medium"]))}
+        for row in rows
+    ]
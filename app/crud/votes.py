@@ -1,19 +1,73 @@
 from typing import Sequence
+from uuid import uuid4
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
+from app.db import dialect_insert
+from app.models.project import Project
+from app.models.user import User
 from app.models.vote import Vote
-from app.schemas.vote import VoteCreate, VoteUpdate
+from app.schemas.vote import BallotSubmit, VoteCreate, VoteUpdate
+
+
+# A vote ranked r earns VOTE_POINTS_RANKS + 1 - r points (3/2/1 for the
+# top three); lower rankings still count towards vote_count but score 0
+VOTE_POINTS_RANKS = 3
+
+
+def vote_points(vote_ranking: int) -> int:
+    return max(VOTE_POINTS_RANKS + 1 - vote_ranking, 0)
+
+
+def _lock_voter(db: Session, user_id: str) -> bool:
+    """Serialize vote writes per voter for the rest of the transaction.
+
+    Tally deltas are computed from the voter's existing votes, so two
+    concurrent writes for the same voter must not both read the old state.
+    FOR NO KEY UPDATE doesn't block FK checks against the user row.
+    Returns False if the user doesn't exist.
+    """
+    return db.query(User.user_id).filter(User.user_id == user_id).with_for_update(key_share=True).first() is not None
+
+
+def _adjust_tallies(db: Session, deltas: dict[str, tuple[int, int]]) -> None:
+    """Apply (count, score) deltas to projects' vote_count/vote_score in the current transaction.
+
+    The increment happens in SQL, so concurrent votes on the same project
+    serialize on the row lock instead of overwriting each other's totals.
+    Projects are updated in id order so concurrent ballots can't deadlock.
+    """
+    for project_id, (count, score) in sorted(deltas.items()):
+        if not count and not score:
+            continue
+        db.query(Project).filter(Project.project_id == project_id).update(
+            {
+                Project.vote_count: Project.vote_count + count,
+                Project.vote_score: Project.vote_score + score,
+                # A vote isn't an edit; keep updated_at as is
+                Project.updated_at: Project.updated_at,
+            },
+            synchronize_session=False,
+        )
 
 
 def create_vote(db: Session, data: VoteCreate) -> Vote:
     vote = Vote(**data.model_dump())
-    db.add(vote)
     try:
+        _lock_voter(db, vote.user_id)
+        db.add(vote)
+        db.flush()
+        _adjust_tallies(db, {vote.project_id: (1, vote_points(vote.vote_ranking))})
         db.commit()
         db.refresh(vote)
-    except IntegrityError:
+    except IntegrityError as e:
         db.rollback()
+        if "uq_votes_user_id_project_id" in str(e.orig):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="User has already voted for this project"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid user_id or project_id or database constraint violation"
@@ -21,6 +75,45 @@ def create_vote(db: Session, data: VoteCreate) -> Vote:
     return vote
 
 
+def submit_ballot(db: Session, data: BallotSubmit) -> list[Vote]:
+    """Upsert all of a voter's rankings in one statement (not committed).
+
+    Projects already on the voter's ballot are re-ranked and new ones are
+    added; votes for projects left off this ballot are kept.
+    """
+    if not _lock_voter(db, data.user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    rankings = {r.project_id: r.vote_ranking for r in data.rankings}
+    previous = dict(db.query(Vote.project_id, Vote.vote_ranking).filter(
+        Vote.user_id == data.user_id, Vote.project_id.in_(rankings)
+    ).all())
+
+    insert = dialect_insert(db)
+    stmt = insert(Vote).values([
+        {"vote_id": str(uuid4()), "user_id": data.user_id, "project_id": project_id, "vote_ranking": ranking}
+        for project_id, ranking in sorted(rankings.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Vote.user_id, Vote.project_id],
+        set_={"vote_ranking": stmt.excluded.vote_ranking, "timestamp": func.now()},
+    ).returning(Vote)
+
+    try:
+        votes = db.scalars(stmt, execution_options={"populate_existing": True}).all()
+    except IntegrityError:
+        # Only the projects FK can fail here
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Invalid project_id in ballot")
+
+    _adjust_tallies(db, {
+        project_id: (0, vote_points(ranking) - vote_points(previous[project_id]))
+        if project_id in previous else (1, vote_points(ranking))
+        for project_id, ranking in rankings.items()
+    })
+    return sorted(votes, key=lambda v: (v.vote_ranking, v.project_id))
+
+
 def get_vote(db: Session, vote_id: str) -> Vote | None:
     return db.get(Vote, vote_id)
 
@@ -42,10 +135,20 @@ def update_vote(db: Session, vote_id: str, data: VoteUpdate) -> Vote:
     if not vote:
         raise HTTPException(status_code=404, detail="Vote not found")
     
+    # Re-read under the voter lock in case a concurrent write changed it
+    _lock_voter(db, vote.user_id)
+    vote = db.get(Vote, vote_id, populate_existing=True)
+    if not vote:
+        raise HTTPException(status_code=404, detail="Vote not found")
+    old_ranking = vote.vote_ranking
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(vote, k, v)
+    if vote.vote_ranking != old_ranking:
+        vote.timestamp = func.now()
     
     try:
+        db.flush()
+        _adjust_tallies(db, {vote.project_id: (0, vote_points(vote.vote_ranking) - vote_points(old_ranking))})
         db.commit()
         db.refresh(vote)
     except IntegrityError:
@@ -61,5 +164,25 @@ def delete_vote(db: Session, vote_id: str) -> None:
     vote = get_vote(db, vote_id)
     if not vote:
         raise HTTPException(status_code=404, detail="Vote not found")
+    _lock_voter(db, vote.user_id)
+    vote = db.get(Vote, vote_id, populate_existing=True)
+    if not vote:
+        raise HTTPException(status_code=404, detail="Vote not found")
+    _adjust_tallies(db, {vote.project_id: (-1, -vote_points(vote.vote_ranking))})
     db.delete(vote)
     db.commit()
+
+
+def get_leaderboard(db: Session, submission_week: str, skip: int = 0, limit: int = 50) -> list:
+    """One page of a week's projects by vote_score, read from ix_projects_leaderboard."""
+    return db.query(
+        Project.project_id,
+        Project.project_name,
+        Project.user_id,
+        Project.vote_count,
+        Project.vote_score,
+    ).filter(
+        Project.submission_week == submission_week
+    ).order_by(
+        Project.vote_score.desc(), Project.vote_count.desc(), Project.project_id
+    ).offset(skip).limit(limit).all()
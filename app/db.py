@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.dialects import postgresql, sqlite
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -21,3 +22,10 @@ SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, futu
 
 class Base(DeclarativeBase):
     pass
+
+
+def dialect_insert(db: Session):
+    """insert() for the session's dialect, so ON CONFLICT upserts work on Postgres and SQLite."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
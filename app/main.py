@@ -1,8 +1,8 @@
-import asyncio
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.api.routers.users import router as users_router
 
 # Configure logging to actually output
@@ -24,11 +24,16 @@ from app.api.routers.analytics import router as analytics_router
 from app.api.routers.roles import router as roles_router
 from app.api.routers.utms import router as utms_router
 from app.api.routers.admin import router as admin_router
+from app.api.routers.referrals import router as referrals_router
 from app.db import Base, engine, SessionLocal
 from app.models import User, Project, Review, Vote, RSVP
 from sqlalchemy import and_
-from jobs.idv_sync import idv_sync_task
-from jobs.airtable_sync import airtable_sync_task
+from jobs.registry import JOBS
+from jobs.runner import start_jobs
+from app.services.poster import load_poster_template
+from app.services.render_pool import render_pool
+from app.services.utm_tracking import utm_counter, utm_hit_counter
+from app.services.event_queue import EVENT_QUEUES
 
 
 @asynccontextmanager
@@ -37,14 +42,27 @@ async def lifespan(app: FastAPI):
     app.state.start_time = datetime.now()
     logger.info(f"[STARTUP] BuildBoard Backend starting - Build: {BUILD_VERSION}")
 
-    airtable_task = asyncio.create_task(airtable_sync_task())
-    idv_task = asyncio.create_task(idv_sync_task())
+    # Decode the poster template once up front rather than on the first poster request
+    load_poster_template()
+    render_pool.start()
+    utm_counter.start()
+    utm_hit_counter.start()
+    for event_queue in EVENT_QUEUES:
+        event_queue.start()
+
+    job_tasks = start_jobs(JOBS)
     yield
-    airtable_task.cancel()
-    idv_task.cancel()
+    for task in job_tasks:
+        task.cancel()
+    render_pool.shutdown()
+    # Write out any buffered UTM hits before the process exits
+    utm_counter.stop()
+    utm_hit_counter.stop()
+    for event_queue in EVENT_QUEUES:
+        event_queue.stop()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 app.include_router(users_router)
@@ -58,6 +76,7 @@ app.include_router(analytics_router)
 app.include_router(utms_router)
 app.include_router(roles_router)
 app.include_router(admin_router)
+app.include_router(referrals_router)
 
 
 @app.get("/")
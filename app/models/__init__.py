@@ -12,7 +12,16 @@ from app.models.vote import Vote
 from app.models.onboarding_event import OnboardingEvent
 from app.models.rsvp import RSVP
 from app.models.utm import UTM
+from app.models.utm_hit import UTMHit
 from app.models.audit_log import AuditLog
+from app.models.job_run import JobRun
+from app.models.slack_profile import SlackProfile
+from app.models.onboarding_progress import OnboardingProgress
+from app.models.onboarding_slide_timing import OnboardingSlideTiming
+from app.models.job_watermark import JobWatermark
+from app.models.gallery_entry import GalleryEntry
+from app.models.vote_tally import VoteTally
+from app.models.idempotency_key import IdempotencyKey
 
 __all__ = [
     "User",
@@ -29,5 +38,14 @@ __all__ = [
     "OnboardingEvent",
     "RSVP",
     "UTM",
+    "UTMHit",
     "AuditLog",
+    "JobRun",
+    "SlackProfile",
+    "OnboardingProgress",
+    "OnboardingSlideTiming",
+    "JobWatermark",
+    "GalleryEntry",
+    "VoteTally",
+    "IdempotencyKey",
 ]
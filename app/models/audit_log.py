@@ -1,19 +1,26 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
-from sqlalchemy import String, DateTime, ForeignKey, func, JSON
+from sqlalchemy import String, DateTime, ForeignKey, Index, func, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db import Base
 
 
 class AuditLog(Base):
+    """Partitioned by month on created_at (Postgres); see jobs/partition_maintenance.py."""
     __tablename__ = "audit_logs"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.user_id"), nullable=False, index=True)
     object_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
-    object_id: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    object_id: Mapped[str] = mapped_column(String(100), nullable=False)
     action: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     details: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Partition key, so part of the primary key
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc), server_default=func.now())
 
     user: Mapped["User"] = relationship("User")
+
+    __table_args__ = (
+        Index("ix_audit_logs_object_id", "object_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
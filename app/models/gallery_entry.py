@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, Float, ForeignKey, Index, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class GalleryEntry(Base):
+    """Precomputed public gallery feed, rebuilt by the gallery_refresh job when projects, votes, reviews or users change."""
+    __tablename__ = "gallery_entries"
+
+    project_id: Mapped[str] = mapped_column(String(36), ForeignKey("projects.project_id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    handle: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    project_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[str] = mapped_column(String(300), nullable=False)
+    project_type: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    code_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    live_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    attachment_urls: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    submission_week: Mapped[str] = mapped_column(String(50), nullable=False)
+    hackatime_hours: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    vote_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    visibility_level: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Position in the default (featured) ordering
+    rank: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_gallery_entries_submission_week_rank", "submission_week", "rank"),
+    )
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response for a client-supplied Idempotency-Key, so a retried request replays instead of re-running."""
+    __tablename__ = "idempotency_keys"
+
+    # The endpoint the key was used on, e.g. "votes.ballot"
+    scope: Mapped[str] = mapped_column(String(50), primary_key=True)
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # sha256 of the request body; reusing a key with a different body is rejected
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    response: Mapped[dict | list | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
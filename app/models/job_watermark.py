@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class JobWatermark(Base):
+    """How far an incremental job has read through its source table."""
+    __tablename__ = "job_watermarks"
+
+    job_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Tie-breaker for rows sharing last_created_at
+    last_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
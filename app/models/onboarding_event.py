@@ -1,18 +1,26 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
-from sqlalchemy import String, DateTime, Integer, func
+from sqlalchemy import String, DateTime, Integer, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db import Base
 
 
 class OnboardingEvent(Base):
+    """Partitioned by month on created_at (Postgres); see jobs/partition_maintenance.py."""
     __tablename__ = "onboarding_events"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
-    user_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), nullable=False)
     event: Mapped[str] = mapped_column(String(50), nullable=False)
     slide: Mapped[int | None] = mapped_column(Integer, nullable=True)
     total_slides: Mapped[int | None] = mapped_column(Integer, nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Partition key, so part of the primary key
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_onboarding_events_user_id", "user_id", "created_at"),
+        Index("ix_onboarding_events_created_at_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
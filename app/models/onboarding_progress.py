@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, Boolean, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class OnboardingProgress(Base):
+    """Per-user onboarding state, rolled up from onboarding_events by the onboarding_rollup job."""
+    __tablename__ = "onboarding_progress"
+
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    first_event_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    max_slide: Mapped[int] = mapped_column(Integer, nullable=False, default=0, index=True)
+    total_slides: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_slide_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    skipped: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class OnboardingSlideTiming(Base):
+    """
+    Histogram of seconds taken to reach each slide from the previous one.
+    bucket indexes into SLIDE_TIMING_BUCKETS in app/services/onboarding_funnel.py.
+    """
+    __tablename__ = "onboarding_slide_timings"
+
+    slide: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
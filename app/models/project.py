@@ -1,6 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, func, JSON, Boolean, Float, ARRAY
+from sqlalchemy import String, Integer, Text, DateTime, ForeignKey, Index, func, text, JSON, Boolean, Float, ARRAY, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db import Base
 
@@ -26,9 +27,27 @@ class Project(Base):
     hackatime_projects: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
     hackatime_hours: Mapped[float | None] = mapped_column(Float, nullable=True)
     review_status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False, index=True)
+    # Lowercased decision of the newest Review row; maintained by app.crud.reviews
+    latest_decision: Mapped[str | None] = mapped_column(String(50), nullable=True)
     review_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     reviewed_by: Mapped[str | None] = mapped_column(String(36), ForeignKey("users.user_id", use_alter=True), nullable=True)
     reviewed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Review queue lease: the reviewer currently holding this project, until the lease expires
+    review_lease_owner: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    review_lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Maintained by app.crud.votes in the same transaction as the vote rows
+    vote_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    vote_score: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Full-text search over name (weight A) and description (weight B); see app.services.search
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(project_name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(project_description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -36,3 +55,19 @@ class Project(Base):
     votes: Mapped[list["Vote"]] = relationship("Vote", back_populates="project", cascade="all, delete-orphan")
     reviews: Mapped[list["Review"]] = relationship("Review", back_populates="project", cascade="all, delete-orphan")
     hackatime_links: Mapped[list["ProjectHackatimeLink"]] = relationship("ProjectHackatimeLink", back_populates="project", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Covers the weekly leaderboard: an index-only scan in score order
+        Index(
+            "ix_projects_leaderboard",
+            "submission_week", vote_score.desc(), vote_count.desc(), "project_id",
+            postgresql_include=["project_name", "user_id"],
+        ),
+        # The review queue: pending shipped projects, oldest first
+        Index(
+            "ix_projects_review_queue",
+            "created_at", "project_id",
+            postgresql_where=text("review_status = 'pending' AND shipped"),
+        ),
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import String, Text, DateTime, ForeignKey, func
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db import Base
 
@@ -17,3 +17,7 @@ class Review(Base):
     
     reviewer: Mapped["User"] = relationship("User")
     project: Mapped["Project"] = relationship("Project", back_populates="reviews")
+
+    __table_args__ = (
+        Index("ix_reviews_project_id_approved", "project_id", postgresql_where=text("review_decision = 'approved'")),
+    )
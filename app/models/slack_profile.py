@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class SlackProfile(Base):
+    __tablename__ = "slack_profiles"
+
+    slack_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    username: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    display_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    real_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    avatar_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    @property
+    def preferred_name(self) -> str | None:
+        # Prefer display_name, fall back to real_name, then username
+        return self.display_name or self.real_name or self.username
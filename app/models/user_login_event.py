@@ -1,15 +1,27 @@
-from datetime import datetime
+from datetime import date, datetime, timezone
 from uuid import uuid4
-from sqlalchemy import String, DateTime, ForeignKey, func
+from sqlalchemy import String, DateTime, Date, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db import Base
 
 
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
 class UserLoginEvent(Base):
+    """One row per user per UTC day. Partitioned by month on login_date (Postgres); see jobs/partition_maintenance.py."""
     __tablename__ = "user_login_events"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
-    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.user_id"), nullable=False, index=True)
-    logged_in_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.user_id"), nullable=False)
+    logged_in_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
+    # UTC day of logged_in_at; partition key, so part of the primary key
+    login_date: Mapped[date] = mapped_column(Date, primary_key=True, default=utc_today)
 
     user: Mapped["User"] = relationship("User", back_populates="login_events")
+
+    __table_args__ = (
+        Index("uq_user_login_events_user_id_login_date", "user_id", "login_date", unique=True),
+        {"postgresql_partition_by": "RANGE (login_date)"},
+    )
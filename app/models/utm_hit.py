@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class UTMHit(Base):
+    """Landing hits rolled up per hour. Empty string (not NULL) marks a missing UTM field so upserts can match."""
+    __tablename__ = "utm_hits"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    utm_campaign: Mapped[str] = mapped_column(String(64), primary_key=True, default="")
+    utm_source: Mapped[str] = mapped_column(String(64), primary_key=True, default="")
+    utm_medium: Mapped[str] = mapped_column(String(64), primary_key=True, default="")
+    referral_code: Mapped[str] = mapped_column(String(8), primary_key=True, default="")
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Last-touch lookup for a referred signup: newest bucket for a code before signup time
+        Index("ix_utm_hits_referral_code_bucket_start", "referral_code", "bucket_start"),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import String, Integer, DateTime, ForeignKey, func
+from sqlalchemy import String, Integer, DateTime, ForeignKey, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db import Base
 
@@ -12,7 +12,12 @@ class Vote(Base):
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.user_id"), nullable=False, index=True)
     project_id: Mapped[str] = mapped_column(String(36), ForeignKey("projects.project_id"), nullable=False, index=True)
     vote_ranking: Mapped[int] = mapped_column(Integer, nullable=False)
+    # When the ranking was last set
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     user: Mapped["User"] = relationship("User")
     project: Mapped["Project"] = relationship("Project", back_populates="votes")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "project_id", name="uq_votes_user_id_project_id"),
+    )
@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, BigInteger, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db import Base
+
+
+class VoteTally(Base):
+    """Snapshot of a submission week's ranked-choice tally, written by the vote_tally job."""
+    __tablename__ = "vote_tallies"
+
+    submission_week: Mapped[str] = mapped_column(String(50), primary_key=True)
+    project_id: Mapped[str] = mapped_column(String(36), ForeignKey("projects.project_id", ondelete="CASCADE"), primary_key=True)
+    # Ballots that ranked this project
+    vote_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    borda_score: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    borda_rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    # None for projects outside the Schulze finalists
+    schulze_rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Final position: Schulze order for the finalists, then Borda order
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_vote_tallies_submission_week_rank", "submission_week", "rank"),
+    )
@@ -1,15 +1,19 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Literal
 
 
+# onboarding_events.slide/total_slides are Postgres integer columns
+INT32_MAX = 2**31 - 1
+
+
 class OnboardingEventCreate(BaseModel):
-    userId: str
+    userId: str = Field(max_length=36)
     event: Literal['onboarding_started', 'onboarding_next', 'onboarding_skip', 'onboarding_completed']
-    slide: int | None = None
-    totalSlides: int | None = None
-    completedAt: str | None = None
-    timestamp: str
+    slide: int | None = Field(default=None, ge=0, le=INT32_MAX)
+    totalSlides: int | None = Field(default=None, ge=0, le=INT32_MAX)
+    completedAt: str | None = Field(default=None, max_length=64)
+    timestamp: str = Field(max_length=64)
 
 
 class OnboardingEventRead(BaseModel):
@@ -0,0 +1,25 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class GalleryItem(BaseModel):
+    project_id: str
+    user_id: str
+    handle: str | None = None
+    project_name: str
+    description: str
+    project_type: str | None = None
+    code_url: str | None = None
+    live_url: str | None = None
+    attachment_urls: list[str] | None = None
+    submission_week: str
+    hackatime_hours: float
+    vote_count: int
+    visibility_level: int
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GalleryPage(BaseModel):
+    version: str
+    items: list[GalleryItem]
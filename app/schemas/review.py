@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -23,3 +24,27 @@ class ReviewRead(ReviewBase):
     project_id: str
     review_timestamp: datetime
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewQueueLease(BaseModel):
+    limit: int = Field(default=10, ge=1, le=50)
+
+
+class ReviewQueueItem(BaseModel):
+    project_id: str
+    user_id: str
+    project_name: str
+    project_description: str
+    project_type: str | None = None
+    code_url: str | None = None
+    live_url: str | None = None
+    submission_week: str
+    hackatime_hours: float | None = None
+    created_at: datetime
+    review_lease_expires_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewQueueComplete(BaseModel):
+    review_decision: Literal["approved", "rejected", "flagged"]
+    review_comments: str = Field(min_length=1)
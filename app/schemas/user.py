@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
 
@@ -71,6 +72,8 @@ class UserCreate(BaseModel):
     ysws_eligible: bool | None = None
     profile: UserProfileCreate
     address: UserAddressCreate | None = None
+    # Referral code of the user who referred this signup, from the /r/{code} landing link
+    referred_by_code: str | None = Field(default=None, max_length=8)
 
 
 class LinkIDVRequest(BaseModel):
@@ -115,10 +118,28 @@ class UserSelfRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+Milestone = Literal["storyline", "hackatime", "slack", "idv", "onboarding"]
+
+
+class MilestonesComplete(BaseModel):
+    milestones: list[Milestone] = Field(min_length=1)
+
+
 class UserExistsResponse(BaseModel):
     exists: bool
 
 
+class UserLookupRequest(BaseModel):
+    emails: list[str] = Field(default=[], max_length=1000)
+    identity_vault_ids: list[str] = Field(default=[], max_length=1000)
+
+
+class UserLookupResponse(BaseModel):
+    """Maps each requested key to its user_id, or null if there's no match"""
+    emails: dict[str, str | None] = {}
+    identity_vault_ids: dict[str, str | None] = {}
+
+
 class LoginRecordedResponse(BaseModel):
     message: str
     logged_in_at: str
@@ -1,8 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class UTMCreate(BaseModel):
-    utm_source: str
+    utm_source: str = Field(max_length=255)
 
 
 class UTMRead(BaseModel):
@@ -11,3 +11,20 @@ class UTMRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UTMHitCreate(BaseModel):
+    utm_source: str = Field(default="", max_length=64)
+    utm_medium: str = Field(default="", max_length=64)
+    utm_campaign: str = Field(default="", max_length=64)
+    referral_code: str = Field(default="", max_length=8)
+
+
+class UTMFunnelRow(BaseModel):
+    utm_campaign: str
+    utm_source: str
+    utm_medium: str
+    campaign_key: str | None = None
+    hits: int
+    signups: int
+    onboarded: int
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 
 class VoteBase(BaseModel):
@@ -15,9 +15,34 @@ class VoteUpdate(BaseModel):
     vote_ranking: int | None = Field(default=None, ge=1)
 
 
+class BallotRanking(VoteBase):
+    project_id: str
+
+
+class BallotSubmit(BaseModel):
+    user_id: str
+    rankings: list[BallotRanking] = Field(min_length=1, max_length=100)
+
+    @field_validator("rankings")
+    @classmethod
+    def one_ranking_per_project(cls, rankings: list[BallotRanking]) -> list[BallotRanking]:
+        if len({r.project_id for r in rankings}) != len(rankings):
+            raise ValueError("each project can only be ranked once per ballot")
+        return rankings
+
+
 class VoteRead(VoteBase):
     vote_id: str
     user_id: str
     project_id: str
     timestamp: datetime
     model_config = ConfigDict(from_attributes=True)
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    project_id: str
+    project_name: str
+    user_id: str
+    vote_count: int
+    vote_score: int
@@ -0,0 +1,126 @@
+"""
+Airtable writer used by the Airtable sync job.
+
+Creates records in batches of 10 (the most Airtable accepts per request),
+keeps under Airtable's 5 requests/second per-base limit with a token bucket,
+and retries rate-limited (429) and transient (5xx) responses.
+"""
+
+import time
+import logging
+import httpx
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+AIRTABLE_BATCH_SIZE = 10
+AIRTABLE_REQUESTS_PER_SECOND = 5.0
+# Airtable asks clients to wait 30 seconds after a 429 before retrying
+AIRTABLE_RATE_LIMIT_BACKOFF_SECONDS = 30.0
+
+
+class AirtableError(Exception):
+    """Raised when Airtable rejects a write or retries are exhausted."""
+    pass
+
+
+def _retry_after_seconds(response: httpx.Response, default: float) -> float:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return default
+
+
+class AirtableWriter:
+    def __init__(
+        self,
+        api_key: str,
+        base_id: str,
+        table_name: str,
+        api_url: str = AIRTABLE_API_URL,
+        requests_per_second: float = AIRTABLE_REQUESTS_PER_SECOND,
+        rate_limit_backoff_seconds: float = AIRTABLE_RATE_LIMIT_BACKOFF_SECONDS,
+        max_retries: int = 5,
+        timeout: float = 30.0,
+        client: httpx.Client | None = None,
+    ):
+        self.url = f"{api_url.rstrip('/')}/{base_id}/{table_name}"
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        # No burst allowance: requests are spaced evenly so no 1s window exceeds the limit
+        self.bucket = TokenBucket(rate=requests_per_second, capacity=1)
+        self.rate_limit_backoff_seconds = rate_limit_backoff_seconds
+        self.max_retries = max_retries
+        self.client = client or httpx.Client(timeout=timeout)
+        self._owns_client = client is None
+
+    def close(self) -> None:
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self) -> "AirtableWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def create_records(self, fields_list: list[dict]) -> list[dict]:
+        """
+        Create one Airtable record per item in `fields_list`.
+
+        Splits the input into batches of 10 and returns the created records
+        in order. Raises AirtableError if any batch can't be confirmed.
+        """
+        created: list[dict] = []
+        for start in range(0, len(fields_list), AIRTABLE_BATCH_SIZE):
+            created.extend(self.create_batch(fields_list[start:start + AIRTABLE_BATCH_SIZE]))
+        return created
+
+    def create_batch(self, fields_batch: list[dict]) -> list[dict]:
+        """Create up to 10 records in a single request, retrying on 429 and 5xx."""
+        if not fields_batch:
+            return []
+        if len(fields_batch) > AIRTABLE_BATCH_SIZE:
+            raise ValueError(f"Airtable accepts at most {AIRTABLE_BATCH_SIZE} records per request")
+
+        payload = {"records": [{"fields": fields} for fields in fields_batch], "typecast": True}
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.client.post(self.url, json=payload, headers=self.headers)
+            except httpx.HTTPError as e:
+                if attempt == self.max_retries:
+                    raise AirtableError(f"Request failed after {attempt + 1} attempts: {e}") from e
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            if response.status_code == 429:
+                delay = _retry_after_seconds(response, self.rate_limit_backoff_seconds)
+                logger.warning(f"[Airtable] Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                self.bucket.pause(delay)
+                continue
+
+            if response.status_code >= 500:
+                if attempt == self.max_retries:
+                    break
+                time.sleep(min(2 ** attempt, 30))
+                continue
+
+            if response.status_code != 200:
+                raise AirtableError(f"Airtable returned {response.status_code}: {response.text[:200]}")
+
+            records = response.json().get("records", [])
+            if len(records) != len(fields_batch):
+                raise AirtableError(
+                    f"Airtable confirmed {len(records)} of {len(fields_batch)} records"
+                )
+            return records
+
+        raise AirtableError(f"Gave up after {self.max_retries + 1} attempts")
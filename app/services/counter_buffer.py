@@ -0,0 +1,173 @@
+"""
+Write-behind counter buffer.
+
+Hot counters (UTM hits and the like) are incremented in memory and
+flushed to the database as one batched upsert every few hundred
+milliseconds. A burst of thousands of hits becomes a single statement per
+interval, and it carries no per-request read-modify-write.
+
+If a flush fails, each key is retried on its own. Keys that succeed are
+written; a key that fails while others succeed is merged back and dropped
+after COUNTER_BUFFER_MAX_KEY_FAILURES such failures, so one bad key can't
+stall every counter. If every key fails (the database is down), the whole
+batch is merged back and retried on the next tick, so a blip delays counts
+rather than losing them. Whatever is buffered when the process stops is
+flushed by stop().
+
+Running totals are kept for at most COUNTER_BUFFER_MAX_TOTALS keys, least
+recently flushed first out; an evicted key is re-seeded on its next hit.
+"""
+
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Hashable
+
+
+COUNTER_BUFFER_MAX_KEY_FAILURES = 3
+COUNTER_BUFFER_MAX_TOTALS = int(os.getenv("COUNTER_BUFFER_MAX_TOTALS", "10000"))
+
+
+class CounterBuffer:
+    def __init__(
+        self,
+        name: str,
+        flush_fn: Callable[[dict[Hashable, int]], dict[Hashable, int] | None],
+        interval_ms: int = 500,
+        max_totals: int = COUNTER_BUFFER_MAX_TOTALS,
+    ):
+        """
+        flush_fn receives {key: delta} and may return {key: new_total} so the
+        buffer can report running totals without reading the database.
+        """
+        self.name = name
+        self.flush_fn = flush_fn
+        self.interval = interval_ms / 1000
+        self._pending: Counter = Counter()
+        self._totals: OrderedDict[Hashable, int] = OrderedDict()
+        self.max_totals = max_totals
+        self._key_failures: Counter = Counter()
+        self._lock = threading.Lock()
+        # Serialises flushes so a shutdown flush can't race the background one
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.flushed = 0
+        self.flush_failures = 0
+        self.dropped = 0
+        self.last_flush_ms: float | None = None
+
+    def add(self, key: Hashable, n: int = 1) -> int:
+        """Buffer an increment; returns the pending delta for key."""
+        with self._lock:
+            self._pending[key] += n
+            return self._pending[key]
+
+    def pending(self, key: Hashable) -> int:
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def running_total(self, key: Hashable) -> int | None:
+        """Last flushed total plus what's still buffered, or None if no total is known yet."""
+        with self._lock:
+            total = self._totals.get(key)
+            return None if total is None else total + self._pending.get(key, 0)
+
+    def seed_total(self, key: Hashable, value: int) -> None:
+        with self._lock:
+            if key not in self._totals:
+                self._store_totals({key: value})
+
+    def _store_totals(self, totals: dict[Hashable, int]) -> None:
+        """Record totals, evicting the least recently updated keys (caller holds _lock)."""
+        for key, value in totals.items():
+            self._totals[key] = value
+            self._totals.move_to_end(key)
+        while len(self._totals) > self.max_totals:
+            self._totals.popitem(last=False)
+
+    def flush(self) -> int:
+        """Write out everything buffered so far. Returns the number of keys flushed."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, Counter()
+
+            start = time.perf_counter()
+            try:
+                totals = self.flush_fn(dict(batch))
+            except Exception as e:
+                self.flush_failures += 1
+                print(f"⚠️  [{self.name}] Flush of {len(batch)} key(s) failed, retrying key by key: {e}")
+                return self._flush_keys(batch)
+
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            self._written(batch, totals)
+            return len(batch)
+
+    def _written(self, batch: Counter, totals: dict[Hashable, int] | None) -> None:
+        self.flushed += sum(batch.values())
+        with self._lock:
+            for key in batch:
+                self._key_failures.pop(key, None)
+            if totals:
+                self._store_totals(totals)
+
+    def _flush_keys(self, batch: Counter) -> int:
+        """Flush one key at a time after a failed batch. Returns the number of keys written."""
+        failed = {}
+        for key, delta in batch.items():
+            try:
+                totals = self.flush_fn({key: delta})
+            except Exception as e:
+                failed[key] = (delta, e)
+            else:
+                self._written(Counter({key: delta}), totals)
+
+        with self._lock:
+            if len(failed) == len(batch):
+                # Nothing got through: treat it as an outage and keep everything
+                self._pending.update(batch)
+                return 0
+            for key, (delta, e) in failed.items():
+                self._key_failures[key] += 1
+                if self._key_failures[key] >= COUNTER_BUFFER_MAX_KEY_FAILURES:
+                    del self._key_failures[key]
+                    self.dropped += delta
+                    print(f"❌ [{self.name}] Dropping {delta} count(s) for {key!r} after {COUNTER_BUFFER_MAX_KEY_FAILURES} failures: {e}")
+                else:
+                    self._pending[key] += delta
+        return len(batch) - len(failed)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background flusher and flush whatever is left."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = sum(self._pending.values())
+        return {
+            "pending": pending,
+            "flushed": self.flushed,
+            "flush_failures": self.flush_failures,
+            "dropped": self.dropped,
+            "last_flush_ms": round(self.last_flush_ms, 2) if self.last_flush_ms is not None else None,
+            "running": self._thread is not None,
+        }
@@ -0,0 +1,200 @@
+"""
+In-process queue for high-volume analytics writes.
+
+Requests put row dicts on a bounded queue and return immediately. A
+background thread drains the queue and writes each batch with a single
+multi-row INSERT. A batch that keeps failing is retried row by row, so
+only the offending rows are dropped. When the queue is full, the policy
+decides what happens:
+  - "drop": the row is discarded and counted (fine for analytics)
+  - "block": the caller waits up to block_timeout for space, then drops
+
+Rows get their id and created_at when enqueued, so timestamps reflect
+the request, not the flush. The lifespan drains the queues on shutdown.
+Outside the API process (jobs, scripts) the flusher isn't running, and
+put() writes synchronously instead.
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Literal
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from app.db import Base, SessionLocal
+from app.models.onboarding_event import OnboardingEvent
+
+
+EVENT_QUEUE_MAX_SIZE = int(os.getenv("EVENT_QUEUE_MAX_SIZE", "10000"))
+EVENT_QUEUE_BATCH_SIZE = int(os.getenv("EVENT_QUEUE_BATCH_SIZE", "500"))
+EVENT_QUEUE_FLUSH_INTERVAL_MS = int(os.getenv("EVENT_QUEUE_FLUSH_INTERVAL_MS", "250"))
+EVENT_QUEUE_MAX_RETRIES = 3
+# Sent with the 503 a request gets when its row was dropped
+EVENT_QUEUE_RETRY_AFTER_SECONDS = int(os.getenv("EVENT_QUEUE_RETRY_AFTER_SECONDS", "5"))
+
+QueuePolicy = Literal["drop", "block"]
+
+
+class EventQueue:
+    def __init__(
+        self,
+        name: str,
+        model: type[Base],
+        policy: QueuePolicy = "drop",
+        max_size: int = EVENT_QUEUE_MAX_SIZE,
+        batch_size: int = EVENT_QUEUE_BATCH_SIZE,
+        flush_interval_ms: int = EVENT_QUEUE_FLUSH_INTERVAL_MS,
+        block_timeout: float = 1.0,
+    ):
+        self.name = name
+        self.model = model
+        self.policy = policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.block_timeout = block_timeout
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._counter_lock = threading.Lock()
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _count(self, field: str, n: int = 1) -> None:
+        with self._counter_lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def put(self, row: dict) -> bool:
+        """Queue a row for insert. Returns False if it was dropped."""
+        row.setdefault("id", str(uuid4()))
+        row.setdefault("created_at", datetime.now(timezone.utc))
+
+        if self._thread is None:
+            return self._write_now(row)
+
+        try:
+            if self.policy == "block":
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+        self._count("enqueued")
+        return True
+
+    def _write_now(self, row: dict) -> bool:
+        try:
+            self._insert([row])
+        except Exception as e:
+            self._count("failed")
+            print(f"⚠️  [{self.name}] Direct write failed: {e}")
+            return False
+        self._count("flushed")
+        return True
+
+    def _insert(self, rows: list[dict]) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(self.model), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _drain(self, limit: int) -> list[dict]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write_batch(self, rows: list[dict]) -> None:
+        for attempt in range(EVENT_QUEUE_MAX_RETRIES):
+            try:
+                self._insert(rows)
+                self._count("flushed", len(rows))
+                return
+            except Exception as e:
+                if attempt == EVENT_QUEUE_MAX_RETRIES - 1:
+                    print(f"⚠️  [{self.name}] Batch of {len(rows)} failed {EVENT_QUEUE_MAX_RETRIES} times, writing rows one by one: {e}")
+                    self._write_rows(rows)
+                else:
+                    time.sleep(0.5 * (attempt + 1))
+
+    def _write_rows(self, rows: list[dict]) -> None:
+        """Insert rows individually so one bad row doesn't take the batch with it."""
+        for row in rows:
+            try:
+                self._insert([row])
+            except Exception as e:
+                self._count("failed")
+                print(f"❌ [{self.name}] Dropping row {row.get('id')}: {e}")
+            else:
+                self._count("flushed")
+
+    def flush(self) -> int:
+        """Write everything queued right now. Returns the number of rows taken off the queue."""
+        total = 0
+        while True:
+            rows = self._drain(self.batch_size)
+            if not rows:
+                return total
+            self._write_batch(rows)
+            total += len(rows)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                # Wake on the first row, then give the batch a moment to fill
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if self._queue.qsize() < self.batch_size - 1:
+                self._stop.wait(self.flush_interval)
+            rows = [first] + self._drain(self.batch_size - 1)
+            self._write_batch(rows)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write out whatever is still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "depth": self._queue.qsize(),
+            "max_size": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "running": self._thread is not None,
+        }
+
+
+# Analytics can be shed under load. Audit logs are not queued: they are
+# written in the same transaction as the change they record.
+onboarding_event_queue = EventQueue("Onboarding Events", OnboardingEvent, policy="drop")
+
+EVENT_QUEUES = [onboarding_event_queue]
@@ -0,0 +1,129 @@
+"""
+Public project gallery.
+
+The gallery_refresh job keeps gallery_entries in sync with projects,
+votes, reviews and the owners' handles. Each run computes a cheap change signature (row counts
+and latest timestamps) and rebuilds the whole table only when the
+signature moved. The signature is also the gallery version. Responses
+use it for their ETag, so clients and CDNs revalidate with a single
+primary key lookup.
+
+Only projects at COMMUNITY visibility or above appear in the gallery.
+"""
+
+import hashlib
+from typing import Literal
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+
+from app.models.gallery_entry import GalleryEntry
+from app.models.job_watermark import JobWatermark
+from app.models.project import Project
+from app.models.review import Review
+from app.models.user import User
+from app.models.vote import Vote
+from app.schemas.visibility import VisibilityLevel
+from app.services.visibility import visibility_level
+
+
+GALLERY_MIN_LEVEL = VisibilityLevel.COMMUNITY
+GALLERY_DESCRIPTION_LENGTH = 300
+WATERMARK_NAME = "gallery_refresh"
+
+GallerySort = Literal["featured", "votes", "hours", "recent"]
+
+SORT_ORDERS = {
+    "featured": (GalleryEntry.rank,),
+    "votes": (GalleryEntry.vote_count.desc(), GalleryEntry.rank),
+    "hours": (GalleryEntry.hackatime_hours.desc(), GalleryEntry.rank),
+    "recent": (GalleryEntry.created_at.desc(), GalleryEntry.rank),
+}
+
+
+def gallery_signature(db: Session) -> str:
+    """Changes whenever a project, vote, review or user is added, edited or removed."""
+    parts = [
+        *db.query(func.count(Project.project_id), func.max(Project.updated_at)).one(),
+        # entries copy the owner's handle
+        *db.query(func.count(User.user_id), func.max(User.updated_at)).one(),
+        *db.query(func.count(Vote.vote_id), func.max(Vote.timestamp)).one(),
+        *db.query(func.count(Review.review_id), func.max(Review.review_timestamp)).one(),
+    ]
+    return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+
+
+def get_gallery_version(db: Session) -> str:
+    watermark = db.get(JobWatermark, WATERMARK_NAME)
+    # last_id holds the signature the table was last built from
+    return watermark.last_id if watermark and watermark.last_id else "empty"
+
+
+def rebuild_gallery(db: Session) -> int:
+    """Replace gallery_entries with the current feed (not committed). Returns the row count."""
+
+    rows = []
+    for p in db.query(
+        Project.project_id,
+        Project.user_id,
+        User.handle,
+        Project.project_name,
+        Project.project_description,
+        Project.project_type,
+        Project.code_url,
+        Project.live_url,
+        Project.attachment_urls,
+        Project.submission_week,
+        Project.shipped,
+        Project.github_repo_path,
+        Project.hackatime_projects,
+        Project.hackatime_hours,
+        Project.vote_count,
+        Project.latest_decision,
+        Project.created_at,
+    ).join(User, Project.user_id == User.user_id):
+        level = visibility_level(p)
+        if level < GALLERY_MIN_LEVEL:
+            continue
+        rows.append({
+            "project_id": p.project_id,
+            "user_id": p.user_id,
+            "handle": p.handle,
+            "project_name": p.project_name,
+            "description": (p.project_description or "")[:GALLERY_DESCRIPTION_LENGTH],
+            "project_type": p.project_type,
+            "code_url": p.code_url,
+            "live_url": p.live_url,
+            "attachment_urls": p.attachment_urls,
+            "submission_week": p.submission_week,
+            "hackatime_hours": p.hackatime_hours or 0.0,
+            "vote_count": p.vote_count,
+            "visibility_level": int(level),
+            "created_at": p.created_at,
+        })
+
+    rows.sort(key=lambda r: (-r["visibility_level"], -r["vote_count"], -r["hackatime_hours"], r["created_at"], r["project_id"]))
+    for rank, row in enumerate(rows):
+        row["rank"] = rank
+
+    db.execute(delete(GalleryEntry))
+    if rows:
+        # Core insert: the ORM form splits rows into one INSERT per pattern of NULL columns
+        db.execute(insert(GalleryEntry.__table__), rows)
+    return len(rows)
+
+
+def get_gallery_page(
+    db: Session,
+    week: str | None = None,
+    min_level: int = GALLERY_MIN_LEVEL,
+    sort: GallerySort = "featured",
+    skip: int = 0,
+    limit: int = 50,
+) -> list[GalleryEntry]:
+    query = db.query(GalleryEntry)
+    if week:
+        query = query.filter(GalleryEntry.submission_week == week)
+    if min_level > GALLERY_MIN_LEVEL:
+        query = query.filter(GalleryEntry.visibility_level >= min_level)
+    return query.order_by(*SORT_ORDERS[sort]).offset(skip).limit(limit).all()
@@ -0,0 +1,72 @@
+"""
+Idempotency-Key handling for retry-prone write endpoints.
+
+A client sends the same Idempotency-Key header on every retry of one
+logical request. The first request claims the key by inserting its row
+in the same transaction as the write. A retry that arrives while the
+first is still running blocks on the primary key until that transaction
+ends. It then sees the committed row and replays the stored response. If
+the first request failed and rolled back, the key is free again.
+
+Keys are kept for IDEMPOTENCY_KEY_TTL_HOURS and purged by the
+idempotency_cleanup job.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.db import dialect_insert
+from app.models.idempotency_key import IdempotencyKey
+
+
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+
+def request_hash(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def claim_key(db: Session, scope: str, key: str, payload: dict) -> IdempotencyKey | None:
+    """Claim key for this request (not committed).
+
+    Returns None when the key is new and the caller should do the work,
+    then call save_response. Returns the earlier request's row when this
+    is a replay. Raises 422 if the key was already used with a different
+    payload.
+    """
+    digest = request_hash(payload)
+    insert = dialect_insert(db)
+    claimed = db.execute(
+        insert(IdempotencyKey).values(scope=scope, key=key, request_hash=digest)
+        .on_conflict_do_nothing(index_elements=[IdempotencyKey.scope, IdempotencyKey.key])
+        .returning(IdempotencyKey.key)
+    ).scalar()
+    if claimed:
+        return None
+
+    existing = db.get(IdempotencyKey, (scope, key))
+    if existing.request_hash != digest:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used for a different request",
+        )
+    return existing
+
+
+def save_response(db: Session, scope: str, key: str, response) -> None:
+    """Store the response for a claimed key (not committed)."""
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.scope == scope, IdempotencyKey.key == key
+    ).update({IdempotencyKey.response: response}, synchronize_session=False)
+
+
+def purge_expired_keys(db: Session) -> int:
+    """Delete keys older than the TTL (not committed). Returns the row count."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+    return db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)).rowcount
@@ -0,0 +1,186 @@
+"""
+Onboarding funnel rollups.
+
+The onboarding_rollup job folds new onboarding_events into two small
+tables:
+  - onboarding_progress: one row per user (furthest slide, skip and
+    completion state)
+  - onboarding_slide_timings: a histogram, per slide, of seconds taken to
+    reach it from the previous slide
+
+The funnel API reads only those tables plus users, so its cost follows
+the number of users, not the number of events.
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db import dialect_insert
+from app.models.onboarding_progress import OnboardingProgress
+from app.models.onboarding_slide_timing import OnboardingSlideTiming
+from app.models.user import User
+
+
+# Lower bound (seconds) of each timing bucket; the last bucket is open-ended
+SLIDE_TIMING_BUCKETS = [0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987, 1800, 3600]
+
+
+def timing_bucket(seconds: float) -> int:
+    return max(bisect_right(SLIDE_TIMING_BUCKETS, seconds) - 1, 0)
+
+
+def histogram_median(counts: dict[int, int]) -> float | None:
+    """Median seconds from bucket counts, interpolated linearly within the median bucket."""
+    total = sum(counts.values())
+    if not total:
+        return None
+
+    half = total / 2
+    seen = 0
+    for bucket in sorted(counts):
+        count = counts[bucket]
+        if seen + count >= half:
+            lower = SLIDE_TIMING_BUCKETS[bucket]
+            if bucket + 1 >= len(SLIDE_TIMING_BUCKETS):
+                return float(lower)
+            upper = SLIDE_TIMING_BUCKETS[bucket + 1]
+            return lower + (upper - lower) * (half - seen) / count
+        seen += count
+    return None
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def apply_onboarding_events(db: Session, events: list) -> int:
+    """
+    Fold a chunk of events into the rollup tables (not committed).
+
+    events are rows with user_id, event, slide, total_slides, completed_at
+    and timestamp. Only consecutive slide transitions (N-1 -> N) are timed.
+    Events older than a user's furthest slide don't move them backwards.
+    """
+    if not events:
+        return 0
+
+    user_ids = {e.user_id for e in events}
+    progress = {
+        p.user_id: p
+        for p in db.query(OnboardingProgress).filter(OnboardingProgress.user_id.in_(user_ids)).all()
+    }
+    timings: Counter = Counter()
+
+    for e in sorted(events, key=lambda e: (e.user_id, _as_utc(e.timestamp))):
+        ts = _as_utc(e.timestamp)
+        p = progress.get(e.user_id)
+        if p is None:
+            p = OnboardingProgress(user_id=e.user_id, first_event_at=ts, max_slide=0, skipped=False)
+            db.add(p)
+            progress[e.user_id] = p
+        elif ts < _as_utc(p.first_event_at):
+            p.first_event_at = ts
+
+        if e.total_slides:
+            p.total_slides = e.total_slides
+        if e.event == "onboarding_skip":
+            p.skipped = True
+        if e.event == "onboarding_completed" and p.completed_at is None:
+            p.completed_at = e.completed_at or ts
+
+        slide = e.slide or 0
+        if slide > p.max_slide:
+            if p.last_slide_at is not None and slide == p.max_slide + 1:
+                seconds = (ts - _as_utc(p.last_slide_at)).total_seconds()
+                if seconds >= 0:
+                    timings[(slide, timing_bucket(seconds))] += 1
+            p.max_slide = slide
+            p.last_slide_at = ts
+        elif p.last_slide_at is None:
+            p.last_slide_at = ts
+
+    if timings:
+        insert = dialect_insert(db)
+        stmt = insert(OnboardingSlideTiming).values([
+            {"slide": slide, "bucket": bucket, "count": count}
+            for (slide, bucket), count in sorted(timings.items())
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OnboardingSlideTiming.slide, OnboardingSlideTiming.bucket],
+            set_={"count": OnboardingSlideTiming.count + stmt.excluded.count},
+        )
+        db.execute(stmt)
+
+    db.flush()
+    return len(events)
+
+
+def get_onboarding_funnel(db: Session, cohort_weeks: int = 12) -> dict:
+    """Per-slide reach/drop-off/median timing and weekly signup cohorts, from the rollups."""
+    by_max_slide = dict(
+        db.query(OnboardingProgress.max_slide, func.count())
+        .group_by(OnboardingProgress.max_slide).all()
+    )
+    completed_by_max_slide = dict(
+        db.query(OnboardingProgress.max_slide, func.count())
+        .filter(OnboardingProgress.completed_at.isnot(None))
+        .group_by(OnboardingProgress.max_slide).all()
+    )
+    total_slides = db.query(func.max(OnboardingProgress.total_slides)).scalar()
+
+    histograms: dict[int, dict[int, int]] = {}
+    for slide, bucket, count in db.query(
+        OnboardingSlideTiming.slide, OnboardingSlideTiming.bucket, OnboardingSlideTiming.count
+    ).all():
+        histograms.setdefault(slide, {})[bucket] = count
+
+    started = sum(by_max_slide.values())
+    last_slide = max([*by_max_slide.keys(), (total_slides or 1) - 1, 0])
+    slides = []
+    reach = started
+    for slide in range(0, last_slide + 1):
+        stopped_here = by_max_slide.get(slide, 0)
+        dropped = stopped_here - completed_by_max_slide.get(slide, 0)
+        median = histogram_median(histograms.get(slide, {}))
+        slides.append({
+            "slide": slide,
+            "reached": reach,
+            "dropped": dropped,
+            "drop_off_rate": round(dropped / reach, 4) if reach else 0.0,
+            "median_seconds_from_previous": round(median, 1) if median is not None else None,
+        })
+        reach -= stopped_here
+
+    since = datetime.now(timezone.utc) - timedelta(weeks=cohort_weeks)
+    week = func.date_trunc("week", User.created_at)
+    cohort_rows = db.query(
+        week.label("week"),
+        func.count(User.user_id),
+        func.count(OnboardingProgress.user_id),
+        func.count(func.coalesce(OnboardingProgress.completed_at, User.onboarding_completed_at)),
+    ).outerjoin(
+        OnboardingProgress, OnboardingProgress.user_id == User.user_id
+    ).filter(
+        User.created_at >= since
+    ).group_by(week).order_by(week.desc()).all()
+
+    return {
+        "started": started,
+        "completed": sum(completed_by_max_slide.values()),
+        "total_slides": total_slides,
+        "slides": slides,
+        "cohorts": [
+            {
+                "week": wk.date().isoformat(),
+                "signups": signups,
+                "started": started_count,
+                "completed": completed,
+                "conversion_rate": round(completed / signups, 4) if signups else 0.0,
+            }
+            for wk, signups, started_count, completed in cohort_rows
+        ],
+    }
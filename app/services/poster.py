@@ -1,6 +1,8 @@
 import io
 import os
+from functools import lru_cache
 from PIL import Image
+from app.core.utm import UTMCampaign
 from app.services.referral import generate_qr_code
 
 
@@ -11,13 +13,22 @@ QR_Y = 1643
 QR_SIZE = 220
 
 
+@lru_cache(maxsize=1)
+def load_poster_template() -> Image.Image:
+    """Decode the poster template once; callers must copy() before drawing on it."""
+    template = Image.open(TEMPLATE_PATH).convert("RGBA")
+    template.load()
+    return template
+
+
 def generate_referral_poster(
     referral_code: str,
     user_name: str | None = None,
+    campaign: UTMCampaign | None = UTMCampaign.POSTER,
 ) -> bytes:
-    template = Image.open(TEMPLATE_PATH).convert("RGBA")
+    template = load_poster_template().copy()
     
-    qr_bytes = generate_qr_code(referral_code, size=10, border=1)
+    qr_bytes = generate_qr_code(referral_code, size=10, border=1, campaign=campaign)
     qr_image = Image.open(io.BytesIO(qr_bytes)).convert("RGBA")
     qr_image = qr_image.resize((QR_SIZE, QR_SIZE), Image.Resampling.LANCZOS)
     
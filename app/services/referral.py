@@ -32,8 +32,9 @@ def generate_qr_code(
     size: int = 10,
     border: int = 2,
     as_base64: bool = False,
+    campaign: UTMCampaign | None = None,
 ) -> bytes | str:
-    url = generate_referral_link(referral_code)
+    url = generate_referral_link(referral_code, campaign)
     
     qr = qrcode.QRCode(
         version=1,
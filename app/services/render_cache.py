@@ -0,0 +1,170 @@
+"""
+Content-addressed cache for rendered referral images.
+
+Each render is keyed by a hash of everything that affects its bytes: the
+kind of image, referral code, campaign, size, the poster template and the
+frontend URL baked into the QR. The key doubles as the HTTP ETag, so a
+matching If-None-Match can be answered without touching the disk.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.utm import UTMCampaign
+from app.services.poster import TEMPLATE_PATH, generate_referral_poster
+from app.services.referral import generate_qr_code
+from app.services.render_pool import render_pool
+
+
+RENDER_CACHE_DIR = os.getenv(
+    "RENDER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "buildboard-render-cache")
+)
+# Bump to invalidate every cached render after changing how images are drawn
+RENDER_VERSION = "1"
+
+QR_DEFAULT_SIZE = 10
+QR_MIN_SIZE = 2
+QR_MAX_SIZE = 40
+
+
+@lru_cache(maxsize=1)
+def _template_digest() -> str:
+    with open(TEMPLATE_PATH, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def render_key(kind: str, referral_code: str, campaign: UTMCampaign | None, size: int | None = None) -> str:
+    settings = get_settings()
+    parts = [
+        RENDER_VERSION,
+        kind,
+        referral_code,
+        campaign.value if campaign else "",
+        str(size or ""),
+        settings.FRONTEND_URL,
+    ]
+    if kind == "poster":
+        parts.append(_template_digest())
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+class RenderCache:
+    """PNG bytes stored on disk under their content key, written atomically."""
+
+    def __init__(self, directory: str = RENDER_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.directory, key[:2], f"{key}.png")
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _put_quietly(self, key: str, data: bytes) -> None:
+        try:
+            self.put(key, data)
+        except OSError as e:
+            # A read-only or full disk shouldn't break serving the image
+            print(f"⚠️  Could not write render cache entry {key}: {e}")
+
+    def get_or_render(self, key: str, render: Callable[..., bytes], *args: Any) -> bytes:
+        """Return the cached bytes, rendering in the render pool on a miss."""
+        data = self.get(key)
+        if data is None:
+            data = render_pool.render(render, *args)
+            self._put_quietly(key, data)
+        return data
+
+    async def aget_or_render(self, key: str, render: Callable[..., bytes], *args: Any) -> bytes:
+        """Async get_or_render; raises RenderPoolSaturated if a miss can't be queued."""
+        data = await asyncio.to_thread(self.get, key)
+        if data is None:
+            data = await render_pool.arender(render, *args)
+            await asyncio.to_thread(self._put_quietly, key, data)
+        return data
+
+
+render_cache = RenderCache()
+
+
+def _qr_args(referral_code: str, campaign: UTMCampaign | None, size: int) -> tuple:
+    # generate_qr_code(referral_code, size, border, as_base64, campaign)
+    return (referral_code, size, 2, False, campaign)
+
+
+def _poster_args(referral_code: str, campaign: UTMCampaign | None) -> tuple:
+    # generate_referral_poster(referral_code, user_name, campaign)
+    return (referral_code, None, campaign)
+
+
+def get_referral_qr(
+    referral_code: str,
+    campaign: UTMCampaign | None = None,
+    size: int = QR_DEFAULT_SIZE,
+) -> tuple[bytes, str]:
+    """Return (png_bytes, etag) for a referral QR code."""
+    key = render_key("qr", referral_code, campaign, size)
+    data = render_cache.get_or_render(key, generate_qr_code, *_qr_args(referral_code, campaign, size))
+    return data, key
+
+
+def get_referral_poster(
+    referral_code: str,
+    campaign: UTMCampaign | None = UTMCampaign.POSTER,
+) -> tuple[bytes, str]:
+    """Return (png_bytes, etag) for a referral poster."""
+    key = render_key("poster", referral_code, campaign)
+    data = render_cache.get_or_render(key, generate_referral_poster, *_poster_args(referral_code, campaign))
+    return data, key
+
+
+async def aget_referral_qr(
+    referral_code: str,
+    campaign: UTMCampaign | None = None,
+    size: int = QR_DEFAULT_SIZE,
+) -> tuple[bytes, str]:
+    key = render_key("qr", referral_code, campaign, size)
+    data = await render_cache.aget_or_render(key, generate_qr_code, *_qr_args(referral_code, campaign, size))
+    return data, key
+
+
+async def aget_referral_poster(
+    referral_code: str,
+    campaign: UTMCampaign | None = UTMCampaign.POSTER,
+) -> tuple[bytes, str]:
+    key = render_key("poster", referral_code, campaign)
+    data = await render_cache.aget_or_render(key, generate_referral_poster, *_poster_args(referral_code, campaign))
+    return data, key
+
+
+def prerender_referral_assets(referral_code: str) -> None:
+    """Warm the cache for a new user's default QR and poster."""
+    try:
+        get_referral_qr(referral_code)
+        get_referral_poster(referral_code)
+    except Exception as e:
+        print(f"⚠️  Failed to pre-render referral assets for {referral_code}: {e}")
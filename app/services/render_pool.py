@@ -0,0 +1,190 @@
+"""
+Process pool for CPU-bound image rendering.
+
+QR and poster rendering is Pillow work that holds the GIL, so doing it in
+request threads stalls every other request on the worker. Renders are
+sent to a small ProcessPoolExecutor instead. The number of renders that
+are queued or running is capped. Past that cap, submit() raises
+RenderPoolSaturated and the API answers 503 with Retry-After, rather than
+letting the queue grow without bound.
+
+Workers are spawned (not forked) so they don't inherit the API's threads
+or database connections.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from app.core.utm import UTMCampaign
+
+
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", "2"))
+# Renders allowed to be queued or running at once before rejecting new ones
+RENDER_POOL_MAX_PENDING = int(os.getenv("RENDER_POOL_MAX_PENDING", str(RENDER_POOL_WORKERS * 4)))
+RENDER_POOL_RETRY_AFTER_SECONDS = int(os.getenv("RENDER_POOL_RETRY_AFTER_SECONDS", "2"))
+
+
+class RenderPoolSaturated(Exception):
+    """Raised when the render queue is full; callers should retry later."""
+
+    def __init__(self, retry_after: int = RENDER_POOL_RETRY_AFTER_SECONDS):
+        super().__init__("Render pool is saturated")
+        self.retry_after = retry_after
+
+
+def _init_worker() -> None:
+    # Each worker decodes the poster template once
+    from app.services.poster import load_poster_template
+    load_poster_template()
+
+
+class RenderPool:
+    def __init__(self, max_workers: int = RENDER_POOL_WORKERS, max_pending: int = RENDER_POOL_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        # Renders queued or running; guarded by _pending_lock
+        self._pending_lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _claim_slot(self) -> bool:
+        with self._pending_lock:
+            if self.in_flight >= self.max_pending:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def _release_slot(self, *_: Any) -> None:
+        with self._pending_lock:
+            self.in_flight -= 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a render. Raises RenderPoolSaturated if max_pending renders are in flight."""
+        executor = self._executor
+        if executor is None:
+            raise RuntimeError("Render pool is not started")
+        if not self._claim_slot():
+            raise RenderPoolSaturated()
+        try:
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace the pool and try once more.
+                # Only the first caller to see this executor fail replaces it.
+                with self._lock:
+                    broken = executor if self._executor is executor else None
+                    if broken is not None:
+                        print("⚠️  Render pool broken, restarting workers")
+                        self._executor = self._new_executor()
+                    executor = self._executor
+                if broken is not None:
+                    broken.shutdown(wait=False, cancel_futures=True)
+                if executor is None:
+                    raise RuntimeError("Render pool is not started")
+                future = executor.submit(fn, *args)
+        except BaseException:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def render(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Render in the pool and wait for the result, or inline if the pool isn't running."""
+        if self._executor is None:
+            return fn(*args)
+        return self.submit(fn, *args).result()
+
+    async def arender(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Async variant of render() for use from request handlers."""
+        if self._executor is None:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._pending_lock:
+            in_flight, rejected = self.in_flight, self.rejected
+        return {
+            "started": self.started,
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": in_flight,
+            "rejected": rejected,
+        }
+
+
+render_pool = RenderPool()
+
+
+def _render_poster_to_file(referral_code: str, campaign_value: str | None, output_dir: str) -> str:
+    # Runs in a worker: write the PNG there so megabytes don't cross the process boundary
+    from app.services.poster import generate_referral_poster
+
+    campaign = UTMCampaign(campaign_value) if campaign_value else None
+    data = generate_referral_poster(referral_code, campaign=campaign)
+    path = os.path.join(output_dir, f"{referral_code}.png")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def render_posters_batch(
+    referral_codes: Iterable[str],
+    output_dir: str,
+    campaign: UTMCampaign | None = UTMCampaign.POSTER,
+    max_workers: int | None = None,
+) -> list[str]:
+    """
+    Render posters for many referral codes using every core.
+
+    Uses its own pool, separate from the request-serving one. Returns the
+    paths written, in input order.
+    """
+    codes = list(referral_codes)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max_workers or os.cpu_count() or 1
+    campaign_value = campaign.value if campaign else None
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as executor:
+        chunksize = max(1, len(codes) // (workers * 4))
+        return list(executor.map(
+            _render_poster_to_file,
+            codes,
+            [campaign_value] * len(codes),
+            [output_dir] * len(codes),
+            chunksize=chunksize,
+        ))
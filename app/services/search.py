@@ -0,0 +1,86 @@
+"""
+Admin search over projects and users.
+
+On Postgres, search uses the add_search_indexes migration:
+  - projects.search_vector: a generated tsvector of project_name (weight A)
+    and project_description (weight B), with a GIN index
+  - pg_trgm GIN indexes on projects.project_name and on users.handle,
+    users.email and users.user_id, so substring (ILIKE '%q%') matches use
+    an index instead of a sequential scan
+
+Results are ordered by relevance: full-text rank plus trigram similarity.
+Other dialects (SQLite in tests) fall back to plain ILIKE, newest first.
+"""
+
+import re
+
+from sqlalchemy import func, or_, select, case
+from sqlalchemy.orm import Query
+
+from app.models.project import Project
+from app.models.user import User
+
+
+def _is_postgres(query: Query) -> bool:
+    return query.session.get_bind().dialect.name == "postgresql"
+
+
+# _like_pattern escapes with a backslash; SQLite has no default escape character
+LIKE_ESCAPE = "\\"
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def prefix_tsquery(q: str):
+    """'hello wor' -> to_tsquery('simple', 'hello:* & wor:*'), or None if q has no words."""
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return None
+    return func.to_tsquery("simple", " & ".join(f"{w}:*" for w in words))
+
+
+def search_projects(query: Query, q: str) -> Query:
+    """Filter a Project query (joined to User) by q and order it by relevance."""
+    pattern = _like_pattern(q)
+
+    if not _is_postgres(query):
+        return query.filter(
+            or_(Project.project_name.ilike(pattern, escape=LIKE_ESCAPE), User.handle.ilike(pattern, escape=LIKE_ESCAPE))
+        ).order_by(Project.created_at.desc())
+
+    tsquery = prefix_tsquery(q)
+
+    # Each branch is answered by its own index; Postgres combines them with a BitmapOr
+    conditions = [Project.project_name.ilike(pattern, escape=LIKE_ESCAPE)]
+    if tsquery is not None:
+        conditions.append(Project.search_vector.op("@@")(tsquery))
+    conditions.append(Project.user_id.in_(select(User.user_id).where(User.handle.ilike(pattern, escape=LIKE_ESCAPE))))
+
+    rank = func.similarity(Project.project_name, q) + func.coalesce(func.similarity(User.handle, q), 0)
+    if tsquery is not None:
+        rank = rank + func.ts_rank(Project.search_vector, tsquery)
+
+    return query.filter(or_(*conditions)).order_by(rank.desc(), Project.created_at.desc())
+
+
+def search_users(query: Query, q: str) -> Query:
+    """Filter a User query by q (handle, email or user_id) and order it by relevance."""
+    pattern = _like_pattern(q)
+    condition = or_(
+        User.handle.ilike(pattern, escape=LIKE_ESCAPE),
+        User.user_id.ilike(pattern, escape=LIKE_ESCAPE),
+        User.email.ilike(pattern, escape=LIKE_ESCAPE),
+    )
+
+    if not _is_postgres(query):
+        return query.filter(condition).order_by(User.created_at.desc())
+
+    rank = func.greatest(
+        func.coalesce(func.similarity(User.handle, q), 0),
+        func.similarity(User.email, q),
+        case((User.user_id == q, 1.0), else_=0.0),
+    )
+    return query.filter(condition).order_by(rank.desc(), User.created_at.desc())
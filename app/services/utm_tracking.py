@@ -0,0 +1,68 @@
+"""
+Buffered UTM hit counting.
+
+POST /utms and POST /utms/hits only bump in-memory counters; flusher
+threads write deltas to utms and the hourly utm_hits rollup every
+UTM_FLUSH_INTERVAL_MS. Started and stopped (with a final flush) by the
+app lifespan.
+"""
+
+import os
+from datetime import datetime, timezone
+from app.db import SessionLocal
+from app.crud.utms import UTMHitKey, add_utm_counts, add_utm_hit_counts, get_utm_count
+from app.services.counter_buffer import CounterBuffer
+
+
+UTM_FLUSH_INTERVAL_MS = int(os.getenv("UTM_FLUSH_INTERVAL_MS", "500"))
+
+
+def _flush_utm_counts(deltas: dict[str, int]) -> dict[str, int]:
+    db = SessionLocal()
+    try:
+        totals = add_utm_counts(db, deltas)
+        db.commit()
+        return totals
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _flush_utm_hit_counts(deltas: dict[UTMHitKey, int]) -> None:
+    db = SessionLocal()
+    try:
+        add_utm_hit_counts(db, deltas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+utm_counter = CounterBuffer("UTM Counter", _flush_utm_counts, interval_ms=UTM_FLUSH_INTERVAL_MS)
+utm_hit_counter = CounterBuffer("UTM Hits", _flush_utm_hit_counts, interval_ms=UTM_FLUSH_INTERVAL_MS)
+
+
+def record_utm_hit(db, utm_source: str) -> int:
+    """Buffer one hit and return the best-known running count (flushed total + pending)."""
+    utm_counter.add(utm_source)
+    count = utm_counter.running_total(utm_source)
+    if count is None:
+        # First hit for this source in this process: one PK read, then served from memory
+        utm_counter.seed_total(utm_source, get_utm_count(db, utm_source))
+        count = utm_counter.running_total(utm_source)
+    return count
+
+
+def record_utm_landing(
+    utm_source: str = "",
+    utm_medium: str = "",
+    utm_campaign: str = "",
+    referral_code: str = "",
+) -> None:
+    """Buffer one landing hit in the current hour's bucket."""
+    bucket_start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    utm_hit_counter.add((bucket_start, utm_campaign, utm_source, utm_medium, referral_code.upper()))
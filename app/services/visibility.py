@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 from app.models.project import Project
-from app.models.review import Review
 from app.schemas.visibility import VisibilityLevel, VisibilityMilestone, VisibilityStatus
 
 HOURS_THRESHOLD = 30.0
@@ -29,7 +28,7 @@ class VisibilityState:
         return self.has_github and self.has_hackatime
 
 
-def _get_visibility_state(db: Session, project: Project) -> VisibilityState:
+def _build_state(project: Project, is_approved: bool) -> VisibilityState:
     # GitHub is linked if they have a code_url OR the GitHub App integration
     has_github = bool(project.code_url) or bool(project.github_repo_path)
     has_hackatime = bool(project.hackatime_projects and len(project.hackatime_projects) > 0)
@@ -37,16 +36,6 @@ def _get_visibility_state(db: Session, project: Project) -> VisibilityState:
     hackatime_hours = project.hackatime_hours if project.hackatime_hours is not None else 0.0
     has_enough_hours = hackatime_hours >= HOURS_THRESHOLD
 
-    approved_review = (
-        db.query(Review)
-        .filter(
-            Review.project_id == project.project_id,
-            Review.review_decision == "approved",
-        )
-        .first()
-    )
-    is_approved = approved_review is not None
-
     return VisibilityState(
         has_github=has_github,
         has_hackatime=has_hackatime,
@@ -57,6 +46,11 @@ def _get_visibility_state(db: Session, project: Project) -> VisibilityState:
     )
 
 
+def _get_visibility_state(project: Project) -> VisibilityState:
+    # latest_decision mirrors the newest Review row, so no extra query
+    return _build_state(project, project.latest_decision == "approved")
+
+
 def _determine_level(state: VisibilityState) -> VisibilityLevel:
     connected = state.is_connected
 
@@ -137,7 +131,7 @@ def _calculate_progress(milestones: list[VisibilityMilestone], state: Visibility
 
 
 def calculate_visibility(db: Session, project: Project) -> VisibilityStatus:
-    state = _get_visibility_state(db, project)
+    state = _get_visibility_state(project)
     milestones = _get_milestones(state)
     current_level = _determine_level(state)
 
@@ -158,3 +152,8 @@ def calculate_visibility(db: Session, project: Project) -> VisibilityStatus:
         total_completed=completed_count,
         total_milestones=total_count,
     )
+
+
+def visibility_level(project: Project) -> VisibilityLevel:
+    """Level for a project, or any row with the same columns."""
+    return _determine_level(_get_visibility_state(project))
@@ -0,0 +1,226 @@
+"""
+Ranked-choice tallies for a submission week.
+
+Each voter's votes on a week's projects form one ballot. vote_ranking is
+the position on that ballot (1 = best), and equal rankings are ties.
+Projects a ballot doesn't mention rank below every project it does.
+
+  - Borda: a project gets one point for every project a ballot ranks it
+    above. This is the row sum of the pairwise preference matrix. It is
+    computed straight from the vote arrays, so it scales to any number of
+    projects.
+  - Schulze: strongest paths over the pairwise matrix, using a vectorized
+    Floyd-Warshall. That is O(k^3), so it only runs over the top
+    TALLY_SCHULZE_CANDIDATES projects by Borda score. The rest keep
+    schulze_rank None and follow in Borda order.
+
+The engine (tally) works on plain integer arrays. tally_week loads a week
+from the database, and snapshot_week stores the result in vote_tallies.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.vote import Vote
+from app.models.vote_tally import VoteTally
+
+
+TALLY_SCHULZE_CANDIDATES = int(os.getenv("TALLY_SCHULZE_CANDIDATES", "500"))
+
+
+@dataclass
+class TallyResult:
+    """Per-project arrays, indexed like the project_ids passed to tally."""
+    vote_count: np.ndarray
+    borda_score: np.ndarray
+    borda_rank: np.ndarray
+    # 0 where the project wasn't a Schulze finalist
+    schulze_rank: np.ndarray
+    rank: np.ndarray
+    ballots: int
+
+
+def _normalize(ballots: np.ndarray, projects: np.ndarray, ranks: np.ndarray):
+    """Sort votes by (ballot, rank) and keep each ballot's best ranking of a project."""
+    order = np.lexsort((ranks, projects, ballots))
+    ballots, projects, ranks = ballots[order], projects[order], ranks[order]
+    first = np.ones(len(ballots), dtype=bool)
+    first[1:] = (ballots[1:] != ballots[:-1]) | (projects[1:] != projects[:-1])
+    ballots, projects, ranks = ballots[first], projects[first], ranks[first]
+
+    order = np.lexsort((projects, ranks, ballots))
+    return ballots[order], projects[order], ranks[order]
+
+
+def _ballot_ends(ballots: np.ndarray) -> np.ndarray:
+    """For each vote (sorted by ballot), the index one past the end of its ballot."""
+    sizes = np.bincount(ballots)
+    return np.cumsum(sizes)[ballots]
+
+
+def borda_scores(ballots: np.ndarray, projects: np.ndarray, ranks: np.ndarray, n_projects: int) -> np.ndarray:
+    """Borda totals for votes already sorted by (ballot, rank)."""
+    if not len(ballots):
+        return np.zeros(n_projects, dtype=np.int64)
+    sizes = np.bincount(ballots)
+    # Projects ranked strictly below each vote on its ballot
+    key = ballots.astype(np.int64) * (int(ranks.max()) + 1) + ranks
+    below = _ballot_ends(ballots) - np.searchsorted(key, key, side="right")
+    points = (n_projects - sizes[ballots]) + below
+    return np.bincount(projects, weights=points, minlength=n_projects).astype(np.int64)
+
+
+def pairwise_matrix(ballots: np.ndarray, candidates: np.ndarray, ranks: np.ndarray, k: int) -> np.ndarray:
+    """d[i, j] = ballots ranking candidate i above candidate j.
+
+    Takes votes sorted by (ballot, rank) whose candidates are already
+    mapped to 0..k-1. If ballot b ranks i and not j, b prefers i. If b
+    ranks both, the lower rank wins. So d = ranked_i - both_ranked + ranked_above,
+    which only needs the candidate pairs that share a ballot.
+    """
+    ranked = np.bincount(candidates, minlength=k)
+    both = np.zeros(k * k, dtype=np.int64)
+    above = np.zeros(k * k, dtype=np.int64)
+
+    # Pair every vote with the one `offset` places later on the same ballot
+    offset = 1
+    while offset < len(ballots):
+        same = ballots[:-offset] == ballots[offset:]
+        if not same.any():
+            break
+        first, second = candidates[:-offset][same], candidates[offset:][same]
+        pair = first.astype(np.int64) * k + second
+        both += np.bincount(pair, minlength=k * k)
+        both += np.bincount(second.astype(np.int64) * k + first, minlength=k * k)
+        strictly = ranks[:-offset][same] < ranks[offset:][same]
+        above += np.bincount(pair[strictly], minlength=k * k)
+        offset += 1
+
+    d = ranked[:, None] - both.reshape(k, k) + above.reshape(k, k)
+    np.fill_diagonal(d, 0)
+    return d
+
+
+def schulze_order(d: np.ndarray) -> np.ndarray:
+    """Candidate indices in Schulze order. Ties keep their input order."""
+    k = len(d)
+    strength = np.where(d > d.T, d, 0)
+    for m in range(k):
+        np.maximum(strength, np.minimum.outer(strength[:, m], strength[m, :]), out=strength)
+    wins = (strength > strength.T).sum(axis=1)
+    return np.lexsort((np.arange(k), -wins))
+
+
+def tally(
+    ballots: np.ndarray,
+    projects: np.ndarray,
+    ranks: np.ndarray,
+    n_projects: int,
+    schulze_candidates: int = TALLY_SCHULZE_CANDIDATES,
+) -> TallyResult:
+    """Tally votes given as parallel arrays of ballot index, project index (0..n_projects-1) and rank."""
+    ballots, projects, ranks = _normalize(
+        np.asarray(ballots, dtype=np.int64), np.asarray(projects, dtype=np.int64), np.asarray(ranks, dtype=np.int64)
+    )
+    vote_count = np.bincount(projects, minlength=n_projects)
+    borda = borda_scores(ballots, projects, ranks, n_projects)
+
+    # Highest Borda first; ties go to more ballots, then to the lower project index
+    borda_order = np.lexsort((np.arange(n_projects), -vote_count, -borda))
+    borda_rank = np.empty(n_projects, dtype=np.int64)
+    borda_rank[borda_order] = np.arange(1, n_projects + 1)
+
+    finalists = borda_order[vote_count[borda_order] > 0][:schulze_candidates]
+    schulze_rank = np.zeros(n_projects, dtype=np.int64)
+    if len(finalists):
+        position = np.full(n_projects, -1, dtype=np.int64)
+        position[finalists] = np.arange(len(finalists))
+        keep = position[projects] >= 0
+        d = pairwise_matrix(ballots[keep], position[projects[keep]], ranks[keep], len(finalists))
+        schulze_rank[finalists[schulze_order(d)]] = np.arange(1, len(finalists) + 1)
+
+    rank = np.empty(n_projects, dtype=np.int64)
+    final_order = np.concatenate([
+        np.argsort(np.where(schulze_rank > 0, schulze_rank, n_projects + 1))[:len(finalists)],
+        borda_order[schulze_rank[borda_order] == 0],
+    ])
+    rank[final_order] = np.arange(1, n_projects + 1)
+
+    return TallyResult(
+        vote_count=vote_count,
+        borda_score=borda,
+        borda_rank=borda_rank,
+        schulze_rank=schulze_rank,
+        rank=rank,
+        ballots=len(np.unique(ballots)),
+    )
+
+
+def week_signature(db: Session, submission_week: str) -> str:
+    """Changes whenever a vote on the week's projects is added, re-ranked or removed."""
+    parts = db.query(
+        func.count(Vote.vote_id), func.sum(Vote.vote_ranking), func.max(Vote.timestamp)
+    ).join(Project, Vote.project_id == Project.project_id).filter(
+        Project.submission_week == submission_week
+    ).one()
+    return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+
+
+def tally_week(db: Session, submission_week: str, schulze_candidates: int = TALLY_SCHULZE_CANDIDATES) -> list[dict]:
+    """Tally a week's votes. Returns one row per project, in final rank order."""
+    project_ids = [
+        project_id for (project_id,) in db.query(Project.project_id).filter(
+            Project.submission_week == submission_week
+        ).order_by(Project.project_id)
+    ]
+    if not project_ids:
+        return []
+    index = {project_id: i for i, project_id in enumerate(project_ids)}
+
+    rows = db.query(Vote.user_id, Vote.project_id, Vote.vote_ranking).join(
+        Project, Vote.project_id == Project.project_id
+    ).filter(Project.submission_week == submission_week).all()
+    voters: dict[str, int] = {}
+    ballots = np.fromiter((voters.setdefault(r.user_id, len(voters)) for r in rows), dtype=np.int64, count=len(rows))
+    projects = np.fromiter((index[r.project_id] for r in rows), dtype=np.int64, count=len(rows))
+    ranks = np.fromiter((r.vote_ranking for r in rows), dtype=np.int64, count=len(rows))
+
+    result = tally(ballots, projects, ranks, len(project_ids), schulze_candidates)
+    return sorted(
+        (
+            {
+                "project_id": project_id,
+                "vote_count": int(result.vote_count[i]),
+                "borda_score": int(result.borda_score[i]),
+                "borda_rank": int(result.borda_rank[i]),
+                "schulze_rank": int(result.schulze_rank[i]) or None,
+                "rank": int(result.rank[i]),
+            }
+            for i, project_id in enumerate(project_ids)
+        ),
+        key=lambda row: row["rank"],
+    )
+
+
+def clear_week(db: Session, submission_week: str) -> None:
+    """Delete the week's vote_tallies rows (not committed)."""
+    db.execute(delete(VoteTally).where(VoteTally.submission_week == submission_week))
+
+
+def snapshot_week(db: Session, submission_week: str) -> int:
+    """Replace the week's vote_tallies rows with a fresh tally (not committed). Returns the row count."""
+    rows = tally_week(db, submission_week)
+    computed_at = datetime.now(timezone.utc)
+    clear_week(db, submission_week)
+    if rows:
+        db.execute(insert(VoteTally), [
+            {**row, "submission_week": submission_week, "computed_at": computed_at} for row in rows
+        ])
+    return len(rows)
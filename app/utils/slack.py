@@ -1,85 +1,241 @@
 """
 Slack utilities for looking up user information.
+
+Profiles are cached in the slack_profiles table. Single lookups use
+users.info; bulk lookups page through users.list (200 members per call)
+so resolving many users costs a handful of requests instead of one each.
+Both honour Slack's Retry-After header on 429 responses.
 """
 
 import os
 import httpx
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from app.models.slack_profile import SlackProfile
+from app.utils.rate_limit import TokenBucket
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+SLACK_API_URL = "https://slack.com/api"
+SLACK_PROFILE_TTL_SECONDS = int(os.getenv("SLACK_PROFILE_TTL_SECONDS", "86400"))  # Default 1 day
+SLACK_USERS_LIST_PAGE_SIZE = 200
+# Above this many uncached IDs, page through users.list instead of calling users.info per user
+SLACK_BULK_LOOKUP_THRESHOLD = int(os.getenv("SLACK_BULK_LOOKUP_THRESHOLD", "20"))
+SLACK_MAX_RETRIES = 3
+
+# Slack method tiers: users.info is Tier 4 (100+/min), users.list is Tier 2 (20+/min)
+_users_info_bucket = TokenBucket(rate=100 / 60, capacity=10)
+_users_list_bucket = TokenBucket(rate=20 / 60, capacity=3)
+
+
+def _preferred_name(member: dict) -> str | None:
+    profile = member.get("profile", {})
+    # Prefer display_name, fall back to real_name, then username
+    return profile.get("display_name") or member.get("real_name") or member.get("name")
+
+
+def _slack_get(method: str, params: dict, bucket: TokenBucket) -> dict | None:
+    """Call a Slack Web API method, waiting out 429s. Returns the response body or None."""
+    for attempt in range(SLACK_MAX_RETRIES + 1):
+        bucket.acquire()
+        response = httpx.get(
+            f"{SLACK_API_URL}/{method}",
+            params=params,
+            headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
+            timeout=10.0
+        )
+        if response.status_code == 429:
+            retry_after = float(response.headers.get("Retry-After", "30"))
+            print(f"⚠️  Slack rate limited on {method}, waiting {retry_after:.0f}s")
+            bucket.pause(retry_after)
+            continue
+        return response.json()
+
+    print(f"⚠️  Slack {method} still rate limited after {SLACK_MAX_RETRIES + 1} attempts")
+    return None
+
+
+def _is_fresh(profile: SlackProfile, max_age_seconds: int) -> bool:
+    fetched_at = profile.fetched_at
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    return fetched_at >= datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+
+
+def _store_profile(db: Session, member: dict, existing: SlackProfile | None = None) -> SlackProfile:
+    profile = member.get("profile", {})
+    row = existing or db.get(SlackProfile, member["id"])
+    if row is None:
+        row = SlackProfile(slack_id=member["id"])
+        db.add(row)
+    row.username = member.get("name")
+    row.display_name = profile.get("display_name") or None
+    row.real_name = member.get("real_name") or profile.get("real_name") or None
+    row.avatar_url = profile.get("image_192") or profile.get("image_72")
+    row.fetched_at = datetime.now(timezone.utc)
+    return row
+
+
+def fetch_slack_user(slack_id: str) -> dict | None:
+    """Fetch a single Slack member via users.info."""
+    if not SLACK_BOT_TOKEN:
+        print("⚠️  SLACK_BOT_TOKEN not set, cannot look up Slack username")
+        return None
 
+    if not slack_id:
+        return None
 
-def get_slack_username(slack_id: str) -> str | None:
+    try:
+        data = _slack_get("users.info", {"user": slack_id}, _users_info_bucket)
+        if data is None:
+            return None
+        if data.get("ok"):
+            return data.get("user", {})
+        error = data.get("error", "unknown error")
+        print(f"⚠️  Slack API error for user {slack_id}: {error}")
+        return None
+
+    except Exception as e:
+        print(f"⚠️  Error fetching Slack user {slack_id}: {e}")
+        return None
+
+
+def get_slack_username(
+    slack_id: str,
+    db: Session | None = None,
+    max_age_seconds: int = SLACK_PROFILE_TTL_SECONDS,
+) -> str | None:
     """
     Look up a Slack user's username (display name) by their Slack ID.
-    
+
     Args:
         slack_id: The Slack user ID (e.g., "U01234567")
-        
+        db: If given, the slack_profiles cache is read and updated (not committed)
+        max_age_seconds: Cached profiles older than this are refetched
+
     Returns:
         The user's Slack username (e.g., "johndoe") or None if lookup fails
     """
-    if not SLACK_BOT_TOKEN:
-        print("⚠️  SLACK_BOT_TOKEN not set, cannot look up Slack username")
-        return None
-    
     if not slack_id:
         return None
-    
+
+    cached = db.get(SlackProfile, slack_id) if db is not None else None
+    if cached and _is_fresh(cached, max_age_seconds):
+        return cached.preferred_name
+
+    member = fetch_slack_user(slack_id)
+    if member is None:
+        # Fall back to a stale cached name rather than nothing
+        return cached.preferred_name if cached else None
+
+    if db is not None:
+        _store_profile(db, member, cached)
+    return _preferred_name(member)
+
+
+def get_slack_profiles(
+    db: Session,
+    slack_ids: list[str],
+    max_age_seconds: int = SLACK_PROFILE_TTL_SECONDS,
+) -> dict[str, SlackProfile]:
+    """
+    Resolve many Slack IDs at once, filling the cache as needed (not committed).
+
+    Fresh cached profiles are returned as-is. If more than
+    SLACK_BULK_LOOKUP_THRESHOLD are missing or stale, users.list is paged
+    until all of them are found; otherwise users.info is called per ID.
+    """
+    wanted = {s for s in slack_ids if s}
+    if not wanted:
+        return {}
+
+    cached = {
+        p.slack_id: p
+        for p in db.query(SlackProfile).filter(SlackProfile.slack_id.in_(wanted)).all()
+    }
+    result = {sid: p for sid, p in cached.items() if _is_fresh(p, max_age_seconds)}
+    missing = wanted - result.keys()
+
+    if not missing or not SLACK_BOT_TOKEN:
+        if missing:
+            print("⚠️  SLACK_BOT_TOKEN not set, cannot look up Slack usernames")
+        # Stale entries are still better than nothing
+        return {**cached, **result}
+
+    if len(missing) <= SLACK_BULK_LOOKUP_THRESHOLD:
+        for slack_id in missing:
+            member = fetch_slack_user(slack_id)
+            if member:
+                result[slack_id] = _store_profile(db, member, cached.get(slack_id))
+        return {**cached, **result}
+
+    cursor = None
+    pages = 0
     try:
-        response = httpx.get(
-            "https://slack.com/api/users.info",
-            params={"user": slack_id},
-            headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
-            timeout=10.0
-        )
-        data = response.json()
-        
-        if data.get("ok"):
-            user = data.get("user", {})
-            profile = user.get("profile", {})
-            # Prefer display_name, fall back to real_name, then username
-            return profile.get("display_name") or user.get("real_name") or user.get("name")
-        else:
-            error = data.get("error", "unknown error")
-            print(f"⚠️  Slack API error for user {slack_id}: {error}")
-            return None
-            
+        while missing:
+            params = {"limit": SLACK_USERS_LIST_PAGE_SIZE}
+            if cursor:
+                params["cursor"] = cursor
+            data = _slack_get("users.list", params, _users_list_bucket)
+            pages += 1
+            if data is None or not data.get("ok"):
+                error = data.get("error", "unknown error") if data else "rate limited"
+                print(f"⚠️  Slack users.list error: {error}")
+                break
+
+            for member in data.get("members", []):
+                slack_id = member.get("id")
+                if slack_id in missing:
+                    result[slack_id] = _store_profile(db, member, cached.get(slack_id))
+                    missing.discard(slack_id)
+
+            cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
     except Exception as e:
-        print(f"⚠️  Error fetching Slack user {slack_id}: {e}")
-        return None
+        print(f"⚠️  Error listing Slack users: {e}")
+
+    print(f"🔎 Resolved {len(wanted) - len(missing)}/{len(wanted)} Slack profiles with {pages} users.list call(s)")
+    return {**cached, **result}
+
+
+def get_slack_usernames(db: Session, slack_ids: list[str]) -> dict[str, str]:
+    """Map Slack IDs to preferred names, skipping any that couldn't be resolved."""
+    profiles = get_slack_profiles(db, slack_ids)
+    return {sid: p.preferred_name for sid, p in profiles.items() if p.preferred_name}
 
 
 async def get_slack_username_async(slack_id: str) -> str | None:
     """
-    Async version of get_slack_username.
+    Async version of get_slack_username (uncached).
     """
     if not SLACK_BOT_TOKEN:
         print("⚠️  SLACK_BOT_TOKEN not set, cannot look up Slack username")
         return None
-    
+
     if not slack_id:
         return None
-    
+
     try:
         async with httpx.AsyncClient() as client:
             response = await client.get(
-                "https://slack.com/api/users.info",
+                f"{SLACK_API_URL}/users.info",
                 params={"user": slack_id},
                 headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
                 timeout=10.0
             )
+            if response.status_code == 429:
+                print(f"⚠️  Slack rate limited looking up {slack_id}, retry after {response.headers.get('Retry-After')}s")
+                return None
+
             data = response.json()
-            
+
             if data.get("ok"):
-                user = data.get("user", {})
-                profile = user.get("profile", {})
-                # Prefer display_name, fall back to real_name, then username
-                return profile.get("display_name") or user.get("real_name") or user.get("name")
+                return _preferred_name(data.get("user", {}))
             else:
                 error = data.get("error", "unknown error")
                 print(f"⚠️  Slack API error for user {slack_id}: {error}")
                 return None
-                
+
     except Exception as e:
         print(f"⚠️  Error fetching Slack user {slack_id}: {e}")
         return None
@@ -1,53 +1,115 @@
 """
 Airtable Sync Job
 
-Periodically checks for shipped projects with reviews that haven't been synced to Airtable.
+Periodically sends shipped projects with reviews that haven't been synced to Airtable.
+Records are written in batches of 10 and a batch is only marked as sent once
+Airtable has confirmed the write.
 """
 
 import os
-import asyncio
-from sqlalchemy import and_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import and_, update
+from sqlalchemy.orm import selectinload
 from app.db import SessionLocal
 from app.models.project import Project
+from app.models.user import User
+from app.services.airtable import AirtableWriter, AirtableError, AIRTABLE_API_URL, AIRTABLE_BATCH_SIZE
 
 
 AIRTABLE_SYNC_INTERVAL_SECONDS = int(os.getenv("AIRTABLE_SYNC_INTERVAL_SECONDS", "10"))
+AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
+AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
+AIRTABLE_TABLE_NAME = os.getenv("AIRTABLE_TABLE_NAME", "YSWS Project Submission")
+AIRTABLE_API_URL = os.getenv("AIRTABLE_API_URL", AIRTABLE_API_URL)
 
 
-def run_airtable_sync():
-    """Main sync function."""
-    db = SessionLocal()
-    
+def find_projects_to_sync(db) -> list[Project]:
+    """Shipped projects with at least one review that haven't been sent yet."""
+    return db.query(Project).options(
+        selectinload(Project.user).selectinload(User.profile),
+        selectinload(Project.user).selectinload(User.addresses),
+    ).filter(
+        and_(
+            Project.sent_to_airtable == False,
+            Project.shipped == True,
+            Project.reviews.any()
+        )
+    ).order_by(Project.created_at).all()
+
+
+def build_airtable_fields(project: Project) -> dict:
+    """Map a project (and its owner) to Airtable record fields."""
+    user = project.user
+    profile = user.profile if user else None
+    address = next((a for a in user.addresses if a.is_primary), None) if user else None
+
+    fields = {
+        "BuildBoard Project ID": project.project_id,
+        "Project Name": project.project_name,
+        "Description": project.project_description,
+        "Code URL": project.code_url or (f"https://github.com/{project.github_repo_path}" if project.github_repo_path else None),
+        "Playable URL": project.live_url,
+        "Screenshot": [{"url": url} for url in (project.attachment_urls or [])],
+        "Submission Week": project.submission_week,
+        "Hackatime Hours": project.hackatime_hours,
+        "Review Status": project.review_status,
+        "Email": user.email if user else None,
+        "Slack ID": user.slack_id if user else None,
+        "First Name": profile.first_name if profile else None,
+        "Last Name": profile.last_name if profile else None,
+        "Birthday": profile.birthday.date().isoformat() if profile and profile.birthday else None,
+        "Address (Line 1)": address.address_line_1 if address else None,
+        "Address (Line 2)": address.address_line_2 if address else None,
+        "City": address.city if address else None,
+        "State / Province": address.state if address else None,
+        "Country": address.country if address else None,
+        "ZIP / Postal Code": address.post_code if address else None,
+    }
+    return {k: v for k, v in fields.items() if v is not None}
+
+
+def run_airtable_sync() -> int:
+    """Main sync function. Returns the number of projects sent to Airtable."""
+    if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
+        print("⚠️  [Airtable Sync] AIRTABLE_API_KEY or AIRTABLE_BASE_ID not set, skipping")
+        return 0
+
+    # Keep loaded projects usable across the per-batch commits
+    db = SessionLocal(expire_on_commit=False)
+    sent_count = 0
+
     try:
-        projects = db.query(Project).options(
-            joinedload(Project.reviews)
-        ).filter(
-            and_(
-                Project.sent_to_airtable == False,
-                Project.shipped == True
-            )
-        ).all()
-
-        filtered_projects = [p for p in projects if p.reviews and len(p.reviews) > 0]
-
-        if filtered_projects:
-            print(f"\n📦 [Airtable Sync] Found {len(filtered_projects)} project(s) to sync:")
-            for project in filtered_projects:
-                print(f"  - {project.project_name} (ID: {project.project_id})")
-        
+        projects = find_projects_to_sync(db)
+        if not projects:
+            return 0
+
+        print(f"\n📦 [Airtable Sync] Found {len(projects)} project(s) to sync")
+
+        with AirtableWriter(AIRTABLE_API_KEY, AIRTABLE_BASE_ID, AIRTABLE_TABLE_NAME, api_url=AIRTABLE_API_URL) as writer:
+            for start in range(0, len(projects), AIRTABLE_BATCH_SIZE):
+                batch = projects[start:start + AIRTABLE_BATCH_SIZE]
+                writer.create_batch([build_airtable_fields(p) for p in batch])
+
+                # Only mark the batch as sent once Airtable has confirmed every record
+                db.execute(
+                    update(Project)
+                    .where(Project.project_id.in_([p.project_id for p in batch]))
+                    .values(sent_to_airtable=True)
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                sent_count += len(batch)
+
+        print(f"✅ [Airtable Sync] Sent {sent_count}/{len(projects)} project(s)")
+        return sent_count
+
+    except AirtableError as e:
+        db.rollback()
+        print(f"❌ [Airtable Sync] Airtable error after {sent_count} project(s): {e}")
+        raise
     except Exception as e:
+        db.rollback()
         print(f"❌ [Airtable Sync] Error: {e}")
+        raise
     finally:
         db.close()
 
-
-async def airtable_sync_task():
-    """Background task that runs Airtable sync periodically."""
-    while True:
-        try:
-            run_airtable_sync()
-        except Exception as e:
-            print(f"❌ [Airtable Sync] Task error: {e}")
-        
-        await asyncio.sleep(AIRTABLE_SYNC_INTERVAL_SECONDS)
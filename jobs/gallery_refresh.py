@@ -0,0 +1,48 @@
+"""
+Gallery Refresh Job
+
+Rebuilds gallery_entries when projects, votes, reviews or users have changed
+since the last build (see app/services/gallery.py). Most runs only do the
+signature check.
+"""
+
+import os
+from datetime import datetime, timezone
+from app.db import SessionLocal
+from app.models.job_watermark import JobWatermark
+from app.services.gallery import WATERMARK_NAME, gallery_signature, rebuild_gallery
+from jobs.runner import JobResult
+
+
+GALLERY_REFRESH_INTERVAL_SECONDS = int(os.getenv("GALLERY_REFRESH_INTERVAL_SECONDS", "60"))
+
+
+def run_gallery_refresh() -> JobResult:
+    """Main refresh function."""
+    db = SessionLocal()
+    result = JobResult()
+
+    try:
+        signature = gallery_signature(db)
+        watermark = db.get(JobWatermark, WATERMARK_NAME)
+        if watermark is not None and watermark.last_id == signature:
+            return result
+
+        if watermark is None:
+            watermark = JobWatermark(job_name=WATERMARK_NAME)
+            db.add(watermark)
+
+        result.processed = rebuild_gallery(db)
+        watermark.last_id = signature
+        watermark.last_created_at = datetime.now(timezone.utc)
+        db.commit()
+
+        print(f"✅ [Gallery] Rebuilt with {result.processed} project(s)")
+        return result
+
+    except Exception as e:
+        print(f"❌ [Gallery] Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,58 @@
+"""
+Hackatime Sync Job
+
+Periodically refreshes Hackatime project totals for users who have finished
+Hackatime setup, then recalculates hours on the projects they've linked.
+"""
+
+import os
+import asyncio
+from app.db import SessionLocal
+from app.models.user import User
+from app.services.hackatime import fetch_hackatime_stats
+from app.crud.projects import recalculate_hackatime_hours
+from jobs.runner import JobResult
+
+
+HACKATIME_SYNC_INTERVAL_SECONDS = int(os.getenv("HACKATIME_SYNC_INTERVAL_SECONDS", "21600"))  # Default 6 hours
+
+
+def find_users_to_refresh(db) -> list[tuple[str, str]]:
+    """(user_id, slack_id) for users who have linked Hackatime."""
+    return db.query(User.user_id, User.slack_id).filter(
+        User.slack_id.isnot(None),
+        User.hackatime_completed_at.isnot(None)
+    ).order_by(User.created_at).all()
+
+
+async def _refresh_users(db, users: list[tuple[str, str]]) -> JobResult:
+    result = JobResult()
+    for user_id, slack_id in users:
+        try:
+            projects = await fetch_hackatime_stats(user_id, slack_id, db)
+            if projects:
+                recalculate_hackatime_hours(db, user_id)
+                db.commit()
+            result.processed += 1
+        except Exception as e:
+            db.rollback()
+            result.failed += 1
+            print(f"⚠️  [Hackatime Sync] Failed to refresh user {user_id}: {e}")
+    return result
+
+
+def run_hackatime_sync() -> JobResult:
+    """Main sync function."""
+    db = SessionLocal()
+
+    try:
+        users = find_users_to_refresh(db)
+        if not users:
+            return JobResult()
+
+        print(f"📦 [Hackatime Sync] Refreshing {len(users)} user(s)")
+        result = asyncio.run(_refresh_users(db, users))
+        print(f"✅ [Hackatime Sync] Complete. Refreshed {result.processed}/{len(users)} users.")
+        return result
+    finally:
+        db.close()
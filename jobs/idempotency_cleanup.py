@@ -0,0 +1,34 @@
+"""
+Idempotency Key Cleanup Job
+
+Deletes stored Idempotency-Key responses older than
+IDEMPOTENCY_KEY_TTL_HOURS (see app/services/idempotency.py).
+"""
+
+import os
+from app.db import SessionLocal
+from app.services.idempotency import purge_expired_keys
+from jobs.runner import JobResult
+
+
+IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS = int(os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS", "3600"))  # Default hourly
+
+
+def run_idempotency_cleanup() -> JobResult:
+    """Main cleanup function."""
+    db = SessionLocal()
+    result = JobResult()
+
+    try:
+        result.processed = purge_expired_keys(db)
+        db.commit()
+        if result.processed:
+            print(f"✅ [Idempotency] Purged {result.processed} expired key(s)")
+        return result
+
+    except Exception as e:
+        print(f"❌ [Idempotency] Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
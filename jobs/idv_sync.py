@@ -6,14 +6,14 @@ their information in IDV, and syncs any changes to the local database.
 """
 
 import os
-import asyncio
 import httpx
 from datetime import datetime
 from app.db import SessionLocal
 from app.models.user import User
 from app.models.user_address import UserAddress
-from app.utils.slack import get_slack_username
+from app.utils.slack import get_slack_username, get_slack_usernames
 from sqlalchemy import or_
+from jobs.runner import JobResult
 
 
 IDV_HOST = os.getenv("IDV_HOST", "https://hca.dinosaurbbq.org")
@@ -44,8 +44,11 @@ def get_idv_identity(identity_id: str) -> dict | None:
         return None
 
 
-def sync_user_from_idv(db, user: User, idv_data: dict) -> bool:
-    """Sync user data from IDV response. Returns True if any changes were made."""
+def sync_user_from_idv(db, user: User, idv_data: dict, slack_names: dict[str, str] | None = None) -> bool:
+    """Sync user data from IDV response. Returns True if any changes were made.
+
+    slack_names is an optional prefetched slack_id -> name map (see run_idv_sync).
+    """
     changed = False
     identity = idv_data.get("identity", idv_data)
     
@@ -72,7 +75,7 @@ def sync_user_from_idv(db, user: User, idv_data: dict) -> bool:
     
     # Sync handle from Slack username if user has slack_id but no handle
     if user.slack_id and not user.handle:
-        slack_username = get_slack_username(user.slack_id)
+        slack_username = (slack_names or {}).get(user.slack_id) or get_slack_username(user.slack_id, db=db)
         if slack_username:
             print(f"  📝 Setting handle from Slack username: {slack_username}")
             user.handle = slack_username
@@ -158,9 +161,10 @@ def find_users_needing_sync(db) -> list[User]:
     ).all()
 
 
-def run_idv_sync():
+def run_idv_sync() -> JobResult:
     """Main sync function."""
     db = SessionLocal()
+    result = JobResult()
     
     try:
         print("🔍 [IDV Sync] Finding users needing sync...")
@@ -169,36 +173,30 @@ def run_idv_sync():
         
         if not users:
             print("✅ [IDV Sync] No users need syncing")
-            return
+            return result
         
         print(f"📦 [IDV Sync] Found {len(users)} user(s) to check")
         
-        synced_count = 0
+        # Resolve Slack names up front in one bulk pass instead of one users.info call per user
+        slack_names = get_slack_usernames(db, [u.slack_id for u in users if u.slack_id and not u.handle])
         
         for user in users:
             idv_data = get_idv_identity(user.identity_vault_id)
             
             if idv_data:
-                if sync_user_from_idv(db, user, idv_data):
-                    synced_count += 1
+                if sync_user_from_idv(db, user, idv_data, slack_names):
+                    result.processed += 1
                     print(f"   ✅ Synced user {user.user_id}")
+            else:
+                result.failed += 1
         
         db.commit()
-        print(f"✅ [IDV Sync] Complete. Updated {synced_count}/{len(users)} users.")
+        print(f"✅ [IDV Sync] Complete. Updated {result.processed}/{len(users)} users.")
+        return result
         
     except Exception as e:
         print(f"❌ [IDV Sync] Error: {e}")
         db.rollback()
+        raise
     finally:
         db.close()
-
-
-async def idv_sync_task():
-    """Background task that runs IDV sync periodically."""
-    while True:
-        try:
-            run_idv_sync()
-        except Exception as e:
-            print(f"❌ [IDV Sync] Task error: {e}")
-        
-        await asyncio.sleep(IDV_SYNC_INTERVAL_SECONDS)
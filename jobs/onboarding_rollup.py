@@ -0,0 +1,90 @@
+"""
+Onboarding Rollup Job
+
+Incrementally folds new onboarding_events into onboarding_progress and
+onboarding_slide_timings. The job reads in (created_at, id) order from a
+watermark in job_watermarks. Each chunk and its watermark commit
+together, so a crash never double-counts.
+
+Events are only read once they are ONBOARDING_ROLLUP_LAG_SECONDS old.
+Queued writes stamp created_at before they're flushed, so a row can
+commit slightly after newer-looking rows; the lag keeps the watermark
+from skipping past it.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import tuple_
+from app.db import SessionLocal
+from app.models.job_watermark import JobWatermark
+from app.models.onboarding_event import OnboardingEvent
+from app.services.onboarding_funnel import apply_onboarding_events
+from jobs.runner import JobResult
+
+
+ONBOARDING_ROLLUP_INTERVAL_SECONDS = int(os.getenv("ONBOARDING_ROLLUP_INTERVAL_SECONDS", "300"))  # Default 5 minutes
+ONBOARDING_ROLLUP_CHUNK_SIZE = int(os.getenv("ONBOARDING_ROLLUP_CHUNK_SIZE", "5000"))
+ONBOARDING_ROLLUP_LAG_SECONDS = int(os.getenv("ONBOARDING_ROLLUP_LAG_SECONDS", "60"))
+
+WATERMARK_NAME = "onboarding_rollup"
+
+
+def run_onboarding_rollup() -> JobResult:
+    """Main rollup function."""
+    db = SessionLocal()
+    result = JobResult()
+
+    try:
+        watermark = db.get(JobWatermark, WATERMARK_NAME)
+        if watermark is None:
+            watermark = JobWatermark(job_name=WATERMARK_NAME)
+            db.add(watermark)
+            db.flush()
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=ONBOARDING_ROLLUP_LAG_SECONDS)
+
+        while True:
+            query = db.query(
+                OnboardingEvent.id,
+                OnboardingEvent.user_id,
+                OnboardingEvent.event,
+                OnboardingEvent.slide,
+                OnboardingEvent.total_slides,
+                OnboardingEvent.completed_at,
+                OnboardingEvent.timestamp,
+                OnboardingEvent.created_at,
+            ).filter(OnboardingEvent.created_at < cutoff)
+
+            if watermark.last_created_at is not None:
+                query = query.filter(
+                    tuple_(OnboardingEvent.created_at, OnboardingEvent.id)
+                    > tuple_(watermark.last_created_at, watermark.last_id or "")
+                )
+
+            events = query.order_by(
+                OnboardingEvent.created_at, OnboardingEvent.id
+            ).limit(ONBOARDING_ROLLUP_CHUNK_SIZE).all()
+
+            if not events:
+                break
+
+            apply_onboarding_events(db, events)
+            watermark.last_created_at = events[-1].created_at
+            watermark.last_id = events[-1].id
+            db.commit()
+            result.processed += len(events)
+
+            if len(events) < ONBOARDING_ROLLUP_CHUNK_SIZE:
+                break
+
+        if result.processed:
+            print(f"✅ [Onboarding Rollup] Folded {result.processed} event(s)")
+        db.commit()
+        return result
+
+    except Exception as e:
+        print(f"❌ [Onboarding Rollup] Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
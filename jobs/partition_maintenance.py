@@ -0,0 +1,166 @@
+"""
+Partition Maintenance Job
+
+user_login_events, onboarding_events and audit_logs are partitioned by
+month (see the partition_event_tables migration). This job:
+  - creates partitions PARTITION_MONTHS_AHEAD months ahead, so inserts
+    never hit a missing range
+  - detaches partitions older than each table's retention and moves them
+    into the archive schema, where they can be dumped or dropped by hand
+
+Each table also has a DEFAULT partition, so inserts still succeed if this
+job stops running for longer than the lead. Rows that land there are
+moved into their month's partition when it is created, with a warning.
+
+A retention of 0 months keeps every partition attached. Postgres only.
+"""
+
+import os
+import re
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+from app.db import SessionLocal
+from jobs.runner import JobResult
+
+
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = int(os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "86400"))  # Default daily
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+LOGIN_EVENT_RETENTION_MONTHS = int(os.getenv("LOGIN_EVENT_RETENTION_MONTHS", "13"))
+ONBOARDING_EVENT_RETENTION_MONTHS = int(os.getenv("ONBOARDING_EVENT_RETENTION_MONTHS", "13"))
+AUDIT_LOG_RETENTION_MONTHS = int(os.getenv("AUDIT_LOG_RETENTION_MONTHS", "0"))  # Keep forever
+
+ARCHIVE_SCHEMA = "archive"
+
+# table -> retention in months
+PARTITIONED_TABLES = {
+    "user_login_events": LOGIN_EVENT_RETENTION_MONTHS,
+    "onboarding_events": ONBOARDING_EVENT_RETENTION_MONTHS,
+    "audit_logs": AUDIT_LOG_RETENTION_MONTHS,
+}
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def is_partitioned(db, table: str) -> bool:
+    return db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table AND c.relnamespace = 'public'::regnamespace"
+    ), {"table": table}).scalar() is not None
+
+
+def list_partitions(db, table: str) -> dict[date, str]:
+    """Attached monthly partitions of table, keyed by the month they start."""
+    rows = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table AND p.relnamespace = 'public'::regnamespace"
+    ), {"table": table}).scalars().all()
+
+    partitions = {}
+    for name in rows:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def partition_column(db, table: str) -> str:
+    return db.execute(text(
+        "SELECT a.attname FROM pg_partitioned_table pt "
+        "JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0] "
+        "WHERE pt.partrelid = CAST(:table AS regclass)"
+    ), {"table": table}).scalar_one()
+
+
+def create_default_partition(db, table: str) -> None:
+    db.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+
+
+def create_partition(db, table: str, month: date) -> None:
+    upper = add_months(month, 1)
+    bounds = f"FROM ('{month.isoformat()} 00:00+00') TO ('{upper.isoformat()} 00:00+00')"
+    partition = f"{table}_p{month:%Y%m}"
+    default = f"{table}_default"
+    if db.execute(text("SELECT to_regclass(:name)"), {"name": partition}).scalar() is not None:
+        return
+
+    column = partition_column(db, table)
+    in_range = f"{column} >= '{month.isoformat()} 00:00+00' AND {column} < '{upper.isoformat()} 00:00+00'"
+    stray = False
+    if db.execute(text("SELECT to_regclass(:name)"), {"name": default}).scalar() is not None:
+        stray = db.execute(text(f"SELECT 1 FROM {default} WHERE {in_range} LIMIT 1")).scalar() is not None
+    if not stray:
+        db.execute(text(f"CREATE TABLE {partition} PARTITION OF {table} FOR VALUES {bounds}"))
+        return
+
+    # Postgres won't add a range the default partition holds rows for, so move them out first
+    print(f"⚠️  [Partitions] {table}: rows for {month:%Y-%m} landed in {default}; moving them to {partition}")
+    db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    db.execute(text(f"CREATE TABLE {partition} PARTITION OF {table} FOR VALUES {bounds}"))
+    db.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) INSERT INTO {table} SELECT * FROM moved"
+    ))
+    db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+
+def archive_partition(db, table: str, partition: str) -> None:
+    db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+    db.execute(text(f"ALTER TABLE {partition} SET SCHEMA {ARCHIVE_SCHEMA}"))
+
+
+def run_partition_maintenance() -> JobResult:
+    """Main maintenance function."""
+    db = SessionLocal()
+    result = JobResult()
+
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            return result
+
+        now = datetime.now(timezone.utc)
+        this_month = date(now.year, now.month, 1)
+        db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+        for table, retention_months in PARTITIONED_TABLES.items():
+            try:
+                if not is_partitioned(db, table):
+                    # Migration not applied yet
+                    continue
+                create_default_partition(db, table)
+                partitions = list_partitions(db, table)
+
+                created = 0
+                for ahead in range(PARTITION_MONTHS_AHEAD + 1):
+                    month = add_months(this_month, ahead)
+                    if month not in partitions:
+                        create_partition(db, table, month)
+                        created += 1
+
+                archived = 0
+                if retention_months > 0:
+                    cutoff = add_months(this_month, -retention_months)
+                    for month, partition in sorted(partitions.items()):
+                        if month < cutoff:
+                            archive_partition(db, table, partition)
+                            archived += 1
+
+                db.commit()
+                result.processed += created + archived
+                if created or archived:
+                    print(f"✅ [Partitions] {table}: created {created}, archived {archived}")
+
+            except Exception as e:
+                print(f"❌ [Partitions] Error maintaining {table}: {e}")
+                db.rollback()
+                result.failed += 1
+
+        return result
+
+    finally:
+        db.close()
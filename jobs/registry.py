@@ -0,0 +1,73 @@
+"""
+Job Registry
+
+Every background job is declared here once. The API process runs them via
+jobs.runner.start_jobs, and the standalone scheduler (jobs/scheduler.py)
+registers the same list with APScheduler.
+"""
+
+from jobs.runner import Job
+from jobs.idv_sync import run_idv_sync, IDV_SYNC_INTERVAL_SECONDS
+from jobs.airtable_sync import run_airtable_sync, AIRTABLE_SYNC_INTERVAL_SECONDS
+from jobs.hackatime_sync import run_hackatime_sync, HACKATIME_SYNC_INTERVAL_SECONDS
+from jobs.onboarding_rollup import run_onboarding_rollup, ONBOARDING_ROLLUP_INTERVAL_SECONDS
+from jobs.partition_maintenance import run_partition_maintenance, PARTITION_MAINTENANCE_INTERVAL_SECONDS
+from jobs.gallery_refresh import run_gallery_refresh, GALLERY_REFRESH_INTERVAL_SECONDS
+from jobs.vote_tally import run_vote_tally, VOTE_TALLY_INTERVAL_SECONDS
+from jobs.idempotency_cleanup import run_idempotency_cleanup, IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS
+
+
+JOBS: list[Job] = [
+    Job(
+        name="idv_sync",
+        func=run_idv_sync,
+        interval_seconds=IDV_SYNC_INTERVAL_SECONDS,
+        jitter_seconds=60,
+    ),
+    Job(
+        name="airtable_sync",
+        func=run_airtable_sync,
+        interval_seconds=AIRTABLE_SYNC_INTERVAL_SECONDS,
+        jitter_seconds=10,
+    ),
+    Job(
+        name="hackatime_sync",
+        func=run_hackatime_sync,
+        interval_seconds=HACKATIME_SYNC_INTERVAL_SECONDS,
+        jitter_seconds=300,
+    ),
+    Job(
+        name="onboarding_rollup",
+        func=run_onboarding_rollup,
+        interval_seconds=ONBOARDING_ROLLUP_INTERVAL_SECONDS,
+        jitter_seconds=30,
+    ),
+    Job(
+        name="partition_maintenance",
+        func=run_partition_maintenance,
+        interval_seconds=PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+        jitter_seconds=600,
+    ),
+    Job(
+        name="gallery_refresh",
+        func=run_gallery_refresh,
+        interval_seconds=GALLERY_REFRESH_INTERVAL_SECONDS,
+        jitter_seconds=5,
+    ),
+    Job(
+        name="vote_tally",
+        func=run_vote_tally,
+        interval_seconds=VOTE_TALLY_INTERVAL_SECONDS,
+        jitter_seconds=60,
+    ),
+    Job(
+        name="idempotency_cleanup",
+        func=run_idempotency_cleanup,
+        interval_seconds=IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS,
+        jitter_seconds=300,
+    ),
+]
+
+
+def get_job(name: str) -> Job | None:
+    return next((job for job in JOBS if job.name == name), None)
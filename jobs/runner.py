@@ -0,0 +1,164 @@
+"""
+Job Runner
+
+Runs registered background jobs on an interval. Each run:
+  - is skipped if the same job is still running (in this process, or in another
+    worker via a Postgres advisory lock),
+  - is recorded in the job_runs table with its duration, items processed and failures.
+
+Jobs are plain synchronous functions that return an item count, a JobResult,
+or None. They run in a worker thread so they never block the event loop.
+"""
+
+import time
+import random
+import asyncio
+import threading
+import traceback
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+from sqlalchemy import text
+from app.db import SessionLocal, engine
+from app.models.job_run import JobRun
+
+
+@dataclass
+class JobResult:
+    processed: int = 0
+    failed: int = 0
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], "JobResult | int | None"]
+    interval_seconds: float
+    # Random delay before the first run so workers/jobs don't all fire at startup
+    jitter_seconds: float = 30.0
+    enabled: bool = True
+
+
+_local_locks: dict[str, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+def _local_lock(name: str) -> threading.Lock:
+    with _local_locks_guard:
+        return _local_locks.setdefault(name, threading.Lock())
+
+
+def _advisory_key(name: str) -> int:
+    # Stable signed 32-bit key per job name
+    return zlib.crc32(f"job:{name}".encode()) - 2**31
+
+
+def _normalize_result(result) -> JobResult:
+    if isinstance(result, JobResult):
+        return result
+    if isinstance(result, int):
+        return JobResult(processed=result)
+    return JobResult()
+
+
+def _record_start(job: Job) -> str:
+    db = SessionLocal()
+    try:
+        run = JobRun(job_name=job.name, status="running", started_at=datetime.now(timezone.utc))
+        db.add(run)
+        db.flush()
+        run_id = run.id
+        db.commit()
+        return run_id
+    finally:
+        db.close()
+
+
+def _record_finish(run_id: str, status: str, duration_ms: int, result: JobResult, error: str | None) -> None:
+    db = SessionLocal()
+    try:
+        run = db.get(JobRun, run_id)
+        if run:
+            run.status = status
+            run.finished_at = datetime.now(timezone.utc)
+            run.duration_ms = duration_ms
+            run.items_processed = result.processed
+            run.items_failed = result.failed
+            run.error = error
+            db.commit()
+    finally:
+        db.close()
+
+
+def run_job(job: Job) -> JobRun | None:
+    """
+    Run a job once with overlap prevention and metrics.
+    Returns None if the run was skipped because another run holds the lock.
+    """
+    local_lock = _local_lock(job.name)
+    if not local_lock.acquire(blocking=False):
+        print(f"⏭️  [Jobs] {job.name} is still running, skipping this run")
+        return None
+
+    lock_conn = None
+    try:
+        if engine.dialect.name == "postgresql":
+            conn = engine.connect()
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _advisory_key(job.name)}
+            ).scalar()
+            if not acquired:
+                conn.close()
+                print(f"⏭️  [Jobs] {job.name} is running in another worker, skipping this run")
+                return None
+            lock_conn = conn
+
+        run_id = _record_start(job)
+        started = time.perf_counter()
+        status, error, result = "success", None, JobResult()
+        try:
+            result = _normalize_result(job.func())
+            if result.failed:
+                status = "partial"
+        except Exception as e:
+            status, error = "failed", "".join(traceback.format_exception_only(type(e), e)).strip()
+            print(f"❌ [Jobs] {job.name} failed: {error}")
+        duration_ms = int((time.perf_counter() - started) * 1000)
+
+        _record_finish(run_id, status, duration_ms, result, error)
+        db = SessionLocal()
+        try:
+            return db.get(JobRun, run_id)
+        finally:
+            db.close()
+    finally:
+        if lock_conn is not None:
+            try:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _advisory_key(job.name)})
+            finally:
+                lock_conn.close()
+        local_lock.release()
+
+
+async def run_job_forever(job: Job) -> None:
+    """Run a job every `interval_seconds`, after a random startup delay."""
+    if job.jitter_seconds > 0:
+        await asyncio.sleep(random.uniform(0, job.jitter_seconds))
+
+    while True:
+        try:
+            await asyncio.to_thread(run_job, job)
+        except Exception as e:
+            print(f"❌ [Jobs] {job.name} runner error: {e}")
+
+        await asyncio.sleep(job.interval_seconds)
+
+
+def start_jobs(jobs: list[Job]) -> list[asyncio.Task]:
+    """Start a background task per enabled job. Cancel the returned tasks on shutdown."""
+    return [
+        asyncio.create_task(run_job_forever(job), name=f"job:{job.name}")
+        for job in jobs
+        if job.enabled
+    ]
@@ -2,56 +2,57 @@
 Job Scheduler
 
 Runs all background jobs on a schedule using APScheduler.
+Jobs are declared in jobs/registry.py; each run goes through jobs.runner.run_job
+so overlap prevention and job_runs metrics are the same as in the API process.
 """
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from datetime import datetime
+from datetime import datetime, timedelta
+import random
 
-from jobs.idv_sync import run_idv_sync
+from jobs.registry import JOBS
+from jobs.runner import run_job
 
 
 def create_scheduler() -> BlockingScheduler:
     """Create and configure the scheduler with all jobs."""
     scheduler = BlockingScheduler()
-    
-    # IDV Sync - runs every hour
-    scheduler.add_job(
-        run_idv_sync,
-        trigger=IntervalTrigger(hours=1),
-        id="idv_sync",
-        name="IDV Sync Job",
-        replace_existing=True,
-        next_run_time=datetime.now()  # Run immediately on startup
-    )
-    
-    # Add more jobs here as needed:
-    # scheduler.add_job(
-    #     some_other_job,
-    #     trigger=IntervalTrigger(minutes=30),
-    #     id="other_job",
-    #     name="Other Job",
-    #     replace_existing=True
-    # )
-    
+
+    for job in JOBS:
+        if not job.enabled:
+            continue
+        scheduler.add_job(
+            run_job,
+            args=[job],
+            trigger=IntervalTrigger(seconds=job.interval_seconds),
+            id=job.name,
+            name=job.name,
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            # Run soon after startup, staggered by the job's jitter
+            next_run_time=datetime.now() + timedelta(seconds=random.uniform(0, job.jitter_seconds))
+        )
+
     return scheduler
 
 
 def main():
     print(" Starting Job Scheduler")
     print("=" * 50)
-    
+
     scheduler = create_scheduler()
-    
+
     # Print registered jobs
     print("\n Registered Jobs:")
     for job in scheduler.get_jobs():
         print(f"   • {job.name} (ID: {job.id})")
         print(f"     Next run: {job.next_run_time}")
-    
+
     print("\n" + "=" * 50)
     print(" Scheduler running. Press Ctrl+C to exit.\n")
-    
+
     try:
         scheduler.start()
     except (KeyboardInterrupt, SystemExit):
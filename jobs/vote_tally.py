@@ -0,0 +1,83 @@
+"""
+Vote Tally Job
+
+Snapshots ranked-choice results into vote_tallies for every submission
+week that has votes (see app/services/vote_tally.py). Each week keeps a
+vote signature in job_watermarks under "vote_tally:<week>". A week is only
+re-tallied when its votes changed since the last snapshot. A week that
+still has a snapshot or watermark but no votes left is cleared.
+"""
+
+import os
+from datetime import datetime, timezone
+from app.db import SessionLocal
+from app.models.job_watermark import JobWatermark
+from app.models.project import Project
+from app.models.vote import Vote
+from app.models.vote_tally import VoteTally
+from app.services.vote_tally import clear_week, snapshot_week, week_signature
+from jobs.runner import JobResult
+
+
+VOTE_TALLY_INTERVAL_SECONDS = int(os.getenv("VOTE_TALLY_INTERVAL_SECONDS", "900"))  # Default 15 minutes
+
+WATERMARK_PREFIX = "vote_tally:"
+
+
+def run_vote_tally() -> JobResult:
+    """Main tally function."""
+    db = SessionLocal()
+    result = JobResult()
+
+    try:
+        weeks = {
+            week for (week,) in db.query(Project.submission_week).join(
+                Vote, Vote.project_id == Project.project_id
+            ).distinct()
+        }
+        # Weeks tallied before whose votes have all been deleted since
+        stale = {week for (week,) in db.query(VoteTally.submission_week).distinct()}
+        stale.update(
+            name.removeprefix(WATERMARK_PREFIX) for (name,) in db.query(JobWatermark.job_name).filter(
+                JobWatermark.job_name.startswith(WATERMARK_PREFIX, autoescape=True)
+            )
+        )
+        stale -= weeks
+
+        for week in sorted(stale):
+            try:
+                clear_week(db, week)
+                db.query(JobWatermark).filter(JobWatermark.job_name == WATERMARK_PREFIX + week).delete()
+                db.commit()
+                result.processed += 1
+                print(f"✅ [Vote Tally] {week}: no votes left, cleared snapshot")
+            except Exception as e:
+                print(f"❌ [Vote Tally] {week}: {e}")
+                db.rollback()
+                result.failed += 1
+
+        for week in sorted(weeks):
+            try:
+                signature = week_signature(db, week)
+                watermark = db.get(JobWatermark, WATERMARK_PREFIX + week)
+                if watermark is not None and watermark.last_id == signature:
+                    continue
+                if watermark is None:
+                    watermark = JobWatermark(job_name=WATERMARK_PREFIX + week)
+                    db.add(watermark)
+
+                rows = snapshot_week(db, week)
+                watermark.last_id = signature
+                watermark.last_created_at = datetime.now(timezone.utc)
+                db.commit()
+                result.processed += 1
+                print(f"✅ [Vote Tally] {week}: tallied {rows} project(s)")
+            except Exception as e:
+                print(f"❌ [Vote Tally] {week}: {e}")
+                db.rollback()
+                result.failed += 1
+
+        return result
+
+    finally:
+        db.close()
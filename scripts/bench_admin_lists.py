@@ -0,0 +1,217 @@
+"""
+Compare full-entity loading with column projections for admin list pages.
+
+--seed inserts --rows users, each with one project. Every project has a
+--description-kb description and zero hackatime hours, so it also shows
+up in /admin/projects/anomalies. For each list view, one --page-size
+page is built in two ways:
+  - entities: the old approach, loading Project/User objects and
+    lazy-loading p.user on each row
+  - columns: the handler in app.api.routers.admin, which selects only
+    the columns it returns as plain row tuples
+The script prints median latency, peak Python memory (tracemalloc, on a
+separate run) and SQL statements per page. Needs Postgres.
+
+Run with: python scripts/bench_admin_lists.py --seed
+Remove seeded rows with: python scripts/bench_admin_lists.py --cleanup
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func, or_, text
+from app.api.routers.admin import get_projects_with_anomalies, list_projects, list_users
+from app.db import SessionLocal, engine
+from app.models.project import Project
+from app.models.user import User
+
+
+BENCH_DOMAIN = "bench-lists.invalid"
+BENCH_WEEK = "bench-lists"
+
+
+def seed(db, rows: int, description_kb: int) -> None:
+    db.execute(text(f"""
+        INSERT INTO users (user_id, email, handle, referral_code, created_at, updated_at)
+        SELECT 'bench-lists-' || i, 'user' || i || '@{BENCH_DOMAIN}', 'bench_lists_' || i,
+               'L' || upper(lpad(to_hex(i), 7, '0')), now(), now()
+        FROM generate_series(1, :n) AS i
+        ON CONFLICT DO NOTHING
+    """), {"n": rows})
+    db.execute(text("""
+        INSERT INTO projects (project_id, user_id, project_name, project_description, submission_week,
+                              shipped, sent_to_airtable, review_status, hackatime_hours, created_at, updated_at)
+        SELECT 'bench-lists-p' || i, 'bench-lists-' || i, 'Project ' || i, repeat('x', :size), :week,
+               false, false, 'pending', 0, now(), now()
+        FROM generate_series(1, :n) AS i
+        ON CONFLICT DO NOTHING
+    """), {"n": rows, "size": description_kb * 1024, "week": BENCH_WEEK})
+    db.commit()
+    db.execute(text("ANALYZE users"))
+    db.execute(text("ANALYZE projects"))
+    db.commit()
+
+
+def cleanup(db) -> None:
+    db.execute(text("DELETE FROM projects WHERE project_id LIKE 'bench-lists-p%'"))
+    db.execute(text(f"DELETE FROM users WHERE email LIKE '%@{BENCH_DOMAIN}'"))
+    db.commit()
+
+
+def projects_entities(db, limit: int) -> list[dict]:
+    projects = db.query(Project).join(User, Project.user_id == User.user_id).filter(
+        Project.submission_week == BENCH_WEEK
+    ).order_by(Project.created_at.desc()).limit(limit).all()
+    return [
+        {
+            "project_id": p.project_id, "project_name": p.project_name,
+            "project_description": p.project_description, "project_type": p.project_type,
+            "submission_week": p.submission_week, "shipped": p.shipped, "hackatime_hours": p.hackatime_hours,
+            "review_status": p.review_status, "review_notes": p.review_notes, "reviewed_by": p.reviewed_by,
+            "reviewed_at": p.reviewed_at.isoformat() if p.reviewed_at else None,
+            "created_at": p.created_at.isoformat() if p.created_at else None,
+            "user": {"user_id": p.user.user_id, "handle": p.user.handle, "email": p.user.email},
+        }
+        for p in projects
+    ]
+
+
+def anomalies_entities(db, limit: int) -> list[dict]:
+    projects = db.query(Project).join(User, Project.user_id == User.user_id).filter(
+        or_(Project.hackatime_hours == 0, Project.hackatime_hours > 80, Project.hackatime_hours.is_(None))
+    ).order_by(Project.created_at.desc()).limit(limit).all()
+    return [
+        {
+            "project_id": p.project_id, "project_name": p.project_name, "submission_week": p.submission_week,
+            "shipped": p.shipped, "hackatime_hours": p.hackatime_hours, "review_status": p.review_status,
+            "created_at": p.created_at.isoformat() if p.created_at else None,
+            "user": {"user_id": p.user.user_id, "handle": p.user.handle},
+        }
+        for p in projects
+    ]
+
+
+def journey(user) -> dict:
+    steps = [
+        ("registered", True),
+        ("storyline", user.storyline_completed_at is not None),
+        ("slack", user.slack_linked_at is not None),
+        ("idv", user.idv_completed_at is not None),
+        ("hackatime", user.hackatime_completed_at is not None),
+        ("onboarding", user.onboarding_completed_at is not None),
+    ]
+    current_step = "registered"
+    for step_name, done in steps:
+        if not done:
+            break
+        current_step = step_name
+    return {
+        "current_step": current_step, "completed_count": sum(1 for _, done in steps if done),
+        "total_steps": len(steps), **{name: done for name, done in steps[1:]},
+    }
+
+
+def users_entities(db, limit: int) -> list[dict]:
+    users = db.query(User).order_by(User.created_at.desc()).limit(limit).all()
+    counts = dict(
+        db.query(Project.user_id, func.count(Project.project_id))
+        .filter(Project.user_id.in_([u.user_id for u in users]))
+        .group_by(Project.user_id)
+        .all()
+    )
+    return [
+        {
+            "user_id": u.user_id, "handle": u.handle, "email": u.email,
+            "created_at": u.created_at.isoformat() if u.created_at else None,
+            "onboarding_completed_at": u.onboarding_completed_at.isoformat() if u.onboarding_completed_at else None,
+            "project_count": counts.get(u.user_id, 0),
+            "journey": journey(u),
+        }
+        for u in users
+    ]
+
+
+def measure(run, repeat: int) -> tuple[float, float, int]:
+    """(median ms, peak MiB, SQL statements) for run(db), each on a fresh session.
+
+    Timing runs don't trace allocations; one extra run measures memory.
+    """
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    samples = []
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            db.connection()
+            start = time.perf_counter()
+            run(db)
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    try:
+        db.connection()
+        event.listen(engine, "before_cursor_execute", count)
+        tracemalloc.start()
+        run(db)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        event.remove(engine, "before_cursor_execute", count)
+    finally:
+        db.close()
+    return statistics.median(samples), peak, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark admin list views: entities vs column projections")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--description-kb", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--seed", action="store_true", help="Insert synthetic users and projects first")
+    parser.add_argument("--cleanup", action="store_true", help="Delete seeded rows and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            print("Removed seeded rows")
+            return
+        if args.seed:
+            start = time.perf_counter()
+            seed(db, args.rows, args.description_kb)
+            print(f"Seeded {args.rows} users/projects in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+    n = args.page_size
+    cases = [
+        ("/admin/projects", lambda db: projects_entities(db, n),
+         lambda db: list_projects(week=BENCH_WEEK, shipped=None, review_status=None, q=None,
+                                  min_hours=None, max_hours=None, skip=0, limit=n, db=db)),
+        ("/admin/projects/anomalies", lambda db: anomalies_entities(db, n),
+         lambda db: get_projects_with_anomalies(skip=0, limit=n, db=db)),
+        ("/admin/users", lambda db: users_entities(db, n),
+         lambda db: list_users(q=None, skip=0, limit=n, db=db)),
+    ]
+
+    print(f"{n}-row pages, median of {args.repeat}")
+    print(f"{'view':<27} {'approach':<9} {'latency':>9} {'peak mem':>10} {'queries':>8}")
+    for name, entities, columns in cases:
+        for approach, run in (("entities", entities), ("columns", columns)):
+            ms, peak, queries = measure(run, args.repeat)
+            print(f"{name:<27} {approach:<9} {ms:>7.1f}ms {peak:>7.1f}MiB {queries:>8}")
+
+
+if __name__ == "__main__":
+    main()
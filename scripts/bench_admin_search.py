@@ -0,0 +1,123 @@
+"""
+Compare admin search with plain ILIKE against the indexed search service.
+
+Optionally seeds --users synthetic users (one project each) into
+DATABASE_URL with generate_series, then times each query term both ways:
+the old unranked ILIKE '%q%' filter and app.services.search. Needs
+Postgres with the add_search_indexes migration applied.
+
+Run with: python scripts/bench_admin_search.py --seed --users 1000000
+Remove seeded rows with: python scripts/bench_admin_search.py --cleanup
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_, text
+from app.db import SessionLocal
+from app.models.project import Project
+from app.models.user import User
+from app.services.search import search_projects, search_users
+
+
+BENCH_DOMAIN = "bench-search.invalid"
+WORDS = ["robot", "weather", "garden", "synth", "rocket", "pixel", "tracker", "quiz", "laser", "chess"]
+
+
+def seed(db, users: int) -> None:
+    words = "ARRAY[" + ", ".join(f"'{w}'" for w in WORDS) + "]"
+    db.execute(text(f"""
+        INSERT INTO users (user_id, email, handle, referral_code, created_at, updated_at)
+        SELECT 'bench-' || i, 'user' || i || '@{BENCH_DOMAIN}', 'bench_' || md5(i::text),
+               'B' || upper(lpad(to_hex(i), 7, '0')), now(), now()
+        FROM generate_series(1, :n) AS i
+        ON CONFLICT DO NOTHING
+    """), {"n": users})
+    db.execute(text(f"""
+        INSERT INTO projects (project_id, user_id, project_name, project_description, project_type,
+                              submission_week, shipped, sent_to_airtable, review_status, created_at, updated_at)
+        SELECT 'bench-p' || i, 'bench-' || i,
+               ({words})[1 + i % 10] || ' ' || ({words})[1 + (i / 10) % 10] || ' ' || i,
+               'A ' || ({words})[1 + (i / 100) % 10] || ' project that does things',
+               'web', 'w1', false, false, 'pending', now(), now()
+        FROM generate_series(1, :n) AS i
+        ON CONFLICT DO NOTHING
+    """), {"n": users})
+    db.commit()
+    db.execute(text("ANALYZE users"))
+    db.execute(text("ANALYZE projects"))
+    db.commit()
+
+
+def cleanup(db) -> None:
+    db.execute(text("DELETE FROM projects WHERE project_id LIKE 'bench-p%'"))
+    db.execute(text(f"DELETE FROM users WHERE email LIKE '%@{BENCH_DOMAIN}'"))
+    db.commit()
+
+
+def timed(run, repeat: int) -> float:
+    """Median wall time in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark admin project/user search")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--seed", action="store_true", help="Insert synthetic users and projects first")
+    parser.add_argument("--cleanup", action="store_true", help="Delete seeded rows and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--terms", nargs="+", default=["rocket", "garden syn", "bench_4f2", "user12345@"])
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            print("Removed seeded rows")
+            return
+        if args.seed:
+            start = time.perf_counter()
+            seed(db, args.users)
+            print(f"Seeded {args.users} users/projects in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'term':<14} {'projects ilike':>15} {'projects search':>16} {'users ilike':>12} {'users search':>13}")
+        for term in args.terms:
+            pattern = f"%{term}%"
+
+            def projects_ilike():
+                db.query(Project.project_id).join(User, Project.user_id == User.user_id).filter(
+                    or_(Project.project_name.ilike(pattern), User.handle.ilike(pattern))
+                ).order_by(Project.created_at.desc()).limit(50).all()
+
+            def projects_search():
+                search_projects(
+                    db.query(Project.project_id).join(User, Project.user_id == User.user_id), term
+                ).limit(50).all()
+
+            def users_ilike():
+                db.query(User.user_id).filter(
+                    or_(User.handle.ilike(pattern), User.user_id.ilike(pattern), User.email.ilike(pattern))
+                ).order_by(User.created_at.desc()).limit(50).all()
+
+            def users_search():
+                search_users(db.query(User.user_id), term).limit(50).all()
+
+            print(
+                f"{term:<14} {timed(projects_ilike, args.repeat):>13.1f}ms {timed(projects_search, args.repeat):>14.1f}ms"
+                f" {timed(users_ilike, args.repeat):>10.1f}ms {timed(users_search, args.repeat):>11.1f}ms"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
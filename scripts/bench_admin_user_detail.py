@@ -0,0 +1,174 @@
+"""
+Benchmark GET /admin/users/{user_id} on a heavy user.
+
+--seed creates one synthetic user in DATABASE_URL with:
+  - --projects projects, each with two reviews
+  - --hackatime hackatime projects
+  - a login every day for --months months
+  - --events onboarding events and --audit-logs audit logs, spread over
+    the same months
+  - a vote on each project of a second synthetic user
+Missing monthly partitions are created first. Then the route is called
+--requests times in-process, with auth checks skipped, and the script
+prints p50/p95/max latency and the number of SQL statements per request.
+Needs Postgres.
+
+Run with: python scripts/bench_admin_user_detail.py --seed
+Remove seeded rows with: python scripts/bench_admin_user_detail.py --cleanup
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from app.api.deps import verify_admin, verify_auth
+from app.db import SessionLocal, engine
+from app.main import app
+from jobs.partition_maintenance import PARTITIONED_TABLES, add_months, create_partition, is_partitioned
+
+
+USER_ID = "bench-detail-user"
+OWNER_ID = "bench-detail-owner"
+
+
+def seed(db, args) -> None:
+    this_month = date.today().replace(day=1)
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(db, table):
+            for i in range(args.months + 1):
+                create_partition(db, table, add_months(this_month, -i))
+
+    start = f"now() - interval '{args.months} months'"
+    params = {"user": USER_ID, "owner": OWNER_ID}
+    db.execute(text(f"""
+        INSERT INTO users (user_id, email, handle, referral_code, referred_by_user_id, created_at, updated_at)
+        VALUES (:owner, 'owner@bench-detail.invalid', 'bench_detail_owner', 'BDOWNER0', NULL, {start}, now()),
+               (:user, 'user@bench-detail.invalid', 'bench_detail_user', 'BDUSER00', :owner, {start}, now())
+        ON CONFLICT DO NOTHING
+    """), params)
+    db.execute(text(f"""
+        INSERT INTO projects (project_id, user_id, project_name, project_description, submission_week,
+                              shipped, sent_to_airtable, review_status, created_at, updated_at)
+        SELECT 'bench-detail-' || owner || '-' || i, owner, 'Project ' || i, repeat('Lorem ipsum ', 200), 'w' || (i % 10),
+               i % 2 = 0, false, 'pending', {start} + i * interval '1 hour', now()
+        FROM generate_series(1, :n) AS i, (VALUES (:user), (:owner)) AS o(owner)
+        ON CONFLICT DO NOTHING
+    """), {**params, "n": args.projects})
+    db.execute(text("""
+        INSERT INTO reviews (review_id, reviewer_user_id, project_id, review_comments, review_decision, review_timestamp)
+        SELECT 'bench-detail-review-' || i || '-' || r, :owner, 'bench-detail-' || :user || '-' || i, 'Looks good', 'approved', now()
+        FROM generate_series(1, :n) AS i, generate_series(1, 2) AS r
+        ON CONFLICT DO NOTHING
+    """), {**params, "n": args.projects})
+    db.execute(text("""
+        INSERT INTO votes (vote_id, user_id, project_id, vote_ranking, timestamp)
+        SELECT 'bench-detail-vote-' || i, :user, 'bench-detail-' || :owner || '-' || i, 1 + i % 5, now()
+        FROM generate_series(1, :n) AS i
+        ON CONFLICT DO NOTHING
+    """), {**params, "n": args.projects})
+    db.execute(text("""
+        INSERT INTO hackatime_projects (id, user_id, name, seconds, created_at, updated_at)
+        SELECT 'bench-detail-ht-' || i, :user, 'hackatime-' || i, i * 60, now(), now()
+        FROM generate_series(1, :n) AS i
+        ON CONFLICT DO NOTHING
+    """), {**params, "n": args.hackatime})
+    db.execute(text(f"""
+        INSERT INTO user_login_events (id, user_id, logged_in_at, login_date)
+        SELECT 'bench-detail-login-' || d::date, :user, d, d::date
+        FROM generate_series({start}, now(), interval '1 day') AS d
+        ON CONFLICT DO NOTHING
+    """), params)
+    db.execute(text(f"""
+        INSERT INTO onboarding_events (id, user_id, event, slide, total_slides, timestamp, created_at)
+        SELECT 'bench-detail-ob-' || i, :user, 'onboarding_next', i % 10, 10, t, t
+        FROM generate_series(1, :n) AS i, LATERAL (SELECT {start} + (now() - ({start})) * i / :n AS t) AS ts
+        ON CONFLICT DO NOTHING
+    """), {**params, "n": args.events})
+    db.execute(text(f"""
+        INSERT INTO audit_logs (id, user_id, object_type, object_id, action, details, created_at)
+        SELECT 'bench-detail-audit-' || i, :owner, 'user', :user, 'user_update', '{{}}', t
+        FROM generate_series(1, :n) AS i, LATERAL (SELECT {start} + (now() - ({start})) * i / :n AS t) AS ts
+        ON CONFLICT DO NOTHING
+    """), {**params, "n": args.audit_logs})
+    db.execute(text("""
+        UPDATE projects SET vote_count = 1, vote_score = 3 WHERE project_id LIKE 'bench-detail-' || :owner || '-%'
+    """), params)
+    db.commit()
+    for table in ("users", "projects", "reviews", "votes", "hackatime_projects", "user_login_events", "onboarding_events", "audit_logs"):
+        db.execute(text(f"ANALYZE {table}"))
+    db.commit()
+
+
+def cleanup(db) -> None:
+    params = {"user": USER_ID, "owner": OWNER_ID}
+    db.execute(text("DELETE FROM audit_logs WHERE object_id = :user OR user_id IN (:user, :owner)"), params)
+    db.execute(text("DELETE FROM onboarding_events WHERE user_id = :user"), params)
+    db.execute(text("DELETE FROM user_login_events WHERE user_id = :user"), params)
+    db.execute(text("DELETE FROM hackatime_projects WHERE user_id = :user"), params)
+    db.execute(text("DELETE FROM votes WHERE user_id IN (:user, :owner)"), params)
+    db.execute(text("DELETE FROM reviews WHERE reviewer_user_id IN (:user, :owner)"), params)
+    db.execute(text("DELETE FROM gallery_entries WHERE user_id IN (:user, :owner)"), params)
+    db.execute(text("DELETE FROM vote_tallies WHERE project_id LIKE 'bench-detail-%'"))
+    db.execute(text("DELETE FROM projects WHERE user_id IN (:user, :owner)"), params)
+    db.execute(text("DELETE FROM users WHERE user_id IN (:user, :owner)"), params)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the admin user detail route")
+    parser.add_argument("--seed", action="store_true", help="Insert the heavy user first")
+    parser.add_argument("--cleanup", action="store_true", help="Delete seeded rows and exit")
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--hackatime", type=int, default=500)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--audit-logs", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            print("Removed seeded rows")
+            return
+        if args.seed:
+            start = time.perf_counter()
+            seed(db, args)
+            print(f"Seeded heavy user in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+    # No context manager: the lifespan (background jobs, render pool) isn't needed here
+    app.dependency_overrides[verify_auth] = lambda: None
+    app.dependency_overrides[verify_admin] = lambda: None
+    client = TestClient(app)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    client.get(f"/admin/users/{USER_ID}").raise_for_status()
+    queries = len(statements)
+
+    samples = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        client.get(f"/admin/users/{USER_ID}").raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    print(f"{queries} SQL statements per request")
+    print(
+        f"p50 {statistics.median(samples):.1f}ms  "
+        f"p95 {samples[int(len(samples) * 0.95) - 1]:.1f}ms  "
+        f"max {samples[-1]:.1f}ms  ({args.requests} requests)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark the Airtable writer against a local stub of the Airtable API.
+
+The stub accepts batch creates, optionally answers every Nth request with a
+429, and counts what it received. Prints records/sec for the run.
+
+Run with: python scripts/bench_airtable_sync.py --records 500 --throttle-every 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from uuid import uuid4
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.airtable import AirtableWriter
+
+
+class StubAirtable:
+    def __init__(self, throttle_every: int = 0, retry_after: float = 0.2, latency: float = 0.0):
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.latency = latency
+        self.requests = 0
+        self.throttled = 0
+        self.records = 0
+        self.lock = threading.Lock()
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub.lock:
+                    stub.requests += 1
+                    throttle = stub.throttle_every and stub.requests % stub.throttle_every == 0
+                    if throttle:
+                        stub.throttled += 1
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if throttle:
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(stub.retry_after))
+                    self.end_headers()
+                    return
+
+                records = json.loads(body)["records"]
+                with stub.lock:
+                    stub.records += len(records)
+                payload = json.dumps({
+                    "records": [{"id": f"rec{uuid4().hex[:14]}", "fields": r["fields"]} for r in records]
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=5.0, help="Requests per second allowed by the token bucket")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Answer every Nth request with a 429")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated server latency in seconds")
+    args = parser.parse_args()
+
+    stub = StubAirtable(throttle_every=args.throttle_every, latency=args.latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_address[1]}/v0"
+
+    fields = [
+        {"Project Name": f"Project {i}", "Description": "x" * 200, "Hackatime Hours": i % 40}
+        for i in range(args.records)
+    ]
+
+    start = time.perf_counter()
+    with AirtableWriter("key", "appStub", "Projects", api_url=api_url, requests_per_second=args.rate) as writer:
+        created = writer.create_records(fields)
+    elapsed = time.perf_counter() - start
+
+    server.shutdown()
+
+    print(f"Records sent:      {len(created)} (stub received {stub.records})")
+    print(f"Requests:          {stub.requests} ({stub.throttled} throttled with 429)")
+    print(f"Elapsed:           {elapsed:.2f}s")
+    print(f"Throughput:        {len(created) / elapsed:.1f} records/sec")
+    print(f"Request rate:      {stub.requests / elapsed:.2f} req/sec (limit {args.rate})")
+
+
+if __name__ == "__main__":
+    main()
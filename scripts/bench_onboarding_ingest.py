@@ -0,0 +1,79 @@
+"""
+Compare per-event and batched onboarding event ingestion.
+
+Sends --events events through the API in-process (TestClient) against
+DATABASE_URL, once as one POST /analytics/onboarding per event and once as
+POST /analytics/onboarding/batch in chunks of --batch-size, and prints
+events/sec for each.
+
+Run with: python scripts/bench_onboarding_ingest.py --events 2000 --batch-size 200
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from app.core.config import get_settings
+from app.db import Base, engine
+from app.models.onboarding_event import OnboardingEvent
+from app.api.routers.analytics import router
+
+
+def make_events(n: int) -> list[dict]:
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "userId": f"bench-user-{i // 10}",
+            "event": "onboarding_next",
+            "slide": i % 10,
+            "totalSlides": 10,
+            "timestamp": now,
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark onboarding event ingestion")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine, tables=[OnboardingEvent.__table__])
+
+    # Only the analytics router, so app startup jobs don't run
+    from fastapi import FastAPI
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    headers = {"Authorization": get_settings().MASTER_KEY}
+    events = make_events(args.events)
+
+    start = time.perf_counter()
+    for event in events:
+        client.post("/analytics/onboarding", json=event, headers=headers).raise_for_status()
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(events), args.batch_size):
+        chunk = events[i:i + args.batch_size]
+        body = "\n".join(json.dumps(e) for e in chunk)
+        client.post(
+            "/analytics/onboarding/batch",
+            content=body,
+            headers={**headers, "Content-Type": "application/x-ndjson"},
+        ).raise_for_status()
+    batched = time.perf_counter() - start
+
+    print(f"Per-event: {args.events / single:,.0f} events/sec ({single:.2f}s)")
+    print(f"Batched:   {args.events / batched:,.0f} events/sec ({batched:.2f}s, batches of {args.batch_size})")
+    print(f"Speedup:   {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark JSON response serialization per endpoint.
+
+Builds --rows synthetic, unsaved ORM objects (or admin row dicts) for
+each hot list endpoint. The page is encoded three ways:
+  - stdlib: FastAPI's response_model path + starlette JSONResponse
+    (the old default)
+  - orjson: the same response_model path + ORJSONResponse (the new
+    default)
+  - adapter: app.api.serializers.json_response, for the routes that use
+    it
+Prints the median time per page. Never touches the database.
+
+Run with: python scripts/bench_serialization.py --rows 500
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from app.api.routers.users import _to_public_read
+from app.api.serializers import PROJECT_LIST, USER_PUBLIC_LIST, VOTE_LIST, json_response
+from app.main import app
+from app.models.project import Project
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.user_role import UserRole
+from app.models.vote import Vote
+
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def projects(n: int) -> list[Project]:
+    return [
+        Project(
+            project_id=str(uuid4()), user_id=str(uuid4()), project_name=f"Project {i}",
+            project_description="A project that does things. " * 40, project_type="web",
+            attachment_urls=[f"https://example.com/{i}/{j}.png" for j in range(3)],
+            code_url=f"https://github.com/example/{i}", live_url=f"https://example.com/{i}",
+            submission_week="w1", shipped=i % 2 == 0, sent_to_airtable=False,
+            hackatime_projects=[f"hackatime-{i}"], hackatime_hours=12.5, time_spent=3600,
+            created_at=NOW + timedelta(minutes=i), updated_at=NOW + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def votes(n: int) -> list[Vote]:
+    return [
+        Vote(vote_id=str(uuid4()), user_id=str(uuid4()), project_id=str(uuid4()),
+             vote_ranking=1 + i % 5, timestamp=NOW + timedelta(seconds=i))
+        for i in range(n)
+    ]
+
+
+def public_users(n: int) -> list[dict]:
+    users = []
+    for i in range(n):
+        user = User(user_id=str(uuid4()), handle=f"user{i}", created_at=NOW)
+        user.profile = UserProfile(first_name="Ada", avatar_url=f"https://example.com/{i}.png", bio="Hi", is_public=True)
+        user.roles = [UserRole(role_id="user")]
+        users.append(_to_public_read(user))
+    return users
+
+
+def admin_projects(n: int) -> list[dict]:
+    return [
+        {
+            "project_id": p.project_id, "project_name": p.project_name,
+            "project_description": p.project_description, "project_type": p.project_type,
+            "submission_week": p.submission_week, "shipped": p.shipped, "hackatime_hours": p.hackatime_hours,
+            "review_status": "pending", "review_notes": None, "reviewed_by": None, "reviewed_at": None,
+            "created_at": p.created_at.isoformat(),
+            "user": {"user_id": p.user_id, "handle": "handle", "email": "user@example.com"},
+        }
+        for p in projects(n)
+    ]
+
+
+def route_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+def timed(run, repeat: int) -> float:
+    """Median wall time in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response serialization")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = [
+        ("GET /projects", "/projects", projects(args.rows), PROJECT_LIST),
+        ("GET /votes", "/votes", votes(args.rows), VOTE_LIST),
+        ("GET /users", "/users", public_users(args.rows), USER_PUBLIC_LIST),
+        ("GET /admin/projects", "/admin/projects", admin_projects(args.rows), None),
+    ]
+
+    loop = asyncio.new_event_loop()
+
+    def response_model_path(field, content, response_class):
+        def run():
+            value = loop.run_until_complete(serialize_response(field=field, response_content=content))
+            return response_class(value).body
+        return run
+
+    print(f"{args.rows}-row pages, median of {args.repeat}")
+    print(f"{'endpoint':<22} {'stdlib':>9} {'orjson':>9} {'adapter':>9}")
+    for name, path, content, adapter in cases:
+        field = route_field(path)
+        stdlib = timed(response_model_path(field, content, JSONResponse), args.repeat)
+        orjson = timed(response_model_path(field, content, ORJSONResponse), args.repeat)
+        fast = f"{timed(lambda: json_response(adapter, content).body, args.repeat):>7.1f}ms" if adapter else f"{'-':>9}"
+        print(f"{name:<22} {stdlib:>7.1f}ms {orjson:>7.1f}ms {fast}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Load-test UTM hit counting: buffered upserts vs the old read-modify-write.
+
+Fires --hits increments from --threads threads across --sources UTM
+sources against DATABASE_URL, then checks the table gained exactly
+--hits. The legacy mode reproduces the old db.get / count += 1 / commit
+path so lost increments and throughput can be compared directly.
+
+Run with:
+    python scripts/bench_utm_counter.py --hits 20000 --threads 32
+    python scripts/bench_utm_counter.py --mode legacy --hits 2000 --threads 32
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func
+from app.db import Base, SessionLocal, engine
+from app.models.utm import UTM
+from app.services.counter_buffer import CounterBuffer
+from app.services.utm_tracking import _flush_utm_counts
+
+
+def legacy_increment(source: str) -> None:
+    db = SessionLocal()
+    try:
+        existing = db.get(UTM, source)
+        if existing:
+            existing.count += 1
+        else:
+            db.add(UTM(utm_source=source, count=1))
+        db.commit()
+    except Exception:
+        # Racing inserts of a new source fail on the primary key; the hit is lost
+        db.rollback()
+    finally:
+        db.close()
+
+
+def table_total(prefix: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(func.coalesce(func.sum(UTM.count), 0)).filter(UTM.utm_source.like(f"{prefix}%")).scalar()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UTM hit counting")
+    parser.add_argument("--mode", choices=["buffered", "legacy"], default="buffered")
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--sources", type=int, default=5)
+    parser.add_argument("--interval-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine, tables=[UTM.__table__])
+    prefix = f"bench-{int(time.time())}-"
+    sources = [f"{prefix}{i}" for i in range(args.sources)]
+    before = table_total(prefix)
+
+    buffer = CounterBuffer("UTM Bench", _flush_utm_counts, interval_ms=args.interval_ms)
+    if args.mode == "buffered":
+        buffer.start()
+
+    per_thread = args.hits // args.threads
+    total_hits = per_thread * args.threads
+
+    def worker(offset: int):
+        for i in range(per_thread):
+            source = sources[(offset + i) % len(sources)]
+            if args.mode == "buffered":
+                buffer.add(source)
+            else:
+                legacy_increment(source)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    accept_elapsed = time.perf_counter() - start
+
+    if args.mode == "buffered":
+        buffer.stop()
+    elapsed = time.perf_counter() - start
+
+    gained = table_total(prefix) - before
+    print(f"Mode:            {args.mode}")
+    print(f"Hits:            {total_hits} from {args.threads} threads over {args.sources} sources")
+    print(f"Accepted in:     {accept_elapsed:.2f}s ({total_hits / accept_elapsed:,.0f} hits/sec)")
+    print(f"Durable after:   {elapsed:.2f}s")
+    print(f"Rows gained:     {gained} ({total_hits - gained} lost)")
+    if args.mode == "buffered":
+        print(f"Flush stats:     {buffer.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark the ranked-choice tally engine on synthetic ballots.
+
+Each ballot ranks --ballot-size projects, drawn with a popularity skew
+(Zipf-like weights) so there is a real front-runner field. The projects
+get random ranks with some ties. Times each stage of
+app.services.vote_tally separately, then the full tally(), for every
+--candidates value. Never touches the database.
+
+Run with: python scripts/bench_vote_tally.py --projects 10000 --ballots 100000
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app.services.vote_tally import _normalize, borda_scores, pairwise_matrix, schulze_order, tally
+
+
+def synthetic_ballots(projects: int, ballots: int, ballot_size: int, seed: int):
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, projects + 1) ** 0.8
+    weights /= weights.sum()
+    ballot_ids = np.repeat(np.arange(ballots), ballot_size)
+    project_ids = rng.choice(projects, size=ballots * ballot_size, p=weights)
+    # Mostly 1..ballot_size in order, with the occasional tie
+    ranks = np.tile(np.arange(1, ballot_size + 1), ballots)
+    ties = rng.random(len(ranks)) < 0.05
+    ranks[ties] = np.maximum(ranks[ties] - 1, 1)
+    return ballot_ids, project_ids, ranks
+
+
+def timed(run, repeat: int) -> float:
+    """Median wall time in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Borda/Schulze vote tallying")
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--ballots", type=int, default=100000)
+    parser.add_argument("--ballot-size", type=int, default=5)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 250, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    ballot_ids, project_ids, ranks = synthetic_ballots(args.projects, args.ballots, args.ballot_size, args.seed)
+    print(f"{args.ballots} ballots x {args.ballot_size} rankings over {args.projects} projects ({len(ranks)} votes)")
+
+    b, p, r = _normalize(ballot_ids, project_ids, ranks)
+    print(f"{'normalize':<28} {timed(lambda: _normalize(ballot_ids, project_ids, ranks), args.repeat):>9.1f}ms")
+    print(f"{'borda':<28} {timed(lambda: borda_scores(b, p, r, args.projects), args.repeat):>9.1f}ms")
+
+    borda = borda_scores(b, p, r, args.projects)
+    order = np.argsort(-borda, kind="stable")
+    for k in args.candidates:
+        position = np.full(args.projects, -1)
+        position[order[:k]] = np.arange(k)
+        keep = position[p] >= 0
+        fb, fp, fr = b[keep], position[p[keep]], r[keep]
+        d = pairwise_matrix(fb, fp, fr, k)
+        print(f"{f'pairwise matrix (k={k})':<28} {timed(lambda: pairwise_matrix(fb, fp, fr, k), args.repeat):>9.1f}ms")
+        print(f"{f'schulze paths (k={k})':<28} {timed(lambda: schulze_order(d), args.repeat):>9.1f}ms")
+        print(f"{f'full tally (k={k})':<28} {timed(lambda: tally(ballot_ids, project_ids, ranks, args.projects, k), args.repeat):>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
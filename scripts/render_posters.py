@@ -0,0 +1,59 @@
+"""
+Render referral posters in bulk for print campaigns.
+
+Uses a process pool across all cores (or --workers) and writes one PNG per
+referral code into the output directory.
+
+Run with:
+    python scripts/render_posters.py --out posters/            # every user
+    python scripts/render_posters.py --out posters/ --codes ABCD1234 EFGH5678
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.utm import UTMCampaign
+from app.services.render_pool import render_posters_batch
+
+
+def load_all_codes() -> list[str]:
+    from app.db import SessionLocal
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        return [code for (code,) in db.query(User.referral_code).order_by(User.created_at).all()]
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render referral posters in bulk")
+    parser.add_argument("--out", required=True, help="Directory to write PNGs into")
+    parser.add_argument("--codes", nargs="*", help="Referral codes to render (default: every user)")
+    parser.add_argument(
+        "--campaign",
+        choices=[c.value for c in UTMCampaign],
+        default=UTMCampaign.POSTER.value,
+        help="UTM campaign embedded in the QR link",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    codes = args.codes or load_all_codes()
+    if not codes:
+        print("No referral codes to render.")
+        return
+
+    print(f"🖨️  Rendering {len(codes)} poster(s) with {args.workers or os.cpu_count()} worker(s)...")
+    start = time.perf_counter()
+    paths = render_posters_batch(codes, args.out, UTMCampaign(args.campaign), args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Wrote {len(paths)} poster(s) to {args.out} in {elapsed:.1f}s ({len(paths) / elapsed:.1f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from app.models.user import User
 from app.models.project import Project
 from app.models.vote import Vote
 from app.models.review import Review
+from app.crud.votes import vote_points
 from uuid import uuid4
 
 def seed_database():
@@ -146,6 +147,9 @@ def seed_database():
             vote = Vote(vote_id=str(uuid4()), **vote_data)
             db.add(vote)
             votes.append(vote)
+            project = next(p for p in projects if p.project_id == vote.project_id)
+            project.vote_count += 1
+            project.vote_score += vote_points(vote.vote_ranking)
         
         db.commit()
         print(f"Created {len(votes)} votes")
@@ -0,0 +1,61 @@
+"""
+Checks app.services.counter_buffer failure handling with an in-memory
+flush function. No database needed.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("MASTER_KEY", "test-master-key")
+
+from app.services.counter_buffer import COUNTER_BUFFER_MAX_KEY_FAILURES, CounterBuffer
+
+
+class FakeStore:
+    def __init__(self):
+        self.counts = {}
+        self.down = False
+
+    def flush(self, deltas: dict) -> dict:
+        if self.down or any(len(key) > 10 for key in deltas):
+            raise ValueError("value too long")
+        for key, delta in deltas.items():
+            self.counts[key] = self.counts.get(key, 0) + delta
+        return {key: self.counts[key] for key in deltas}
+
+
+def test_bad_key_is_dropped_without_blocking_others():
+    store = FakeStore()
+    buffer = CounterBuffer("test", store.flush)
+    for _ in range(COUNTER_BUFFER_MAX_KEY_FAILURES):
+        buffer.add("x" * 11)
+        buffer.add("ok")
+        buffer.flush()
+
+    assert store.counts == {"ok": COUNTER_BUFFER_MAX_KEY_FAILURES}
+    assert buffer.pending("x" * 11) == 0
+    assert buffer.stats()["dropped"] == COUNTER_BUFFER_MAX_KEY_FAILURES
+
+
+def test_outage_keeps_counts():
+    store = FakeStore()
+    buffer = CounterBuffer("test", store.flush)
+    store.down = True
+    for _ in range(COUNTER_BUFFER_MAX_KEY_FAILURES + 1):
+        buffer.add("a")
+        buffer.flush()
+
+    store.down = False
+    buffer.flush()
+    assert store.counts == {"a": COUNTER_BUFFER_MAX_KEY_FAILURES + 1}
+
+
+def test_totals_are_capped():
+    store = FakeStore()
+    buffer = CounterBuffer("test", store.flush, max_totals=2)
+    for key in ("a", "b", "c"):
+        buffer.add(key)
+        buffer.flush()
+
+    assert buffer.running_total("a") is None
+    assert buffer.running_total("c") == 1
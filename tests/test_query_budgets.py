@@ -0,0 +1,682 @@
+"""
+Query budgets for the /users and /votes routes.
+
+Every ORM query runs with raiseload("*"), so a serializer that touches a
+relationship its route didn't load explicitly fails instead of silently
+lazy loading. Each route must also stay within a fixed number of SQL
+statements.
+
+Needs a Postgres database; missing tables are created from the models:
+    TEST_DATABASE_URL=postgresql://... pytest tests/test_query_budgets.py
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL not set", allow_module_level=True)
+
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+os.environ.setdefault("MASTER_KEY", "test-master-key")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text, update
+from sqlalchemy.orm import raiseload
+
+from app.core.config import get_settings
+from app.db import Base, SessionLocal, engine
+from app.main import app
+from app.models.audit_log import AuditLog
+from app.models.project import Project
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_role import UserRole
+from jobs.partition_maintenance import run_partition_maintenance
+
+
+AUTH = {"Authorization": get_settings().MASTER_KEY}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    Base.metadata.create_all(engine)
+    run_partition_maintenance()
+
+
+@pytest.fixture(autouse=True)
+def strict_loading():
+    def add_raiseload(state):
+        if state.is_select:
+            state.statement = state.statement.options(raiseload("*"))
+
+    event.listen(SessionLocal, "do_orm_execute", add_raiseload)
+    yield
+    event.remove(SessionLocal, "do_orm_execute", add_raiseload)
+
+
+@contextmanager
+def query_budget(limit: int):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert len(statements) <= limit, f"{len(statements)} queries (budget {limit}):\n" + "\n\n".join(statements)
+
+
+@pytest.fixture(scope="module")
+def client():
+    # No context manager: the lifespan (background jobs, render pool) isn't needed here
+    return TestClient(app)
+
+
+def new_user(client: TestClient) -> dict:
+    suffix = uuid4().hex[:12]
+    response = client.post("/users", headers=AUTH, json={
+        "email": f"budget-{suffix}@example.com",
+        "identity_vault_id": f"idv-{suffix}",
+        "profile": {"first_name": "Budget", "is_public": True},
+        "address": {"address_line_1": "1 Test Street"},
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def new_user_with_role(client: TestClient, role_id: str) -> str:
+    user_id = new_user(client)["user_id"]
+    db = SessionLocal()
+    try:
+        if db.get(Role, role_id) is None:
+            db.add(Role(role_id=role_id, name=role_id.title()))
+            db.flush()
+        db.add(UserRole(user_id=user_id, role_id=role_id))
+        db.commit()
+    finally:
+        db.close()
+    return user_id
+
+
+@pytest.fixture(scope="module")
+def admin_id(client) -> str:
+    return new_user_with_role(client, "admin")
+
+
+def self_headers(user_id: str) -> dict:
+    return {**AUTH, "X-User-Id": user_id}
+
+
+def test_create_user(client):
+    # inserts, reload with profile/roles/addresses, and the referral asset prerender lookup
+    with query_budget(6):
+        new_user(client)
+
+
+def test_get_self(client):
+    user = new_user(client)
+    with query_budget(3):
+        response = client.get(f"/users/{user['user_id']}", headers=self_headers(user["user_id"]))
+    assert response.status_code == 200
+    assert response.json()["has_address"] is True
+
+
+def test_get_public(client, admin_id):
+    user = new_user(client)
+    with query_budget(3):
+        response = client.get(f"/users/{user['user_id']}", headers=self_headers(admin_id))
+    assert response.status_code == 200
+    assert response.json()["profile"]["is_public"] is True
+
+
+def test_list_users(client, admin_id):
+    for _ in range(3):
+        new_user(client)
+    # admin check (2) + users with profiles (1) + roles (1), regardless of page size
+    with query_budget(4):
+        response = client.get("/users", params={"limit": 500}, headers=self_headers(admin_id))
+    assert response.status_code == 200
+    assert len(response.json()) >= 4
+
+
+def test_update_user(client):
+    user = new_user(client)
+    with query_budget(5):
+        response = client.patch(
+            f"/users/{user['user_id']}",
+            headers=self_headers(user["user_id"]),
+            json={"handle": f"budget{uuid4().hex[:8]}"},
+        )
+    assert response.status_code == 200
+
+
+def test_update_profile(client):
+    user = new_user(client)
+    with query_budget(6):
+        response = client.patch(
+            f"/users/{user['user_id']}/profile",
+            headers=self_headers(user["user_id"]),
+            json={"bio": "hello"},
+        )
+    assert response.status_code == 200
+    assert response.json()["profile"]["bio"] == "hello"
+
+
+@pytest.mark.parametrize("path", [
+    "storyline-complete",
+    "hackatime-complete",
+    "slack-complete",
+    "idv-complete",
+    "onboarding-complete",
+])
+def test_complete_milestone(client, path):
+    user = new_user(client)
+    with query_budget(4):
+        response = client.post(f"/users/{user['user_id']}/{path}", headers=self_headers(user["user_id"]))
+    assert response.status_code == 200
+
+
+def test_complete_milestones(client):
+    user = new_user(client)
+    with query_budget(4):
+        response = client.post(
+            f"/users/{user['user_id']}/milestones",
+            headers=self_headers(user["user_id"]),
+            json={"milestones": ["storyline", "hackatime", "slack"]},
+        )
+    assert response.status_code == 200
+    assert response.json()["slack_linked_at"] is not None
+
+
+def test_link_idv(client):
+    user = new_user(client)
+    with query_budget(6):
+        response = client.post(
+            f"/users/{user['user_id']}/link-idv",
+            headers=self_headers(user["user_id"]),
+            json={"identity_vault_id": f"idv-{uuid4().hex}", "identity_vault_access_token": "token"},
+        )
+    assert response.status_code == 200
+    assert response.json()["idv_completed_at"] is not None
+
+
+def test_record_login(client):
+    user = new_user(client)
+    with query_budget(1):
+        response = client.post(f"/users/{user['user_id']}/loggedin", headers=self_headers(user["user_id"]))
+    assert response.json()["message"] == "Login recorded"
+    with query_budget(2):
+        response = client.post(f"/users/{user['user_id']}/loggedin", headers=self_headers(user["user_id"]))
+    assert response.json()["message"] == "Already logged in today"
+
+
+def test_exists(client):
+    user = new_user(client)
+    with query_budget(1):
+        response = client.get(f"/users/{user['user_id']}/exists", headers=AUTH)
+    assert response.json() == {"exists": True}
+
+
+def test_by_email_and_identity_vault_id(client):
+    user = new_user(client)
+    db = SessionLocal()
+    try:
+        email, idv = db.query(User.email, User.identity_vault_id).filter(User.user_id == user["user_id"]).one()
+    finally:
+        db.close()
+
+    with query_budget(1):
+        response = client.get(f"/users/by-email/{email.upper()}", headers=AUTH)
+    assert response.json() == {"user_id": user["user_id"]}
+    with query_budget(1):
+        response = client.get(f"/users/by-identity-vault-id/{idv}", headers=AUTH)
+    assert response.json() == {"user_id": user["user_id"]}
+
+
+def test_lookup(client):
+    users = [new_user(client) for _ in range(3)]
+    db = SessionLocal()
+    try:
+        rows = db.query(User.user_id, User.email, User.identity_vault_id).filter(
+            User.user_id.in_([u["user_id"] for u in users])
+        ).all()
+    finally:
+        db.close()
+
+    with query_budget(1):
+        response = client.post("/users/lookup", headers=AUTH, json={
+            "emails": [r.email for r in rows] + ["nobody@example.com"],
+            "identity_vault_ids": [r.identity_vault_id for r in rows],
+        })
+    body = response.json()
+    assert body["emails"]["nobody@example.com"] is None
+    assert {body["emails"][r.email] for r in rows} == {r.user_id for r in rows}
+    assert {body["identity_vault_ids"][r.identity_vault_id] for r in rows} == {r.user_id for r in rows}
+
+
+def new_project(user_id: str, week: str, **fields) -> str:
+    db = SessionLocal()
+    try:
+        project = Project(
+            user_id=user_id,
+            submission_week=week,
+            **{"project_name": "Budget project", "project_description": "A project", **fields},
+        )
+        db.add(project)
+        db.commit()
+        return project.project_id
+    finally:
+        db.close()
+
+
+def test_gallery(client):
+    from jobs.gallery_refresh import run_gallery_refresh
+
+    week = f"budget-{uuid4().hex[:8]}"
+    owner = new_user(client)
+    project_id = new_project(
+        owner["user_id"], week, shipped=True, code_url="https://example.com", hackatime_projects=["budget"]
+    )
+
+    # signature (4) + watermark read + feed + delete + insert + watermark update
+    with query_budget(9):
+        assert run_gallery_refresh().processed >= 1
+
+    # gallery version + one page query
+    with query_budget(2):
+        response = client.get("/projects/gallery", headers=AUTH, params={"week": week})
+    assert [(i["project_id"], i["handle"]) for i in response.json()["items"]] == [(project_id, None)]
+    etag = response.headers["ETag"]
+
+    # gallery version only
+    with query_budget(1):
+        response = client.get("/projects/gallery", headers={**AUTH, "If-None-Match": etag}, params={"week": week})
+    assert response.status_code == 304
+
+    # signature (4) + watermark read
+    with query_budget(5):
+        assert run_gallery_refresh().processed == 0
+
+    handle = f"budget{uuid4().hex[:8]}"
+    client.patch(f"/users/{owner['user_id']}", headers=self_headers(owner["user_id"]), json={"handle": handle})
+    assert run_gallery_refresh().processed >= 1
+    response = client.get("/projects/gallery", headers={**AUTH, "If-None-Match": etag}, params={"week": week})
+    assert response.status_code == 200
+    assert [i["handle"] for i in response.json()["items"]] == [handle]
+
+
+def test_vote_tallies_and_leaderboard(client):
+    week = f"budget-{uuid4().hex[:8]}"
+    owner, voter, other = new_user(client), new_user(client), new_user(client)
+    first, second = new_project(owner["user_id"], week), new_project(owner["user_id"], week)
+
+    def vote(user, project_id, ranking):
+        response = client.post("/votes", headers=AUTH, json={
+            "user_id": user["user_id"], "project_id": project_id, "vote_ranking": ranking,
+        })
+        assert response.status_code == 201, response.text
+        return response.json()["vote_id"]
+
+    db = SessionLocal()
+    try:
+        edited_at = db.query(Project.updated_at).filter(Project.project_id == first).scalar()
+    finally:
+        db.close()
+
+    vote(voter, first, 2)
+    vote(other, first, 9)
+    vote_id = vote(voter, second, 3)
+    response = client.patch(f"/votes/{vote_id}", headers=self_headers(voter["user_id"]), json={"vote_ranking": 1})
+    assert response.status_code == 200
+
+    with query_budget(1):
+        response = client.get("/votes/leaderboard", headers=AUTH, params={"week": week})
+    assert [(e["rank"], e["project_id"], e["vote_count"], e["vote_score"]) for e in response.json()] == [
+        (1, second, 1, 3),
+        (2, first, 2, 2),
+    ]
+    db = SessionLocal()
+    try:
+        # votes don't count as edits
+        assert db.query(Project.updated_at).filter(Project.project_id == first).scalar() == edited_at
+    finally:
+        db.close()
+
+    client.delete(f"/votes/{vote_id}", headers=self_headers(voter["user_id"]))
+    response = client.get("/votes/leaderboard", headers=AUTH, params={"week": week, "limit": 1})
+    assert [(e["project_id"], e["vote_count"], e["vote_score"]) for e in response.json()] == [(first, 2, 2)]
+
+
+def test_ballot(client):
+    week = f"budget-{uuid4().hex[:8]}"
+    owner, voter = new_user(client), new_user(client)
+    projects = [new_project(owner["user_id"], week) for _ in range(3)]
+    ballot = {"user_id": voter["user_id"], "rankings": [
+        {"project_id": project_id, "vote_ranking": i + 1} for i, project_id in enumerate(projects)
+    ]}
+    headers = {**AUTH, "Idempotency-Key": uuid4().hex}
+
+    # voter lock, existing votes, key claim, upsert, one tally update per project, key save
+    with query_budget(9):
+        first = client.post("/votes/ballot", headers=headers, json=ballot)
+    assert first.status_code == 200, first.text
+
+    replay = client.post("/votes/ballot", headers=headers, json=ballot)
+    assert replay.json() == first.json()
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+    response = client.post("/votes/ballot", headers=headers, json={**ballot, "rankings": ballot["rankings"][:1]})
+    assert response.status_code == 422
+
+    # Re-ranking without a key upserts the same rows
+    ballot["rankings"].reverse()
+    for i, ranking in enumerate(ballot["rankings"]):
+        ranking["vote_ranking"] = i + 1
+    response = client.post("/votes/ballot", headers=AUTH, json=ballot)
+    assert {v["vote_id"] for v in response.json()} == {v["vote_id"] for v in first.json()}
+
+    duplicate = client.post("/votes", headers=AUTH, json={
+        "user_id": voter["user_id"], "project_id": projects[0], "vote_ranking": 1,
+    })
+    assert duplicate.status_code == 409
+
+    response = client.get("/votes/leaderboard", headers=AUTH, params={"week": week})
+    assert [(e["project_id"], e["vote_count"], e["vote_score"]) for e in response.json()] == [
+        (projects[2], 1, 3), (projects[1], 1, 2), (projects[0], 1, 1),
+    ]
+
+
+def test_review_queue(client):
+    # Start from an empty queue
+    db = SessionLocal()
+    try:
+        db.execute(update(Project).where(Project.review_status == "pending", Project.shipped.is_(True)).values(review_status="flagged"))
+        db.commit()
+    finally:
+        db.close()
+
+    owner = new_user(client)
+    first, second = new_user_with_role(client, "reviewer"), new_user_with_role(client, "reviewer")
+    projects = [new_project(owner["user_id"], "queue", shipped=True) for _ in range(3)]
+
+    with query_budget(5):
+        response = client.post("/reviews/queue/lease", headers=self_headers(first), json={"limit": 2})
+    leased = [p["project_id"] for p in response.json()]
+    assert leased == projects[:2]
+
+    response = client.post("/reviews/queue/lease", headers=self_headers(second), json={"limit": 2})
+    assert [p["project_id"] for p in response.json()] == projects[2:]
+
+    response = client.post(
+        f"/reviews/queue/{leased[0]}/complete",
+        headers=self_headers(second),
+        json={"review_decision": "approved", "review_comments": "Nice"},
+    )
+    assert response.status_code == 409
+
+    response = client.post(
+        f"/reviews/queue/{leased[0]}/complete",
+        headers=self_headers(first),
+        json={"review_decision": "approved", "review_comments": "Nice"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["review_decision"] == "approved"
+
+    client.post(f"/reviews/queue/{leased[1]}/release", headers=self_headers(first))
+    response = client.post("/reviews/queue/lease", headers=self_headers(second), json={"limit": 5})
+    assert [p["project_id"] for p in response.json()] == [leased[1], projects[2]]
+
+
+def test_review_state_follows_reviews(client, admin_id):
+    owner = new_user(client)
+    project_id = new_project(
+        owner["user_id"], "reviews", shipped=True, code_url="https://example.com", hackatime_projects=["budget"]
+    )
+
+    response = client.post(f"/admin/projects/{project_id}/review", headers=self_headers(admin_id), json={"status": "approved"})
+    assert response.status_code == 200, response.text
+    db = SessionLocal()
+    try:
+        # committed with the status change, not queued
+        assert db.query(AuditLog.action).filter(AuditLog.object_id == project_id).scalar() == "review_status_update"
+    finally:
+        db.close()
+
+    # project lookup only; approval comes from latest_decision
+    with query_budget(1):
+        response = client.get(f"/projects/{project_id}/visibility", headers=AUTH)
+    assert response.json()["current_level_name"] == "Featured"
+
+    review_id = client.post("/reviews", headers=self_headers(admin_id), json={
+        "reviewer_user_id": admin_id, "project_id": project_id,
+        "review_comments": "Broken link", "review_decision": "Rejected",
+    }).json()["review_id"]
+    db = SessionLocal()
+    try:
+        assert db.query(Project.review_status, Project.latest_decision).filter(
+            Project.project_id == project_id
+        ).one() == ("rejected", "rejected")
+    finally:
+        db.close()
+
+    client.delete(f"/reviews/{review_id}", headers=self_headers(admin_id))
+    response = client.get(f"/projects/{project_id}/visibility", headers=AUTH)
+    assert response.json()["current_level_name"] == "Featured"
+
+
+def test_admin_user_detail(client, admin_id):
+    referrer = new_user(client)
+    user = new_user(client)
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.user_id == user["user_id"]).update({User.referred_by_user_id: referrer["user_id"]})
+        db.commit()
+    finally:
+        db.close()
+    for i in range(3):
+        new_project(user["user_id"], "detail", shipped=bool(i % 2))
+    client.post(f"/users/{user['user_id']}/loggedin", headers=self_headers(user["user_id"]))
+
+    # admin check (2) + user with counts and profile (1) + roles, projects,
+    # hackatime projects (3) + logins, onboarding events, audit logs (3)
+    with query_budget(9):
+        response = client.get(f"/admin/users/{user['user_id']}", headers=self_headers(admin_id))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["stats"]["total_projects"] == 3
+    assert body["stats"]["shipped_projects"] == 1
+    assert body["stats"]["login_count"] == 1
+    assert body["referrer"] == {"user_id": referrer["user_id"], "handle": None}
+    assert body["profile"]["first_name"] == "Budget"
+
+
+def test_admin_list_views(client, admin_id):
+    week = f"budget-{uuid4().hex[:8]}"
+    for _ in range(3):
+        user = new_user(client)
+        new_project(user["user_id"], week, hackatime_hours=0)
+
+    # admin check (2) + one joined row query, however many owners are on the page
+    with query_budget(3):
+        response = client.get("/admin/projects", params={"week": week, "limit": 500}, headers=self_headers(admin_id))
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert {p["user"]["handle"] for p in response.json()} == {None}
+
+    with query_budget(3):
+        response = client.get("/admin/projects/anomalies", params={"limit": 500}, headers=self_headers(admin_id))
+    assert response.status_code == 200
+    assert {p["anomaly_type"] for p in response.json()} >= {"zero_hours"}
+
+    # project counts come back in the same query as the users
+    with query_budget(3):
+        response = client.get("/admin/users", params={"limit": 500}, headers=self_headers(admin_id))
+    assert response.status_code == 200
+    counts = {u["user_id"]: u["project_count"] for u in response.json()}
+    assert counts[user["user_id"]] == 1
+    assert counts[admin_id] == 0
+
+
+def test_prebuilt_serializers(client, admin_id):
+    week = f"budget-{uuid4().hex[:8]}"
+    owner, voter = new_user(client), new_user(client)
+    project_id = new_project(owner["user_id"], week, attachment_urls=["https://example.com/a.png"])
+    vote = client.post("/votes", headers=AUTH, json={
+        "user_id": voter["user_id"], "project_id": project_id, "vote_ranking": 1,
+    }).json()
+
+    with query_budget(1):
+        response = client.get(f"/projects/{project_id}", headers=AUTH)
+    assert response.headers["content-type"] == "application/json"
+    project = response.json()
+    assert project["attachment_urls"] == ["https://example.com/a.png"]
+
+    with query_budget(1):
+        response = client.get("/projects", headers=AUTH, params={"user_id": owner["user_id"]})
+    assert response.json() == [project]
+
+    # ownership check (1) + user with projects (2)
+    with query_budget(3):
+        response = client.get(f"/users/{owner['user_id']}/projects", headers=self_headers(admin_id))
+    assert response.json() == [project]
+
+    with query_budget(1):
+        response = client.get("/votes", headers=AUTH, params={"project_id": project_id})
+    assert response.json() == [vote]
+    assert client.get(f"/votes/{vote['vote_id']}", headers=AUTH).json() == vote
+
+
+def test_event_queue_drops_only_bad_rows():
+    from datetime import datetime, timezone
+    from app.models.onboarding_event import OnboardingEvent
+    from app.services.event_queue import EventQueue
+
+    events = EventQueue("Test Events", OnboardingEvent)
+    user_id = str(uuid4())
+    rows = [
+        {"id": str(uuid4()), "user_id": uid, "event": "onboarding_next", "timestamp": datetime.now(timezone.utc),
+         "created_at": datetime.now(timezone.utc)}
+        for uid in (user_id, "x" * 37, user_id)
+    ]
+    events._write_batch(rows)
+    assert (events.flushed, events.failed) == (2, 1)
+
+    db = SessionLocal()
+    try:
+        assert db.query(OnboardingEvent).filter(OnboardingEvent.user_id == user_id).count() == 2
+    finally:
+        db.close()
+
+
+def test_onboarding_batch_limits(client):
+    from app.api.routers.analytics import MAX_BATCH_BYTES, MAX_EVENTS_PER_BATCH
+
+    user = new_user(client)
+    event = {"userId": user["user_id"], "event": "onboarding_next", "slide": 1, "timestamp": "2026-01-01T00:00:00Z"}
+    ndjson = {**AUTH, "Content-Type": "application/x-ndjson"}
+
+    # insert only
+    with query_budget(1):
+        response = client.post("/analytics/onboarding/batch", headers=ndjson, content=json.dumps(event) + "\n")
+    assert response.json() == {"accepted": 1}
+
+    too_many = "\n".join(json.dumps(event) for _ in range(MAX_EVENTS_PER_BATCH + 1))
+    with query_budget(0):
+        assert client.post("/analytics/onboarding/batch", headers=ndjson, content=too_many).status_code == 413
+        response = client.post("/analytics/onboarding/batch", headers=AUTH, json=[{}] * (MAX_EVENTS_PER_BATCH + 1))
+        assert response.status_code == 413
+        response = client.post("/analytics/onboarding/batch", headers=AUTH, content=b" " * (MAX_BATCH_BYTES + 1))
+        assert response.status_code == 413
+        assert client.post("/analytics/onboarding/batch", headers=AUTH, content=b"[{").status_code == 422
+
+
+def test_track_onboarding(client, monkeypatch):
+    from app.services.event_queue import onboarding_event_queue
+
+    user = new_user(client)
+    event = {"userId": user["user_id"], "event": "onboarding_next", "slide": 1, "timestamp": "2026-01-01T00:00:00Z"}
+
+    # no flusher in tests, so put() writes directly
+    with query_budget(1):
+        response = client.post("/analytics/onboarding", headers=AUTH, json=event)
+    assert response.status_code == 202, response.text
+
+    def fail(rows):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(onboarding_event_queue, "_insert", fail)
+    response = client.post("/analytics/onboarding", headers=AUTH, json=event)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"].isdigit()
+
+
+def test_search_vector(client):
+    from app.services.search import prefix_tsquery
+
+    word = f"zq{uuid4().hex[:10]}"
+    project_id = new_project(new_user(client)["user_id"], "search", project_description=f"Built with {word}")
+
+    db = SessionLocal()
+    try:
+        # generated by Postgres from the model's Computed expression; prefixes match
+        with query_budget(1):
+            rows = db.query(Project.project_id).filter(Project.search_vector.op("@@")(prefix_tsquery(word[:8]))).all()
+        assert rows == [(project_id,)]
+    finally:
+        db.close()
+
+
+def test_admin_project_search(client, admin_id):
+    db = SessionLocal()
+    try:
+        trigram = db.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).first()
+        if trigram is None:
+            pytest.skip("pg_trgm not available")
+        db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db.commit()
+    finally:
+        db.close()
+
+    word = f"zq{uuid4().hex[:10]}"
+    project_id = new_project(new_user(client)["user_id"], "search", project_description=f"Built with {word}")
+
+    # admin check (2) + one search query
+    with query_budget(3):
+        response = client.get("/admin/projects", params={"q": word}, headers=self_headers(admin_id))
+    assert [p["project_id"] for p in response.json()] == [project_id]
+
+
+def test_vote_tally_clears_weeks_without_votes(client, admin_id):
+    from app.models.job_watermark import JobWatermark
+    from app.models.vote_tally import VoteTally
+    from jobs.vote_tally import WATERMARK_PREFIX, run_vote_tally
+
+    week = f"budget-{uuid4().hex[:8]}"
+    voter = new_user(client)
+    project_id = new_project(new_user(client)["user_id"], week)
+    vote_id = client.post("/votes", headers=AUTH, json={
+        "user_id": voter["user_id"], "project_id": project_id, "vote_ranking": 1,
+    }).json()["vote_id"]
+
+    run_vote_tally()
+    response = client.get("/admin/votes/tally", params={"week": week}, headers=self_headers(admin_id))
+    assert [t["project_id"] for t in response.json()["projects"]] == [project_id]
+
+    client.delete(f"/votes/{vote_id}", headers=self_headers(voter["user_id"]))
+    run_vote_tally()
+    response = client.get("/admin/votes/tally", params={"week": week}, headers=self_headers(admin_id))
+    assert response.json()["projects"] == []
+    db = SessionLocal()
+    try:
+        assert db.query(VoteTally).filter(VoteTally.submission_week == week).count() == 0
+        assert db.get(JobWatermark, WATERMARK_PREFIX + week) is None
+    finally:
+        db.close()
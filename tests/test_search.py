@@ -0,0 +1,31 @@
+"""
+Checks the non-Postgres fallback of app.services.search on in-memory
+SQLite.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("MASTER_KEY", "test-master-key")
+
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.services.search import search_users
+
+
+def test_search_users_matches_underscores_literally():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    with Session(engine) as db:
+        now = datetime.now(timezone.utc)
+        for user_id, handle in (("1", "bench_4f2"), ("2", "bench14f2"), ("3", "100%real")):
+            db.add(User(user_id=user_id, email=f"{user_id}@example.com", handle=handle,
+                        referral_code=f"CODE000{user_id}", created_at=now, updated_at=now))
+        db.commit()
+
+        assert [u.handle for u in search_users(db.query(User), "bench_4f2")] == ["bench_4f2"]
+        assert [u.handle for u in search_users(db.query(User), "0%r")] == ["100%real"]
@@ -0,0 +1,75 @@
+"""
+Checks app.services.vote_tally against brute-force Borda/pairwise counts
+and a published Schulze example. No database needed.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("MASTER_KEY", "test-master-key")
+
+import numpy as np
+
+from app.services.vote_tally import _normalize, borda_scores, pairwise_matrix, tally
+
+
+def ballots_from_orders(orders: list[tuple[int, str]], candidates: str):
+    """Expand (count, "ACBED") groups into vote arrays, one rank per letter."""
+    ballots, projects, ranks = [], [], []
+    for count, order in orders:
+        for _ in range(count):
+            ballot = len(set(ballots))
+            for rank, letter in enumerate(order, start=1):
+                ballots.append(ballot)
+                projects.append(candidates.index(letter))
+                ranks.append(rank)
+    return np.array(ballots), np.array(projects), np.array(ranks)
+
+
+def brute_force(ballots, projects, ranks, n):
+    preferences = {}
+    for b, p, r in zip(ballots, projects, ranks):
+        ballot = preferences.setdefault(b, {})
+        ballot[p] = min(r, ballot.get(p, r))
+    d = np.zeros((n, n), dtype=np.int64)
+    for ballot in preferences.values():
+        for i in range(n):
+            for j in range(n):
+                if i != j and i in ballot and (j not in ballot or ballot[i] < ballot[j]):
+                    d[i, j] += 1
+    return d
+
+
+def test_matches_brute_force_with_ties_and_partial_ballots():
+    rng = np.random.default_rng(7)
+    n, votes = 12, 400
+    ballots = rng.integers(0, 60, votes)
+    projects = rng.integers(0, n, votes)
+    ranks = rng.integers(1, 5, votes)
+
+    expected = brute_force(ballots, projects, ranks, n)
+    b, p, r = _normalize(ballots, projects, ranks)
+    assert np.array_equal(pairwise_matrix(b, p, r, n), expected)
+    assert np.array_equal(borda_scores(b, p, r, n), expected.sum(axis=1))
+
+
+def test_schulze_example():
+    # Wikipedia's Schulze method example: 45 voters, E > A > C > B > D
+    candidates = "ABCDE"
+    ballots, projects, ranks = ballots_from_orders([
+        (5, "ACBED"), (5, "ADECB"), (8, "BEDAC"), (3, "CABED"),
+        (7, "CAEBD"), (2, "CBADE"), (7, "DCEBA"), (8, "EBADC"),
+    ], candidates)
+
+    result = tally(ballots, projects, ranks, len(candidates))
+    assert result.ballots == 45
+    assert "".join(candidates[i] for i in np.argsort(result.schulze_rank)) == "EACBD"
+    assert np.array_equal(result.rank, result.schulze_rank)
+
+
+def test_projects_outside_finalists_follow_in_borda_order():
+    ballots, projects, ranks = ballots_from_orders([(3, "ABC"), (1, "CBA")], "ABCDE")
+    result = tally(ballots, projects, ranks, 5, schulze_candidates=2)
+    assert list(result.schulze_rank) == [1, 2, 0, 0, 0]
+    # C (ranked) beats the unvoted D and E
+    assert list(result.rank) == [1, 2, 3, 4, 5]